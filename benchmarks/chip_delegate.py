@@ -0,0 +1,118 @@
+"""Measure the cost of scrolling a table whose cells are painted by
+TagChipDelegate.
+
+Fills a QTableView with random tags and repaints the viewport at evenly
+spaced scroll positions, once with cold caches and once with warm ones. The
+frame time is what the user feels while dragging the scroll bar.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/chip_delegate.py
+    python benchmarks/chip_delegate.py --rows 10000 --frames 300
+"""
+# Import built-in modules.
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+
+# Constants.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAGS_COLUMN = 1
+
+
+def build_model(rows, vocabulary_size, max_tags, seed=0):
+    """Returns a model of assets, with a list of tags per row.
+
+    Args:
+        rows (int): Number of rows.
+        vocabulary_size (int): Number of distinct tags.
+        max_tags (int): Maximum number of tags per row.
+        seed (int): Seed of the random tags.
+
+    Returns:
+        QtGui.QStandardItemModel: The asset model.
+    """
+    from pyqt_tag_manager import QtGui
+
+    generator = random.Random(seed)
+    vocabulary = [''.join(generator.choice(string.ascii_letters)
+                          for _ in range(generator.randint(3, 14)))
+                  for _ in range(vocabulary_size)]
+
+    model = QtGui.QStandardItemModel(rows, 2)
+    for row in range(rows):
+        model.setData(model.index(row, 0), 'asset_{row}'.format(row=row))
+        model.setData(model.index(row, TAGS_COLUMN),
+                      generator.sample(vocabulary,
+                                       generator.randint(0, max_tags)))
+
+    return model
+
+
+def scroll(view, frames):
+    """Repaint the view at evenly spaced scroll positions.
+
+    Returns:
+        list: Time of each frame, in seconds.
+    """
+    scroll_bar = view.verticalScrollBar()
+    step = max(1, scroll_bar.maximum() // frames)
+
+    times = []
+    for value in range(0, scroll_bar.maximum() + 1, step)[:frames]:
+        start = time.perf_counter()
+        scroll_bar.setValue(value)
+        view.viewport().repaint()
+        times.append(time.perf_counter() - start)
+
+    return times
+
+
+def report(name, times):
+    times = sorted(times)
+    print('{name:<6} {n:>5} frames  mean {mean:>7.2f} ms  p95 {p95:>7.2f} ms  '
+          'max {max:>7.2f} ms'.format(
+              name=name, n=len(times),
+              mean=1000.0 * sum(times) / len(times),
+              p95=1000.0 * times[int(0.95 * (len(times) - 1))],
+              max=1000.0 * times[-1]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='Number of rows of the table.')
+    parser.add_argument('--vocabulary', type=int, default=2000,
+                        help='Number of distinct tags.')
+    parser.add_argument('--max-tags', type=int, default=8,
+                        help='Maximum number of tags per row.')
+    parser.add_argument('--frames', type=int, default=300,
+                        help='Number of scroll positions to repaint.')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT_DIR)
+    from pyqt_tag_manager import QtWidgets, TagChipDelegate
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    model = build_model(args.rows, args.vocabulary, args.max_tags)
+
+    view = QtWidgets.QTableView()
+    view.setItemDelegateForColumn(TAGS_COLUMN, TagChipDelegate(view))
+    view.setModel(model)
+    view.setColumnWidth(TAGS_COLUMN, 400)
+    view.resize(800, 600)
+    view.show()
+    app.processEvents()
+
+    report('cold', scroll(view, args.frames))
+    report('warm', scroll(view, args.frames))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Compare the batch color functions of color_utils with their scalar
+versions, for both parity and speed.
+
+Every random color is transformed by both versions and the results must be
+identical; the script fails otherwise. Building the final QColors is timed
+separately, since callers may not need them all at once.
+
+Usage:
+    python benchmarks/color_batch.py
+    python benchmarks/color_batch.py --count 100000 --percent 15
+"""
+# Import built-in modules.
+import argparse
+import os
+import sys
+import time
+
+
+# Constants.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_colors(count, seed=0):
+    """Returns random RGBA colors, along with the edge cases of the
+    conversions (black, white, grays and pure hues).
+
+    Returns:
+        numpy.ndarray: (count + edge cases, 4) int colors.
+    """
+    import numpy
+
+    edge_cases = numpy.array([
+        [0, 0, 0, 255], [255, 255, 255, 255], [128, 128, 128, 0],
+        [255, 0, 0, 255], [0, 255, 0, 255], [0, 0, 255, 255],
+        [255, 255, 0, 128], [0, 255, 255, 10], [255, 0, 255, 255],
+    ])
+    generator = numpy.random.RandomState(seed)
+
+    return numpy.concatenate([generator.randint(0, 256, (count, 4)),
+                              edge_cases])
+
+
+def compare(name, colors, scalar, batch):
+    """Transform the colors with both versions, print the timings and
+    returns the number of mismatching colors. """
+    import numpy
+
+    from pyqt_tag_manager.qt_market import color_utils
+
+    start = time.perf_counter()
+    expected = [scalar([int(value) for value in color]) for color in colors]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    transformed = batch(colors)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = color_utils.to_qcolors(transformed)
+    qcolors_time = time.perf_counter() - start
+
+    mismatches = numpy.count_nonzero(
+        numpy.array([color.getRgb() for color in expected]) !=
+        numpy.array([color.getRgb() for color in result]),
+        axis=1).astype(bool).sum()
+
+    print('{name:<12} scalar {s:>8.1f} ms  batch {b:>7.1f} ms '
+          '(+{q:.1f} ms QColors)  x{speedup:<5.1f} mismatches {m}'.format(
+              name=name, s=scalar_time * 1000, b=batch_time * 1000,
+              q=qcolors_time * 1000,
+              speedup=scalar_time / (batch_time + qcolors_time),
+              m=mismatches))
+
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='Number of random colors.')
+    parser.add_argument('--percent', type=float, default=15,
+                        help='Desaturation percentage.')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT_DIR)
+    from pyqt_tag_manager.qt_market import color_utils
+
+    colors = random_colors(args.count)
+
+    mismatches = compare('pastelize', colors, color_utils.pastelize_color,
+                         color_utils.pastelize_colors)
+    mismatches += compare(
+        'desaturate', colors,
+        lambda color: color_utils.desaturate(color, args.percent),
+        lambda colors: color_utils.desaturate_colors(colors, args.percent))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
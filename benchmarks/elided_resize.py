@@ -0,0 +1,138 @@
+"""Measure the cost of dragging a splitter over a panel full of elided
+widgets.
+
+Fills one side of a QSplitter with labels and line edits from widget_vendor,
+all elided, then moves the splitter handle back and forth across the
+widths where their texts are elided. Each step resizes every widget, which
+is what the user feels while dragging the handle.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/elided_resize.py
+    python benchmarks/elided_resize.py --widgets 500 --steps 400
+"""
+# Import built-in modules.
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+
+# Constants.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_panel(count, seed=0):
+    """Returns a widget holding `count` elided labels and line edits, half
+    of each, with random texts.
+
+    Returns:
+        QtWidgets.QWidget: The panel.
+    """
+    from pyqt_tag_manager import QtWidgets
+    from pyqt_tag_manager.qt_market import widget_vendor
+
+    generator = random.Random(seed)
+
+    panel = QtWidgets.QWidget()
+    layout = QtWidgets.QVBoxLayout(panel)
+    layout.setSpacing(0)
+
+    for index in range(count):
+        text = ' '.join(''.join(generator.choice(string.ascii_lowercase)
+                                for _ in range(generator.randint(3, 10)))
+                        for _ in range(generator.randint(2, 12)))
+
+        if index % 2:
+            widget = widget_vendor.get_line_edit(panel, elided=True)
+        else:
+            widget = widget_vendor.get_label(panel, elided=True)
+
+        # Labels are at least as wide as their text otherwise, so the
+        # panel could never shrink enough to elide them again.
+        widget.setSizePolicy(QtWidgets.QSizePolicy.Ignored,
+                             widget.sizePolicy().verticalPolicy())
+        widget.setText(text)
+        layout.addWidget(widget)
+
+    return panel
+
+
+def drag(app, splitter, steps, min_width, max_width):
+    """Move the splitter handle back and forth, one pixel per step, between
+    the given widths of its first widget.
+
+    Returns:
+        tuple: Time of each step, in seconds, and the part of it spent
+            resizing the widgets (the rest is spent repainting them).
+    """
+    span = max_width - min_width
+    times = []
+    resize_times = []
+
+    for step in range(steps):
+        # Triangle wave: drag right, then back left.
+        offset = step % (2 * span)
+        width = min_width + (offset if offset < span else 2 * span - offset)
+
+        start = time.perf_counter()
+        splitter.setSizes([width, splitter.width() - width])
+        resized = time.perf_counter()
+        app.processEvents()
+        end = time.perf_counter()
+
+        times.append(end - start)
+        resize_times.append(resized - start)
+
+    return times, resize_times
+
+
+def report(name, times, resize_times):
+    times = sorted(times)
+    print('{name:<6} {n:>5} steps  mean {mean:>7.2f} ms (resize {resize:>6.2f} '
+          'ms)  p95 {p95:>7.2f} ms  {fps:>6.1f} steps/s'.format(
+              name=name, n=len(times),
+              mean=1000.0 * sum(times) / len(times),
+              resize=1000.0 * sum(resize_times) / len(resize_times),
+              p95=1000.0 * times[int(0.95 * (len(times) - 1))],
+              fps=len(times) / sum(times)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--widgets', type=int, default=400,
+                        help='Number of elided widgets in the panel.')
+    parser.add_argument('--steps', type=int, default=400,
+                        help='Number of splitter positions.')
+    parser.add_argument('--min-width', type=int, default=120,
+                        help='Narrowest width of the panel, in pixels.')
+    parser.add_argument('--max-width', type=int, default=420,
+                        help='Widest width of the panel, in pixels.')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT_DIR)
+    from pyqt_tag_manager import QtCore, QtWidgets
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    splitter = QtWidgets.QSplitter(QtCore.Qt.Horizontal)
+    splitter.addWidget(build_panel(args.widgets))
+    splitter.addWidget(QtWidgets.QWidget())
+    splitter.resize(args.max_width + 200, 600)
+    splitter.show()
+    app.processEvents()
+
+    # The first pass over a width elides every text, the next ones find it
+    # in whatever the widgets cache.
+    steps = 2 * (args.max_width - args.min_width)
+    report('first', *drag(app, splitter, min(args.steps, steps),
+                         args.min_width, args.max_width))
+    report('next', *drag(app, splitter, args.steps,
+                        args.min_width, args.max_width))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Measure the import-time cost of the pyqt_tag_manager package.
+
+Runs a fresh interpreter with `python -X importtime` for each scenario and
+parses the report it writes to stderr, so startup cost can be tracked over
+time without any Qt event loop.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --top 15 --budget-ms 50
+"""
+# Import built-in modules.
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+
+# Constants.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = (
+    ('package', 'import pyqt_tag_manager'),
+    ('qt_core', 'import pyqt_tag_manager; pyqt_tag_manager.QtCore'),
+    ('tag_manager', 'from pyqt_tag_manager import TagManager'),
+)
+
+# E.g. "import time:       245 |        983 |   pyqt_tag_manager"
+_IMPORT_TIME_REGEX = re.compile(
+    r'^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|'
+    r'(?P<indent>\s+)(?P<module>\S+)\s*$')
+
+
+def parse_import_time(report):
+    """Parse the stderr report produced by `python -X importtime`.
+
+    Args:
+        report (str): Raw stderr output of the interpreter.
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) tuples, in the order
+            the imports finished.
+    """
+    entries = []
+    for line in report.splitlines():
+        match = _IMPORT_TIME_REGEX.match(line)
+        if not match:
+            continue
+
+        # Nested imports are indented by two spaces per level.
+        depth = (len(match.group('indent')) - 1) // 2
+        entries.append((match.group('module'),
+                        int(match.group('self')),
+                        int(match.group('cumulative')),
+                        depth))
+
+    return entries
+
+
+def measure(statement):
+    """Run the statement in a fresh interpreter and collect import times.
+
+    Args:
+        statement (str): Python statement to execute.
+
+    Returns:
+        list: Parsed entries, see `parse_import_time`.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [ROOT_DIR, env.get('PYTHONPATH')]))
+
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        env=env,
+        check=False,
+    )
+
+    if process.returncode:
+        raise RuntimeError('Statement {stmt!r} failed:\n{err}'.format(
+            stmt=statement, err=process.stderr))
+
+    return parse_import_time(process.stderr)
+
+
+def package_cost(entries):
+    """Returns the cumulative cost (us) of everything imported after the
+    interpreter's own startup imports, i.e. the top-level imports triggered
+    by the statement."""
+    # Top-level entries of the statement come after the `site` import.
+    names = [entry[0] for entry in entries]
+    start = names.index('site') + 1 if 'site' in names else 0
+
+    return sum(entry[2] for entry in entries[start:] if entry[3] == 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of most expensive modules to list.')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Fail if the bare package import exceeds this.')
+    args = parser.parse_args(argv)
+
+    package_ms = None
+    for name, statement in SCENARIOS:
+        try:
+            entries = measure(statement)
+        except RuntimeError as error:
+            print('{name:<12} skipped ({err})'.format(
+                name=name, err=str(error).splitlines()[-1]))
+            continue
+
+        total_ms = package_cost(entries) / 1000.0
+        if name == 'package':
+            package_ms = total_ms
+
+        print('{name:<12} {ms:>10.2f} ms  ({stmt})'.format(
+            name=name, ms=total_ms, stmt=statement))
+
+        ranked = sorted(entries, key=lambda entry: entry[1], reverse=True)
+        for module, self_us, cumulative_us, _ in ranked[:args.top]:
+            print('    {mod:<48} self {s:>8.2f} ms  cumulative {c:>8.2f} ms'
+                  .format(mod=module, s=self_us / 1000.0,
+                          c=cumulative_us / 1000.0))
+
+    if args.budget_ms is not None and package_ms is not None and \
+            package_ms > args.budget_ms:
+        print('Package import took {ms:.2f} ms, over budget of {b:.2f} ms.'
+              .format(ms=package_ms, b=args.budget_ms))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
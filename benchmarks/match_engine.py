@@ -0,0 +1,100 @@
+"""Time search queries over a large vocabulary, matched one tag at a time
+like the model does without an engine, then by a MatchEngine in-process and
+in worker processes.
+
+Every query must give the same match set in all three cases; the script
+fails otherwise. Loading (starting the workers) is timed separately, it's
+only paid once.
+
+Usage:
+    python benchmarks/match_engine.py
+    python benchmarks/match_engine.py --tags 1000000 --processes 8
+"""
+# Import built-in modules.
+import argparse
+import os
+import random
+import sys
+import time
+
+
+# Constants.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ('tree', 'Rock', 'fire', 'Water', 'sky', 'grass', 'wood', 'stone',
+         'leaf', 'cloud', 'été', 'Straße', 'char', 'prop', 'env', 'fx')
+QUERIES = ('a', 'tree', 'stone_', 'strasse', 'r_c', '99', 'zzz')
+
+
+def random_tags(count, seed=0):
+    """Returns unique tag names made of random words and a number. """
+    generator = random.Random(seed)
+
+    return ['{}_{}_{}'.format(generator.choice(WORDS), generator.choice(WORDS),
+                              index) for index in range(count)]
+
+
+def match_one_at_a_time(search_keys, query):
+    """Returns the match set of a query, calling a predicate per tag. """
+    from pyqt_tag_manager import match_sets
+
+    def is_match(search_key):
+        return query in search_key
+
+    return match_sets.from_flags(bytearray(
+        is_match(search_key) for search_key in search_keys))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tags', type=int, default=1000000,
+                        help='Number of tags in the vocabulary.')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Number of worker processes, defaults to the '
+                             'number of CPUs.')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT_DIR)
+    from pyqt_tag_manager import match_engine
+    from pyqt_tag_manager import tag_keys
+
+    search_keys = [tag_keys.search_key(tag) for tag in random_tags(args.tags)]
+    engines = [
+        ('in-process', match_engine.MatchEngine(processes=0)),
+        ('parallel', match_engine.MatchEngine(processes=args.processes,
+                                              min_parallel_size=0)),
+    ]
+
+    for name, engine in engines:
+        start = time.perf_counter()
+        engine.load(search_keys)
+        print('load {name:<10} {t:>8.1f} ms'.format(
+            name=name, t=(time.perf_counter() - start) * 1000))
+
+    mismatches = 0
+    for query in QUERIES:
+        query = tag_keys.search_key(query)
+
+        start = time.perf_counter()
+        expected = match_one_at_a_time(search_keys, query)
+        timings = ['one at a time {t:>7.1f} ms'.format(
+            t=(time.perf_counter() - start) * 1000)]
+
+        for name, engine in engines:
+            start = time.perf_counter()
+            match_set = engine.find_matches(query)
+            timings.append('{name} {t:>7.1f} ms'.format(
+                name=name, t=(time.perf_counter() - start) * 1000))
+            mismatches += match_set != expected
+
+        print('{query!r:<10} {timings}'.format(query=query,
+                                               timings='  '.join(timings)))
+
+    for _, engine in engines:
+        engine.close()
+
+    print('mismatches {m}'.format(m=mismatches))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
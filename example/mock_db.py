@@ -1,3 +1,7 @@
+# Import local modules.
+from pyqt_tag_manager.tag_store import SQLiteTagStore
+
+
 PUBLISHED_TAGS_QUERY = [
     '000', 'cat', 'bat', 'door', 'Camera', 'floor', '001', 'car', 'train',
     'file', 'canary', 'zebra', 'dog', 'cycle', 'farm', '100', '101', '201',
@@ -7,11 +11,16 @@ PUBLISHED_TAGS_QUERY = [
     'umbrella', 'vase', 'wax', 'xylophone', 'yield'
 ]
 
+_store = None
+
 
-def get_published_tags_from_db():
-    return PUBLISHED_TAGS_QUERY
+def get_store():
+    """Returns the mock database: an in-memory SQLite tag store, seeded with
+    the published tags."""
+    global _store
 
+    if _store is None:
+        _store = SQLiteTagStore(':memory:')
+        _store.add(PUBLISHED_TAGS_QUERY)
 
-def publish_tags_to_db(tag_list):
-    global PUBLISHED_TAGS_QUERY
-    PUBLISHED_TAGS_QUERY = tag_list
+    return _store
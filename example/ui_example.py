@@ -4,7 +4,9 @@ import sys
 # Import local modules.
 from pyqt_tag_manager import QtCore
 from pyqt_tag_manager import QtWidgets
+from pyqt_tag_manager import tag_vocabulary
 from pyqt_tag_manager.qt_market import widget_vendor
+from pyqt_tag_manager.tag_loader import TagLoader
 from pyqt_tag_manager.tag_manager import TagManager
 import mock_db
 
@@ -15,6 +17,13 @@ class TagManagerExampleWindow(QtWidgets.QMainWindow):
         self.setWindowTitle('Tag Manager Example')
         self.setGeometry(500, 250, 600, 1000)
 
+        # Database calls run on a worker thread, so the UI doesn't freeze.
+        self.tag_loader = TagLoader(mock_db.get_store(), parent=self)
+
+        # Both tag managers display tags of the same database, so they
+        # share a single copy of the tags.
+        self.vocabulary = tag_vocabulary.get_shared_vocabulary('mock_db')
+
         self.__build_ui()
         self.__mock_populate()
 
@@ -49,7 +58,7 @@ class TagManagerExampleWindow(QtWidgets.QMainWindow):
         editing_lyt.addWidget(editing_txt)
 
         # # Editable Tag manager.
-        self.editor_tag_manager = TagManager(self)
+        self.editor_tag_manager = TagManager(self, vocabulary=self.vocabulary)
         editing_lyt.addWidget(self.editor_tag_manager)
 
         # # Publish.
@@ -76,7 +85,7 @@ class TagManagerExampleWindow(QtWidgets.QMainWindow):
         prev_lyt.addWidget(prev_txt)
 
         # # Preview only Tag manager.
-        self.prev_tag_manager = TagManager(self)
+        self.prev_tag_manager = TagManager(self, vocabulary=self.vocabulary)
         self.prev_tag_manager.enable_tag_preview_mode()
         prev_lyt.addWidget(self.prev_tag_manager)
 
@@ -95,14 +104,28 @@ class TagManagerExampleWindow(QtWidgets.QMainWindow):
         self.publish_tags_btn.clicked.connect(self._on_tag_publish)
         self.refresh_tags_btn.clicked.connect(self._on_tag_refresh)
 
+        self.tag_loader.published.connect(self._on_tags_published)
+        self.tag_loader.failed.connect(self._on_tag_loader_failed)
+
     def __mock_populate(self):
-        tags = mock_db.get_published_tags_from_db()
-        self.editor_tag_manager.add_tags(tags)
-        self.prev_tag_manager.add_tags(tags)
+        self.tag_loader.refresh(self.editor_tag_manager)
+        self.tag_loader.refresh(self.prev_tag_manager)
 
     # Slots.
     @QtCore.Slot()
     def _on_tag_publish(self):
+        # Only publish the tags that were added or removed since the last
+        # publish.
+        self.tag_loader.publish(self.editor_tag_manager)
+
+    @QtCore.Slot()
+    def _on_tag_refresh(self):
+        # Repeated clicks don't queue more fetches and only the differences
+        # are applied to the preview.
+        self.tag_loader.refresh(self.prev_tag_manager)
+
+    @QtCore.Slot(object, object)
+    def _on_tags_published(self, tag_manager, counts):
         conf_dialog = QtWidgets.QMessageBox.information(
             self,
             'Tags Published',
@@ -110,14 +133,13 @@ class TagManagerExampleWindow(QtWidgets.QMainWindow):
             'Please switch over to the "PREVIEW/QUERY MODE" section below.'
         )
 
-        tags = self.editor_tag_manager.get_tags()
-        mock_db.publish_tags_to_db(tags)
-
-    @QtCore.Slot()
-    def _on_tag_refresh(self):
-        db_tags = mock_db.get_published_tags_from_db()
-        self.prev_tag_manager.clear_tags()
-        self.prev_tag_manager.add_tags(db_tags)
+    @QtCore.Slot(object, str, str)
+    def _on_tag_loader_failed(self, tag_manager, request, message):
+        QtWidgets.QMessageBox.warning(
+            self,
+            'Tag {req} failed'.format(req=request.capitalize()),
+            message
+        )
 
 
 if __name__ == '__main__':
@@ -1,53 +1,112 @@
 # Import built-in modules.
+import importlib
 import logging
 
 
 # Initialize root logger.
+# Handlers and formatting are left to the host application; the NullHandler
+# only prevents "No handler found" warnings when nothing is configured.
 def _init_logger():
     _logger = logging.getLogger(__name__)
+    _logger.addHandler(logging.NullHandler())
 
-    _logger.propagate = False
-    _logger.setLevel(logging.INFO)
+    return _logger
 
-    formatter = logging.Formatter(
-        '{lvl} [{name}] [{file}:{line}] - {msg}'.format(
-            lvl='%(levelname)-8s',
-            name='%(name)s',
-            file='%(filename)s',
-            line='%(lineno)d',
-            msg='%(message)s')
-    )
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
+logger = _init_logger()
 
-    _logger.addHandler(handler)
 
-    return _logger
+__author__ = 'Nevolutionize'
+__version__ = '0.1.0'
+__all__ = [
+    'QtCore',
+    'QtGui',
+    'QtWidgets',
+    'TagChipDelegate',
+    'TagManager',
+]
 
 
-logger = _init_logger()
+# Lazy attributes.
+# Nothing Qt related is imported until it's first accessed, so embedding the
+# package only costs the Qt bindings that are actually used, when they're
+# used. Resolved attributes are cached on the module, so lookups after the
+# first one don't go through __getattr__ again.
+_QT_MODULES = ('QtCore', 'QtGui', 'QtWidgets')
+_SUBMODULES = ('qt_market', 'tag_manager')
+_LAZY_ATTRS = {
+    'TagChipDelegate': 'tag_chip_delegate',
+    'TagManager': 'tag_manager',
+}
 
+_binding = None
 
-# If Qt.py is available, use it.
-# Otherwise, use the vendored version included in this package.
-try:
-    from Qt import QtCore
-    from Qt import QtGui
-    from Qt import QtWidgets
-    from Qt import QtSql
-    print('Using Qt.py.')
 
-except ImportError:
-    from PySide2 import QtCore
-    from PySide2 import QtGui
-    from PySide2 import QtWidgets
+def _get_binding():
+    """Returns the Qt binding package used by the tag manager.
 
-    logger.warning('Unable to import package Qt.py, using PySide2 instead.')
-    print('Using Pyside2')
+    If Qt.py is available, use it.
+    Otherwise, use PySide2 directly.
 
+    Returns:
+        module: The imported binding package.
+    """
+    global _binding
 
-__author__ = 'Nevolutionize'
-__version__ = '0.1.0'
-__all__ = [
-]
+    if _binding is None:
+        try:
+            _binding = importlib.import_module('Qt')
+
+        except ImportError:
+            _binding = importlib.import_module('PySide2')
+            logger.warning('Unable to import package Qt.py, using PySide2 '
+                           'instead.')
+
+    return _binding
+
+
+def _import_qt_module(name):
+    """Import a Qt submodule (QtCore, QtGui, ...) from the active binding.
+
+    Args:
+        name (str): Name of the Qt submodule.
+
+    Returns:
+        module: The imported Qt submodule.
+    """
+    binding = _get_binding()
+
+    # Qt.py exposes the submodules as attributes of the Qt module, while the
+    # actual bindings need them to be imported explicitly.
+    module = getattr(binding, name, None)
+    if module is None:
+        module = importlib.import_module(
+            '{pkg}.{mod}'.format(pkg=binding.__name__, mod=name))
+
+    return module
+
+
+def __getattr__(name):
+    if name in _QT_MODULES:
+        value = _import_qt_module(name)
+
+    elif name in _SUBMODULES:
+        value = importlib.import_module('{pkg}.{mod}'.format(pkg=__name__,
+                                                             mod=name))
+
+    elif name in _LAZY_ATTRS:
+        module = importlib.import_module(
+            '{pkg}.{mod}'.format(pkg=__name__, mod=_LAZY_ATTRS[name]))
+        value = getattr(module, name)
+
+    else:
+        raise AttributeError('module {mod!r} has no attribute {attr!r}'.format(
+            mod=__name__, attr=name))
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_QT_MODULES) | set(_SUBMODULES) |
+                  set(_LAZY_ATTRS))
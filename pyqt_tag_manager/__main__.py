@@ -0,0 +1,336 @@
+"""Command line tool pre-processing tag vocabularies, without Qt.
+
+Vocabulary files are streamed through the TagEngine the TagManager widget
+is built on (see tag_engine), so they're cleaned up with the exact same
+rules: names are stripped, empty names skipped, duplicates (exact names)
+dropped in favor of their first occurrence, and tags ordered by the sort
+keys of a collation (see tag_keys). Names can also be deduplicated by their
+search key (see tag_pipeline), in worker processes.
+
+Commands:
+    build: Merge vocabulary files into a single one, in display order.
+        Binary vocabularies (.tagvocab) and SQLite tag stores (.db,
+        .sqlite) are the formats the widget loads fastest. Both can be
+        read back as inputs too.
+    bench: Time search queries over a vocabulary, the way the widget
+        matches and orders the tags.
+
+Usage:
+    python -m pyqt_tag_manager build dump.csv extra.txt -o studio.tagvocab
+    python -m pyqt_tag_manager build dump.jsonl -o tags.txt --collation natural
+    python -m pyqt_tag_manager build harvest.txt -o tags.db --dedupe normalized
+    python -m pyqt_tag_manager bench studio.tagvocab --queries tree rock
+"""
+# Import built-in modules.
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+# Import local modules.
+from pyqt_tag_manager import mapped_vocabulary
+from pyqt_tag_manager import match_sets
+from pyqt_tag_manager import tag_engine
+from pyqt_tag_manager import tag_io
+from pyqt_tag_manager import tag_keys
+from pyqt_tag_manager import tag_pipeline
+
+
+# Constants.
+STORE_EXTENSIONS = ('.db', '.sqlite')
+COLLATIONS = (tag_keys.PLAIN_COLLATION, tag_keys.NATURAL_COLLATION)
+
+_CHUNK_SIZE = 10000
+_QUERY_COUNT = 8
+
+
+# Private.
+def _iter_tags(path, fmt=None, column=0, field=tag_io.JSONL_NAME_FIELD):
+    """Stream the tag names of a vocabulary file of any supported format,
+    including binary vocabularies and tag stores. """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == mapped_vocabulary.EXTENSION:
+        with mapped_vocabulary.MappedVocabulary(path) as mapped:
+            for name in mapped.iter_names():
+                yield name
+        return
+
+    elif extension in STORE_EXTENSIONS:
+        from pyqt_tag_manager import tag_store
+
+        # Opening a store creates its database if it doesn't exist.
+        if not os.path.isfile(path):
+            raise IOError('No such tag store: {path!r}'.format(path=path))
+
+        store = tag_store.SQLiteTagStore(path)
+        try:
+            for name in store.iter_tags(_CHUNK_SIZE):
+                yield name
+        finally:
+            store.close()
+        return
+
+    for name in tag_io.read_tags(path, fmt, column=column, field=field):
+        yield name
+
+
+def _read_engine(paths, fmt=None, column=0, field=tag_io.JSONL_NAME_FIELD,
+                 collation=tag_keys.PLAIN_COLLATION,
+                 dedupe=tag_pipeline.EXACT_DEDUPE, processes=0, progress=None):
+    """Stream vocabulary files into a TagEngine, in display order.
+
+    Names are deduplicated by tag_pipeline first, see iter_unique_chunks
+    for the dedupe, processes and progress arguments.
+
+    Returns:
+        tuple: The engine, and the number of names read (duplicates
+            included).
+    """
+    engine = tag_engine.TagEngine()
+    engine.set_collation(collation)
+    engine.set_ordered(True)
+    is_match = tag_engine.substring_matcher('')
+    counts = [0]
+
+    def count_progress(read_count, unique_count):
+        counts[0] = read_count
+        if progress is not None:
+            progress(read_count, unique_count)
+
+    tags = itertools.chain.from_iterable(
+        _iter_tags(path, fmt, column, field) for path in paths)
+    for chunk in tag_pipeline.iter_unique_chunks(
+            tags, dedupe, processes, _CHUNK_SIZE, count_progress):
+        engine.add_rows(engine.register(chunk, is_match, commit=True)[1])
+
+    engine.resume_sorting()
+    if engine.needs_sorting():
+        engine.sort()
+
+    return engine, counts[0]
+
+
+def _write(engine, path, fmt=None):
+    """Write the tags of an engine to a vocabulary file or tag store.
+
+    Returns:
+        int: Number of tags written.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == mapped_vocabulary.EXTENSION:
+        return mapped_vocabulary.write_vocabulary(path, engine.iter_tags())
+
+    elif extension in STORE_EXTENSIONS:
+        from pyqt_tag_manager import tag_store
+
+        store = tag_store.SQLiteTagStore(path)
+        try:
+            store.replace_all(engine.iter_tags())
+            return store.count()
+        finally:
+            store.close()
+
+    return tag_io.write_tags(path, engine.iter_tags(), fmt)
+
+
+def _sample_queries(engine, count, seed=0):
+    """Returns search queries picked from the tag names: prefixes and inner
+    parts of random tags, from 1 to 4 characters long. """
+    generator = random.Random(seed)
+    queries = []
+
+    for _ in range(count):
+        name = engine.name(generator.randrange(len(engine)))
+        size = min(len(name), generator.randint(1, 4))
+        start = generator.randint(0, len(name) - size)
+        queries.append(name[start:start + size])
+
+    return queries
+
+
+def _format_ms(seconds):
+    return '{ms:>9.1f} ms'.format(ms=seconds * 1000)
+
+
+def _print_progress(read_count, unique_count):
+    """Overwrite the progress line on an interactive stderr. """
+    sys.stderr.write('\r{read} names read, {unique} unique'.format(
+        read=read_count, unique=unique_count))
+    sys.stderr.flush()
+
+
+# Public.
+def build(args):
+    """Merge vocabulary files into a single one, in display order. """
+    progress = _print_progress if sys.stderr.isatty() else None
+
+    start = time.perf_counter()
+    engine, count = _read_engine(args.inputs, args.format, args.column,
+                                 args.field, args.collation, args.dedupe,
+                                 args.processes, progress)
+    read_time = time.perf_counter() - start
+    if progress is not None:
+        sys.stderr.write('\n')
+
+    start = time.perf_counter()
+    written = _write(engine, args.output, args.output_format)
+    write_time = time.perf_counter() - start
+
+    print('read {count} names ({dupes} duplicates) in {t:.2f} s'.format(
+        count=count, dupes=count - len(engine), t=read_time))
+    print('wrote {written} tags to {path} in {t:.2f} s'.format(
+        written=written, path=args.output, t=write_time))
+
+    return 0
+
+
+def bench(args):
+    """Time search queries over a vocabulary: matching the tags, then
+    ordering them for display (matches first). """
+    start = time.perf_counter()
+    engine, _ = _read_engine([args.input], args.format, args.column,
+                             args.field, args.collation)
+    print('loaded {count} tags in {t:.2f} s'.format(
+        count=len(engine), t=time.perf_counter() - start))
+
+    if not len(engine):
+        return 1
+
+    matcher = None
+    if args.processes is not None:
+        from pyqt_tag_manager import match_engine
+
+        start = time.perf_counter()
+        matcher = match_engine.MatchEngine(args.processes,
+                                           min_parallel_size=0)
+        matcher.load(engine.vocabulary().search_key(tag_id)
+                     for tag_id in range(len(engine.vocabulary())))
+        print('started {count} worker processes in {t:.2f} s'.format(
+            count=args.processes, t=time.perf_counter() - start))
+
+    queries = args.queries or _sample_queries(engine, _QUERY_COUNT)
+    all_tags = engine.find_matches(tag_engine.substring_matcher(''))
+    print('{query:<12} {matches:>9} {match:>12} {order:>12}'.format(
+        query='query', matches='matches', match='match', order='order'))
+
+    try:
+        for query in queries:
+            search_key = tag_keys.search_key(query)
+            match_times = []
+            order_times = []
+
+            for _ in range(args.repeat):
+                # Every run starts from the unfiltered display order.
+                _, matches = engine.changed_match_rows(all_tags)
+                if matches is not None:
+                    engine.set_match_flags(matches)
+                    engine.sort()
+
+                start = time.perf_counter()
+                if matcher is None:
+                    match_set = engine.find_matches(
+                        tag_engine.substring_matcher(query))
+                else:
+                    # The engine has its own vocabulary, so the tag ids
+                    # are its member indexes.
+                    match_set = matcher.find_matches(search_key)
+                match_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                _, matches = engine.changed_match_rows(match_set)
+                if matches is not None:
+                    engine.set_match_flags(matches)
+                    engine.sort()
+                order_times.append(time.perf_counter() - start)
+
+            print('{query:<12} {matches:>9} {match} {order}'.format(
+                query=repr(query), matches=match_sets.popcount(match_set),
+                match=_format_ms(statistics.median(match_times)),
+                order=_format_ms(statistics.median(order_times))))
+
+    finally:
+        if matcher is not None:
+            matcher.close()
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pyqt_tag_manager',
+        description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_input_arguments(subparser):
+        subparser.add_argument('--format', choices=tag_io.FORMATS,
+                               help='Format of the text inputs, guessed from '
+                                    'their extension if omitted.')
+        subparser.add_argument('--column', default=0,
+                               type=lambda value: int(value)
+                               if value.isdigit() else value,
+                               help='CSV column holding the tag names, by '
+                                    'index or header name.')
+        subparser.add_argument('--field', default=tag_io.JSONL_NAME_FIELD,
+                               help='JSON Lines field holding the tag names.')
+        subparser.add_argument('--collation', choices=COLLATIONS,
+                               default=tag_keys.PLAIN_COLLATION,
+                               help='Display order of the tags. Binary '
+                                    'vocabularies always store the plain '
+                                    'order.')
+
+    build_parser = subparsers.add_parser('build', help=build.__doc__)
+    build_parser.add_argument('inputs', nargs='+',
+                              help='Vocabulary files or tag stores to '
+                                   'merge, in order.')
+    build_parser.add_argument('-o', '--output', required=True,
+                              help='Vocabulary file or tag store to write: '
+                                   '.tagvocab, .db, .sqlite, or any text '
+                                   'format.')
+    build_parser.add_argument('--output-format', choices=tag_io.FORMATS,
+                              help='Format of a text output, guessed from '
+                                   'its extension if omitted.')
+    build_parser.add_argument('--dedupe', choices=tag_pipeline.DEDUPE_MODES,
+                              default=tag_pipeline.EXACT_DEDUPE,
+                              help='What makes names duplicates: identical '
+                                   'names, like the widget, or names with '
+                                   'the same search key (case and Unicode '
+                                   'compatibility forms).')
+    build_parser.add_argument('--processes', type=int, default=0,
+                              help='Worker processes normalizing and '
+                                   'deduplicating the names. Zero does it '
+                                   'in-process.')
+    add_input_arguments(build_parser)
+    build_parser.set_defaults(run=build)
+
+    bench_parser = subparsers.add_parser('bench', help=bench.__doc__)
+    bench_parser.add_argument('input', help='Vocabulary file or tag store '
+                                            'to search.')
+    bench_parser.add_argument('--queries', nargs='+',
+                              help='Search queries, picked from the tag '
+                                   'names if omitted.')
+    bench_parser.add_argument('--repeat', type=int, default=3,
+                              help='Runs of each query, the median is '
+                                   'reported.')
+    bench_parser.add_argument('--processes', type=int, default=None,
+                              help='Match with a MatchEngine of this many '
+                                   'worker processes, rather than one tag '
+                                   'at a time.')
+    add_input_arguments(bench_parser)
+    bench_parser.set_defaults(run=bench)
+
+    args = parser.parse_args(argv)
+
+    try:
+        return args.run(args)
+    except (ValueError, OSError, sqlite3.Error) as error:
+        parser.error(str(error))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""Compact, pre-sorted binary vocabulary files that are memory-mapped.
+
+Large vocabularies are expensive to parse and sort every time a tool is
+launched. This format stores the tags along with everything the TagManager
+needs to display them: the sort keys and the display order. Loading a
+file only maps it into memory; tag names are decoded lazily, when they're
+requested.
+
+Layout (little-endian):
+    header: magic, version, flags, tag count and the offset of each
+        of the following sections.
+    name offsets: (count + 1) uint32 offsets into the names blob.
+    key offsets: (count + 1) uint32 offsets into the keys blob.
+    order: count uint32 tag ids, in display (sort_key, name) order.
+    names: UTF-8 encoded tag names.
+    keys: UTF-8 encoded sort keys, see tag_keys.sort_key.
+
+Ids refer to the order the tags were written in (first-seen order).
+
+Usage:
+    >>> write_vocabulary('studio.tagvocab', tag_io.read_tags('studio.csv'))
+    >>>
+    >>> with MappedVocabulary('studio.tagvocab') as vocabulary:
+    >>>     names = [vocabulary.name(tag_id) for tag_id in vocabulary.order]
+
+"""
+# Import built-in modules.
+import array
+import io
+import mmap
+import os
+import struct
+import sys
+
+# Import local modules.
+from pyqt_tag_manager import tag_keys
+
+
+# Constants.
+MAGIC = b'PQTV'
+VERSION = 2
+EXTENSION = '.tagvocab'
+
+# Magic, version, flags, count, then the offsets of the 5 sections.
+_HEADER = struct.Struct('<4sHHI5Q')
+_HEADER_SIZE = 64
+_ALIGNMENT = 8
+_NAME_CACHE_SIZE = 4096
+
+
+# Private.
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _uint32_array(values):
+    """Returns the little-endian uint32 array representation of values."""
+    result = array.array('I', values)
+    if sys.byteorder != 'little':
+        result.byteswap()
+
+    return result
+
+
+def _encode_blob(strings):
+    """Encode strings into a single UTF-8 blob and its offset table."""
+    offsets = [0]
+    blob = bytearray()
+
+    for string in strings:
+        blob += string.encode('utf-8')
+        offsets.append(len(blob))
+
+    if len(blob) > 0xFFFFFFFF:
+        raise ValueError('Vocabulary exceeds the 4 GB blob size limit.')
+
+    return offsets, blob
+
+
+# Public.
+def write_vocabulary(path, tags):
+    """Write tags to a binary vocabulary file.
+
+    Duplicate and empty names are skipped. The file is written next to
+    its destination first and then moved in place, so tools that have the
+    previous version mapped are never exposed to a partial file.
+
+    Args:
+        path (str): Path of the vocabulary file.
+        tags (iterable): Names of the tags to write.
+
+    Returns:
+        int: Number of tags written.
+    """
+    names = list(dict.fromkeys(name for name in tags if name))
+    keys = [tag_keys.sort_key(name) for name in names]
+    order = sorted(range(len(names)), key=lambda i: (keys[i], names[i]))
+
+    name_offsets, names_blob = _encode_blob(names)
+    key_offsets, keys_blob = _encode_blob(keys)
+
+    sections = (
+        _uint32_array(name_offsets).tobytes(),
+        _uint32_array(key_offsets).tobytes(),
+        _uint32_array(order).tobytes(),
+        bytes(names_blob),
+        bytes(keys_blob),
+    )
+
+    # Section offsets, each aligned for direct uint32 access.
+    offsets = []
+    position = _HEADER_SIZE
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section))
+
+    tmp_path = '{path}.tmp{pid}'.format(path=path, pid=os.getpid())
+    try:
+        with io.open(tmp_path, 'wb') as f:
+            header = _HEADER.pack(MAGIC, VERSION, 0, len(names), *offsets)
+            f.write(header.ljust(_HEADER_SIZE, b'\0'))
+
+            for offset, section in zip(offsets, sections):
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(section)
+
+        os.replace(tmp_path, path)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return len(names)
+
+
+class MappedVocabulary(object):
+    """Read-only, memory-mapped view of a binary vocabulary file.
+
+    Nothing is decoded on load. Names and keys are decoded when requested;
+    recently decoded names are cached, since views request the same
+    (visible) rows repeatedly.
+    """
+    def __init__(self, path):
+        self.path = path
+
+        self.__file = io.open(path, 'rb')
+        try:
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__file.close()
+            raise ValueError('Empty vocabulary file {path!r}'.format(
+                path=path))
+
+        self.__buffer = memoryview(self.__mmap)
+        self.__views = []
+        self.__name_cache = {}  # Tag id: decoded name.
+
+        try:
+            self.__read_header()
+        except Exception:
+            self.close()
+            raise
+
+    # Private.
+    def __read_header(self):
+        """Validate the header and map each section. """
+        if len(self.__buffer) < _HEADER_SIZE:
+            raise ValueError('Invalid vocabulary file {path!r}'.format(
+                path=self.path))
+
+        header = _HEADER.unpack_from(self.__buffer, 0)
+        magic, version, _, count = header[:4]
+        offsets = header[4:]
+
+        if magic != MAGIC:
+            raise ValueError('Invalid vocabulary file {path!r}'.format(
+                path=self.path))
+        if version != VERSION:
+            raise ValueError('Unsupported vocabulary version {ver} in '
+                             '{path!r}'.format(ver=version, path=self.path))
+
+        self.__count = count
+        self.__name_offsets = self.__map_uint32(offsets[0], count + 1)
+        self.__key_offsets = self.__map_uint32(offsets[1], count + 1)
+        self.__order = self.__map_uint32(offsets[2], count)
+        self.__names = self.__map(offsets[3], self.__name_offsets[count])
+        self.__keys = self.__map(offsets[4], self.__key_offsets[count])
+
+    def __map(self, offset, size):
+        if offset + size > len(self.__buffer):
+            raise ValueError('Truncated vocabulary file {path!r}'.format(
+                path=self.path))
+
+        view = self.__buffer[offset:offset + size]
+        self.__views.append(view)
+        return view
+
+    def __map_uint32(self, offset, count):
+        """Returns a read-only uint32 sequence over a section of the file.
+
+        On little-endian systems this is a zero-copy view of the mapped
+        memory.
+        """
+        view = self.__map(offset, count * 4)
+
+        if sys.byteorder == 'little':
+            view = view.cast('I')
+            self.__views.append(view)
+            return view
+
+        result = array.array('I', view.tobytes())
+        result.byteswap()
+        return result
+
+    # Inherited.
+    def __len__(self):
+        return self.__count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Public.
+    @property
+    def order(self):
+        """Sequence of tag ids, in display order. """
+        return self.__order
+
+    def name(self, tag_id):
+        """Returns the name of a tag.
+
+        Args:
+            tag_id (int): Id of the tag.
+
+        Returns:
+            str: Decoded tag name.
+        """
+        name = self.__name_cache.get(tag_id)
+
+        if name is None:
+            start, end = self.__name_offsets[tag_id], \
+                self.__name_offsets[tag_id + 1]
+            name = str(self.__names[start:end], 'utf-8')
+
+            # Keep the cache bounded, views only request a few rows at once.
+            if len(self.__name_cache) >= _NAME_CACHE_SIZE:
+                self.__name_cache.clear()
+            self.__name_cache[tag_id] = name
+
+        return name
+
+    def sort_key(self, tag_id):
+        """Returns the precomputed sort key of a tag, see tag_keys.sort_key.
+
+        Args:
+            tag_id (int): Id of the tag.
+
+        Returns:
+            str: Decoded sort key.
+        """
+        start, end = self.__key_offsets[tag_id], \
+            self.__key_offsets[tag_id + 1]
+        return str(self.__keys[start:end], 'utf-8')
+
+    def find(self, name):
+        """Find the id of a tag by name, using a binary search over the
+        display order.
+
+        Args:
+            name (str): Exact name of the tag.
+
+        Returns:
+            int: Id of the tag, or None if it doesn't exist.
+        """
+        target = (tag_keys.sort_key(name), name)
+        order = self.__order
+
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            tag_id = order[middle]
+            if (self.sort_key(tag_id), self.name(tag_id)) < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.__count and self.name(order[low]) == name:
+            return order[low]
+
+        return None
+
+    def iter_names(self):
+        """Iterate over the tag names, in display order.
+
+        Yields:
+            str: Name of each tag.
+        """
+        for tag_id in self.__order:
+            yield self.name(tag_id)
+
+    def close(self):
+        """Unmap the vocabulary file. """
+        # Views are released before the views they were derived from.
+        for view in reversed(self.__views):
+            view.release()
+        self.__views = []
+
+        self.__buffer.release()
+        self.__mmap.close()
+        self.__file.close()
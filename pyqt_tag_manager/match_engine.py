@@ -0,0 +1,268 @@
+"""Multi-process matching of search queries over large vocabularies.
+
+Matching a query is a loop over every search key, bound to a single core by
+the GIL. For vocabularies of a million tags, MatchEngine fans the matching
+out to worker processes instead:
+    - The search keys are packed into a single UTF-8 blob, in a shared
+      memory block. Each worker owns a contiguous chunk of tag ids,
+      decodes its chunk from the block once per load and slices the keys
+      by their offsets: nothing is pickled per key.
+    - Workers are started once, when keys are first loaded, and kept (along
+      with their keys) until the engine is closed. Queries only pay for the
+      matching, and for sending the query and its match sets.
+    - Each worker returns the match set of its chunk (see match_sets), and
+      the chunks are merged with bitwise operations.
+
+Keys are matched with the built-in string operations mapped over the keys,
+so the loop itself runs in C. Smaller vocabularies are matched in-process
+the same way, since it costs less than a round trip to the workers.
+
+This module doesn't depend on Qt.
+
+Usage:
+    >>> with MatchEngine() as engine:
+    >>>     engine.load(vocabulary.search_key(tag_id)
+    >>>                 for tag_id in range(len(vocabulary)))
+    >>>     match_set = engine.find_matches(tag_keys.search_key('tree'))
+
+"""
+# Import built-in modules.
+import array
+import itertools
+import multiprocessing
+import operator
+import os
+import re
+from multiprocessing import shared_memory
+
+# Import local modules.
+from pyqt_tag_manager import match_sets
+
+
+# Constants.
+SUBSTRING_MATCH = 'substring'  # Keys containing the query.
+FUZZY_MATCH = 'fuzzy'  # Keys containing the query characters, in order.
+MATCH_MODES = (SUBSTRING_MATCH, FUZZY_MATCH)
+
+# Keys of the chunk owned by the worker process, see _load_chunk.
+_chunk_keys = []
+
+
+# Private.
+def _match_keys(keys, search_key, mode):
+    """Returns the match set of a query over a list of keys, by index.
+
+    Args:
+        keys (list): Search keys to match.
+        search_key (str): Search key of the query, see tag_keys.search_key.
+        mode (str): How keys are matched, one of MATCH_MODES.
+
+    Returns:
+        int: The match set.
+    """
+    if mode == SUBSTRING_MATCH:
+        matches = map(operator.contains, keys, itertools.repeat(search_key))
+
+    elif mode == FUZZY_MATCH:
+        # Any characters between those of the query.
+        pattern = re.compile('.*?'.join(re.escape(character)
+                                        for character in search_key),
+                             re.DOTALL)
+        matches = map(bool, map(pattern.search, keys))
+
+    else:
+        raise ValueError('Unsupported match mode {mode!r}, expected one of '
+                         '{modes!r}'.format(mode=mode, modes=MATCH_MODES))
+
+    return match_sets.from_flags(bytearray(matches))
+
+
+def _load_chunk(name, start, end, key_offsets):
+    """Decode the keys of the worker's chunk from a shared memory block,
+    replacing the ones loaded before.
+
+    Keys are sliced by offset rather than split on a separator, since they
+    may contain any character.
+
+    Args:
+        name (str): Name of the shared memory block.
+        start (int): Offset of the chunk in the block, in bytes.
+        end (int): Offset after the last key of the chunk, in bytes.
+        key_offsets (array.array): Offset of each key in the decoded chunk,
+            in characters, followed by the length of the chunk.
+
+    Returns:
+        int: Number of keys of the chunk.
+    """
+    global _chunk_keys
+
+    memory = shared_memory.SharedMemory(name)
+    try:
+        text = bytes(memory.buf[start:end]).decode('utf-8')
+    finally:
+        memory.close()
+
+    _chunk_keys = list(map(text.__getitem__, map(slice, key_offsets[:-1],
+                                                  key_offsets[1:])))
+    return len(_chunk_keys)
+
+
+def _match_chunk(search_key, mode):
+    """Returns the match set of a query over the worker's chunk. """
+    return _match_keys(_chunk_keys, search_key, mode)
+
+
+class MatchEngine(object):
+    """Matches search queries over search keys, in parallel worker
+    processes for large vocabularies.
+
+    Keys are indexed by tag id, in the order they're loaded. Match sets
+    only hold the ids of the keys loaded, tags added to the vocabulary
+    afterwards need to be matched separately or loaded again.
+
+    Args:
+        processes (int): Number of worker processes. Defaults to the number
+            of CPUs. Zero matches every query in-process.
+        min_parallel_size (int): Number of keys below which queries are
+            matched in-process.
+    """
+    def __init__(self, processes=None, min_parallel_size=100000):
+        self.__processes = (os.cpu_count() or 1) if processes is None \
+            else processes
+        self.__min_parallel_size = min_parallel_size
+
+        self.__count = 0
+        self.__keys = []  # Matched in-process, see is_parallel.
+
+        # A single process pool per worker, so each one keeps its chunk.
+        self.__workers = []
+        self.__chunks = []  # First tag id of each worker's chunk.
+
+    # Private.
+    def __start_workers(self):
+        """Start the worker processes, if they aren't running yet. """
+        if self.__workers:
+            return
+
+        # Workers are spawned, rather than forked from a process that may be
+        # running threads (e.g. a Qt application).
+        context = multiprocessing.get_context('spawn')
+        self.__workers = [context.Pool(1) for _ in range(self.__processes)]
+
+    def __share(self, keys):
+        """Split the keys into a chunk per worker, loaded through a shared
+        memory block. """
+        self.__start_workers()
+
+        step = -(-len(keys) // len(self.__workers))
+        self.__chunks = list(range(0, len(keys), step))
+
+        # Byte range and key offsets of each chunk, see _load_chunk.
+        blob = bytearray()
+        chunks = []
+        for first in self.__chunks:
+            chunk_keys = keys[first:first + step]
+            key_offsets = array.array('Q', [0])
+            key_offsets.extend(itertools.accumulate(map(len, chunk_keys)))
+
+            start = len(blob)
+            blob += ''.join(chunk_keys).encode('utf-8')
+            chunks.append((start, len(blob), key_offsets))
+
+        memory = shared_memory.SharedMemory(create=True, size=max(len(blob),
+                                                                  1))
+        try:
+            memory.buf[:len(blob)] = blob
+            del blob
+
+            results = [
+                worker.apply_async(_load_chunk, (memory.name,) + chunk)
+                for worker, chunk in zip(self.__workers, chunks)]
+
+            for result in results:
+                result.get()
+
+        # Workers have decoded their chunk, the block isn't needed anymore.
+        finally:
+            memory.close()
+            memory.unlink()
+
+    # Inherited.
+    def __len__(self):
+        return self.__count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Public.
+    def load(self, search_keys):
+        """Load the search keys to match, replacing the keys loaded before.
+
+        Args:
+            search_keys (Iterable[str]): Search key of each tag, in tag id
+                order (see tag_keys.search_key).
+
+        Returns:
+            int: Number of keys loaded.
+        """
+        keys = list(search_keys)
+        self.__count = len(keys)
+
+        if self.is_parallel():
+            self.__keys = []
+            self.__share(keys)
+        else:
+            self.__keys = keys
+            self.__chunks = []
+
+        return self.__count
+
+    def is_parallel(self):
+        """Checks if queries are matched by the worker processes. """
+        return self.__processes > 0 and \
+            self.__count >= self.__min_parallel_size
+
+    def find_matches(self, search_key, mode=SUBSTRING_MATCH):
+        """Returns the match set of a query over the loaded keys.
+
+        Args:
+            search_key (str): Search key of the query, see
+                tag_keys.search_key.
+            mode (str): How keys are matched, one of MATCH_MODES.
+
+        Returns:
+            int: The match set, by tag id (see match_sets).
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError('Unsupported match mode {mode!r}, expected one '
+                             'of {modes!r}'.format(mode=mode,
+                                                   modes=MATCH_MODES))
+
+        if not search_key:
+            return (1 << self.__count) - 1
+
+        if not self.is_parallel():
+            return _match_keys(self.__keys, search_key, mode)
+
+        results = [worker.apply_async(_match_chunk, (search_key, mode))
+                   for worker, _ in zip(self.__workers, self.__chunks)]
+
+        match_set = 0
+        for first, result in zip(self.__chunks, results):
+            match_set |= result.get() << first
+
+        return match_set
+
+    def close(self):
+        """Stop the worker processes and release the loaded keys. """
+        for worker in self.__workers:
+            worker.terminate()
+            worker.join()
+
+        self.__workers = []
+        self.__chunks = []
+        self.__keys = []
+        self.__count = 0
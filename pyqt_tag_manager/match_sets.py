@@ -0,0 +1,142 @@
+"""Match sets: the tags matching a search query, as bitsets over tag ids.
+
+A match set is a Python int whose bit n is set if the tag of id n matches.
+They're compact (a bit per tag, rather than a byte) and are combined,
+compared and counted with integer operations, all running in C:
+    - Tags whose match changed between two queries: old ^ new.
+    - Tags matching both queries: old & new.
+    - Number of matching tags: popcount(match_set).
+
+Match sets are converted from and to the bytearrays of flags (one byte per
+tag id) used by the models.
+
+This module doesn't depend on Qt.
+
+Usage:
+    >>> cache = MatchCache()
+    >>> match_set = cache.get(search_key)
+    >>> if match_set is None:
+    >>>     match_set = cache.put(search_key, from_flags(matches))
+    >>> changed_ids = list(iter_ids(match_set ^ previous_match_set))
+
+"""
+# Import built-in modules.
+import collections
+
+
+# Constants.
+_FLAGS_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_DIGITS_TO_FLAGS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def from_flags(flags):
+    """Returns the match set of flags, by tag id.
+
+    Args:
+        flags (bytearray): 1 for the ids in the set, otherwise 0.
+
+    Returns:
+        int: The match set.
+    """
+    if not flags:
+        return 0
+
+    # The first id is the least significant bit, the last binary digit.
+    return int(bytes(flags[::-1]).translate(_FLAGS_TO_DIGITS), 2)
+
+
+def to_flags(match_set, size):
+    """Returns the flags of a match set, by tag id.
+
+    Args:
+        match_set (int): The match set.
+        size (int): Number of flags, at least the highest id of the set + 1.
+
+    Returns:
+        bytearray: 1 for the ids in the set, otherwise 0.
+    """
+    flags = bytearray(
+        format(match_set, 'b').encode('ascii').translate(_DIGITS_TO_FLAGS)
+        if match_set else b'')
+    flags.reverse()
+    flags.extend(bytes(size - len(flags)))
+
+    return flags
+
+
+def iter_ids(match_set):
+    """Iterate over the tag ids of a match set.
+
+    Args:
+        match_set (int): The match set.
+
+    Yields:
+        int: Id of each tag in the set, in ascending order.
+    """
+    digits = format(match_set, 'b')[::-1]
+    tag_id = digits.find('1')
+
+    while tag_id >= 0:
+        yield tag_id
+        tag_id = digits.find('1', tag_id + 1)
+
+
+def popcount(match_set):
+    """Returns the number of tags in a match set. """
+    return bin(match_set).count('1')
+
+
+class MatchCache(object):
+    """Bounded LRU of the match sets of recent queries.
+
+    Backspacing or typing a recent query again restores its match set
+    without matching every tag again. Match sets only hold the tags they
+    were computed for, so the cache must be cleared when tags are added.
+
+    Args:
+        size (int): Maximum number of match sets kept.
+    """
+    def __init__(self, size=32):
+        self.size = size
+        self.__match_sets = collections.OrderedDict()  # Query: match set.
+
+    # Inherited.
+    def __len__(self):
+        return len(self.__match_sets)
+
+    # Public.
+    def get(self, query):
+        """Returns the match set of a query, or None if it isn't cached.
+
+        Args:
+            query (hashable): Identifies the query, e.g. its search key.
+        """
+        match_set = self.__match_sets.get(query)
+
+        if match_set is not None:
+            self.__match_sets.move_to_end(query)
+
+        return match_set
+
+    def put(self, query, match_set):
+        """Cache the match set of a query, discarding the least recently
+        used one if the cache is full.
+
+        Args:
+            query (hashable): Identifies the query, e.g. its search key.
+            match_set (int): The match set of the query.
+
+        Returns:
+            int: The match set.
+        """
+        self.__match_sets[query] = match_set
+        self.__match_sets.move_to_end(query)
+
+        while len(self.__match_sets) > self.size:
+            self.__match_sets.popitem(last=False)
+
+        return match_set
+
+    def clear(self):
+        """Discard every match set. """
+        self.__match_sets.clear()
@@ -0,0 +1,20 @@
+# Import built-in modules.
+import importlib
+
+
+# Submodules are imported on first access, e.g. `qt_market.color_utils`.
+_SUBMODULES = ('animations', 'color_utils', 'editors', 'mixins', 'validators',
+               'widget_vendor')
+
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError('module {mod!r} has no attribute {attr!r}'.format(
+            mod=__name__, attr=name))
+
+    return importlib.import_module('{pkg}.{mod}'.format(pkg=__name__,
+                                                        mod=name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
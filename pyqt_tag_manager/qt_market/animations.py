@@ -4,30 +4,83 @@ from pyqt_tag_manager import QtGui
 from pyqt_tag_manager import QtWidgets
 
 
-class FailColorAnimation(QtCore.QPropertyAnimation):
-    """Property animation to indicate errors.
+class FailColorAnimation(QtCore.QVariantAnimation):
+    """Color animation to indicate errors.
     Displays a color transition as the color red fading out to 0 alpha.
+
+    Widgets should keep a single animation: playing it while it's running
+    restarts it. The colorize effect is only installed on the widget while
+    the animation runs, and is deleted as soon as it stops.
+
+    QGraphicsColorizeEffect renders the widget offscreen on every frame. In
+    low overhead mode, the base color of the widget is tinted instead.
+
+    Args:
+        parent (QtWidgets.QWidget): Widget to animate.
+        low_overhead (bool): Tint the widget rather than using an effect.
     """
-    def __init__(self, parent):
+    def __init__(self, parent, low_overhead=False):
         super(FailColorAnimation, self).__init__(parent)
-        effect = QtWidgets.QGraphicsColorizeEffect(parent)
-        effect.setStrength(1)
-        parent.setGraphicsEffect(effect)
+        self.low_overhead = low_overhead
 
-        # Defaults.
-        self.setPropertyName(b'color')
-        self.setTargetObject(effect)
+        self.__effect = None  # Installed while running, see __install.
+        self.__palette = None  # Palette of the widget, in low overhead mode.
 
+        # Defaults.
         self.__start_color = QtGui.QColor(255, 0, 0, 225)
         self.__end_color = QtGui.QColor(255, 0, 0, 0)
         self.__duration = 500
         self.__curve = QtCore.QEasingCurve.InQuint
 
-        self.finished.connect(self._on_finish)
+        self.valueChanged.connect(self._on_value_changed)
+        self.stateChanged.connect(self._on_state_changed)
+
+    # Private.
+    def __install(self):
+        """Prepare the widget for the animation. """
+        widget = self.parent()
+
+        if self.low_overhead:
+            if self.__palette is None:
+                self.__palette = QtGui.QPalette(widget.palette())
+
+        elif self.__effect is None:
+            self.__effect = QtWidgets.QGraphicsColorizeEffect(widget)
+            self.__effect.setStrength(1)
+            self.__effect.destroyed.connect(self._on_effect_destroyed)
+            widget.setGraphicsEffect(self.__effect)
+
+    def __release(self):
+        """Restore the base styling of the widget. """
+        widget = self.parent()
+
+        if self.__effect is not None:
+            # Deletes the effect, unless it was replaced in the meantime.
+            if widget.graphicsEffect() is self.__effect:
+                widget.setGraphicsEffect(None)
+            self.__effect = None
+
+        if self.__palette is not None:
+            widget.setPalette(self.__palette)
+            self.__palette = None
+
+    def __tint(self, color):
+        """Blend the color over the base color of the widget. """
+        palette = QtGui.QPalette(self.__palette)
+        base_color = palette.color(QtGui.QPalette.Base)
+        alpha = color.alphaF()
+
+        palette.setColor(QtGui.QPalette.Base, QtGui.QColor(
+            int(base_color.red() + (color.red() - base_color.red()) * alpha),
+            int(base_color.green() +
+                (color.green() - base_color.green()) * alpha),
+            int(base_color.blue() + (color.blue() - base_color.blue()) * alpha),
+        ))
+        self.parent().setPalette(palette)
 
     # Public.
     def play(self, color=None, duration=None, curve=None):
-        """Play the property animation.
+        """Play the animation, from the start if it's already running.
 
         Args:
             color (QtCore.QColor): Override the default "red" color to
@@ -47,17 +100,38 @@ class FailColorAnimation(QtCore.QPropertyAnimation):
         dur = self.__duration if duration is None else duration
         curve = self.__curve if curve is None else curve
 
-        # Play animation.
         self.setStartValue(start_color)
         self.setEndValue(end_color)
         self.setEasingCurve(curve)
         self.setDuration(dur)
+
+        # Restart, keeping the effect that's already installed.
+        if self.state() == self.Running:
+            self.setCurrentTime(0)
+            return
+
+        self.__install()
         self.start()
 
     # Slots.
-    @QtCore.Slot()
-    def _on_finish(self):
-        """Triggered when animation is finished playing."""
+    @QtCore.Slot(object)
+    def _on_value_changed(self, color):
+        """Triggered on each frame of the animation. """
+        if self.__effect is not None:
+            self.__effect.setColor(color)
+        elif self.__palette is not None:
+            self.__tint(color)
+
+    @QtCore.Slot(object, object)
+    def _on_state_changed(self, new_state, old_state):
+        """Triggered when the animation is started, stopped or paused. """
         # Remove the graphic effect from the widget so that its base
         # styling isn't affected.
-        self.parent().setGraphicsEffect(None)
+        if new_state == self.Stopped:
+            self.__release()
+
+    @QtCore.Slot()
+    def _on_effect_destroyed(self, *args):
+        """Triggered when the effect is deleted, e.g. replaced by another
+        effect on the widget. """
+        self.__effect = None
@@ -1,12 +1,23 @@
 # Import built-in modules.
+import collections
 import enum
+import zlib
 
 # Import local modules.
 from pyqt_tag_manager import QtGui
 
 
-# TODO: The TagManager should allow configurable color maps so users can
-#  customize the color palette for their own needs and interfaces.
+# Constants.
+LIGHT_THEME = 'light'
+DARK_THEME = 'dark'
+THEMES = (LIGHT_THEME, DARK_THEME)
+DEFAULT_PALETTE = 'default'
+
+# Final colors of a tag, see Palette.get_colors.
+TagColors = collections.namedtuple(
+    'TagColors', ['base', 'pastel', 'desaturated', 'border'])
+
+
 class __ColorPaletteMap(enum.Enum):
     """Default color map used to determine the color palette for the tags. """
     A = (200, 0, 0)
@@ -49,14 +60,7 @@ def get_mapped_color(text):
     Returns:
         QtCore.QColor: The mapped color value of the corresponding text.
     """
-    text = text.capitalize()[0]
-
-    if hasattr(__ColorPaletteMap, text):
-        return QtGui.QColor(*getattr(__ColorPaletteMap, text).value)
-    elif text.isnumeric():
-        return QtGui.QColor(*getattr(__ColorPaletteMap, 'NUM').value)
-    else:
-        return QtGui.QColor(*getattr(__ColorPaletteMap, 'OTHER').value)
+    return QtGui.QColor(get_palette().get_colors(text).base)
 
 
 def pastelize_color(color):
@@ -106,3 +110,382 @@ def desaturate(color, percent):
     )
 
     return desaturated_color
+
+
+class Palette(object):
+    """Maps the first character of tag names to their colors.
+
+    The final colors of a tag (see TagColors) are computed once per
+    character and theme, then read from a lookup table, so getting the
+    colors of a tag is a single dict lookup. Tables are built on first use.
+
+    Characters are matched case-insensitively. Numbers and characters
+    without a color of their own use `number_color` and `other_color`.
+
+    Args:
+        name (str): Name of the palette, see register_palette.
+        colors (dict): RGB tuples, by character.
+        number_color (tuple): RGB of tags starting with a number.
+        other_color (tuple): RGB of tags starting with anything else.
+    """
+    def __init__(self, name, colors, number_color=(50, 50, 50),
+                 other_color=(50, 50, 50)):
+        self.name = name
+        self.number_color = number_color
+        self.other_color = other_color
+
+        self.__colors = dict((char.upper(), tuple(rgb))
+                             for char, rgb in colors.items())
+        self.__tables = {}  # Theme: {character: TagColors}.
+
+    # Private.
+    def __build_table(self, theme):
+        """Compute the colors of every character of the palette, in both
+        cases. """
+        table = {}
+
+        for char in self.__colors:
+            table[char] = table[char.lower()] = self.__colors_of(char, theme)
+
+        return table
+
+    def __colors_of(self, char, theme):
+        base_color = QtGui.QColor(*self.base_color(char.upper()))
+
+        pastel_color = pastelize_color(base_color)
+        pastel_color.setAlpha(255)
+
+        desaturated_color = desaturate(pastel_color, percent=15)
+        desaturated_color.setAlpha(255)
+
+        # The border is only visible in light mode.
+        border_color = base_color.darker(125)
+        border_color.setAlpha(255 if theme == LIGHT_THEME else 0)
+
+        return TagColors(base_color, pastel_color, desaturated_color,
+                         border_color)
+
+    # Public.
+    def base_color(self, char):
+        """Returns the base color of a character, before any styling.
+
+        Subclasses can override this to map characters differently, it's
+        only called once per character and theme.
+
+        Args:
+            char (str): Uppercase first character of a tag name.
+
+        Returns:
+            tuple: RGB of the character.
+        """
+        rgb = self.__colors.get(char)
+
+        if rgb is not None:
+            return rgb
+        elif char.isnumeric():
+            return self.number_color
+        else:
+            return self.fallback_color(char)
+
+    def fallback_color(self, char):
+        """Returns the base color of a character that has no color of its
+        own and isn't a number.
+
+        Args:
+            char (str): Uppercase first character of a tag name.
+
+        Returns:
+            tuple: RGB of the character.
+        """
+        return self.other_color
+
+    def get_colors(self, text, theme=LIGHT_THEME):
+        """Returns the colors of a tag.
+
+        The colors are shared by every tag starting with the same character,
+        so they must be copied before being modified.
+
+        Args:
+            text (str): Name of the tag.
+            theme (str): One of THEMES.
+
+        Returns:
+            TagColors: Base, pastel, desaturated (the background of the
+                tags) and border colors.
+        """
+        table = self.__tables.get(theme)
+        if table is None:
+            table = self.__tables[theme] = self.__build_table(theme)
+
+        char = text[:1]
+        colors = table.get(char)
+
+        if colors is None:
+            colors = table[char] = self.__colors_of(char, theme)
+
+        return colors
+
+
+class HashPalette(Palette):
+    """Palette spreading the characters without a color of their own over a
+    list of colors, by hashing them.
+
+    Useful for non-Latin scripts, where a color per character isn't
+    practical: tags starting with the same character still share a color,
+    and the colors are stable across sessions.
+
+    Args:
+        name (str): Name of the palette, see register_palette.
+        hash_colors (list): RGB tuples the characters are spread over.
+        colors (dict): RGB tuples of specific characters, if any.
+        number_color (tuple): RGB of tags starting with a number.
+    """
+    def __init__(self, name, hash_colors, colors=None,
+                 number_color=(50, 50, 50)):
+        super(HashPalette, self).__init__(name, colors or {},
+                                          number_color=number_color)
+        self.hash_colors = [tuple(rgb) for rgb in hash_colors]
+
+    def fallback_color(self, char):
+        if not char:
+            return self.other_color
+
+        # Python's hash is salted per process, crc32 isn't.
+        index = zlib.crc32(char.encode('utf-8')) % len(self.hash_colors)
+        return self.hash_colors[index]
+
+
+# Registered palettes, by name. See register_palette.
+_PALETTES = {}
+
+
+def register_palette(palette):
+    """Register a palette, so it can be used by name.
+
+    Registering a palette with the name of an existing one replaces it.
+
+    Args:
+        palette (Palette): Palette to register.
+    """
+    _PALETTES[palette.name] = palette
+
+
+def get_palette(name=DEFAULT_PALETTE):
+    """Get a registered palette.
+
+    Args:
+        name (str): Name of the palette.
+
+    Returns:
+        Palette: The registered palette.
+    """
+    try:
+        return _PALETTES[name]
+    except KeyError:
+        raise ValueError('Unknown palette {name!r}, expected one of '
+                         '{names!r}'.format(name=name,
+                                            names=sorted(_PALETTES)))
+
+
+register_palette(Palette(
+    DEFAULT_PALETTE,
+    dict((member.name, member.value)
+         for member in __ColorPaletteMap.__members__.values()
+         if len(member.name) == 1),
+    number_color=__ColorPaletteMap.NUM.value,
+    other_color=__ColorPaletteMap.OTHER.value,
+))
+
+
+# Batch color conversions.
+# These mirror the QColor conversions used by pastelize_color and desaturate
+# (16-bit channels, rounding included) with NumPy, so thousands of colors
+# can be transformed at once and turned into QColors only at the end.
+# NumPy is optional, it's only imported when they're first used.
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('NumPy is required by the batch color functions.')
+
+    return numpy
+
+
+def _qround(np, values):
+    """qRound of non-negative values. """
+    return np.floor(values + 0.5).astype(np.int64)
+
+
+def _to_8bit(values):
+    """QColor's conversion of 16-bit channels to 8-bit ones (Qt 5). """
+    return values >> 8
+
+
+def _rgb16_to_hue(np, rgb16):
+    """Returns the hue (centidegrees, 65535 if achromatic), the maximum and
+    the minimum channel of 16-bit RGB colors. """
+    rgb = rgb16 / 65535.0
+    red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maximum = rgb.max(axis=1)
+    minimum = rgb.min(axis=1)
+    delta = maximum - minimum
+
+    chromatic = delta > 0
+    safe_delta = np.where(chromatic, delta, 1.0)
+
+    hue = np.where(red == maximum, (green - blue) / safe_delta,
+                   np.where(green == maximum, 2.0 + (blue - red) / safe_delta,
+                            4.0 + (red - green) / safe_delta)) * 60.0
+    hue = np.where(hue < 0.0, hue + 360.0, hue)
+
+    return (np.where(chromatic, _qround(np, hue * 100), 0xFFFF), maximum,
+            minimum)
+
+
+def _hsv16_to_rgb16(np, hue, saturation, value):
+    hue_f = np.where(hue == 36000, 0, hue) / 6000.0
+    saturation_f = saturation / 65535.0
+    value_f = value / 65535.0
+
+    sector = np.floor(hue_f).astype(np.int64)
+    fraction = hue_f - sector
+    p = value_f * (1.0 - saturation_f)
+    q = value_f * (1.0 - saturation_f * fraction)
+    t = value_f * (1.0 - saturation_f * (1.0 - fraction))
+
+    conditions = [sector == i for i in range(6)]
+    rgb = np.stack([
+        np.select(conditions, [value_f, q, p, p, t, value_f]),
+        np.select(conditions, [t, value_f, value_f, q, p, p]),
+        np.select(conditions, [p, p, t, value_f, value_f, q]),
+    ], axis=1)
+    rgb16 = _qround(np, rgb * 65535)
+
+    achromatic = ((saturation == 0) | (hue == 0xFFFF))[:, None]
+    return np.where(achromatic, value[:, None], rgb16)
+
+
+def _hsl16_to_rgb16(np, hue, saturation, lightness):
+    hue_f = np.where(hue == 36000, 0, hue) / 36000.0
+    saturation_f = saturation / 65535.0
+    lightness_f = lightness / 65535.0
+
+    temp2 = np.where(lightness_f < 0.5, lightness_f * (1.0 + saturation_f),
+                     lightness_f + saturation_f - lightness_f * saturation_f)
+    temp1 = 2.0 * lightness_f - temp2
+
+    channels = []
+    for offset in (1.0 / 3.0, 0.0, -1.0 / 3.0):
+        temp3 = hue_f + offset
+        temp3 = np.where(temp3 < 0.0, temp3 + 1.0,
+                         np.where(temp3 > 1.0, temp3 - 1.0, temp3))
+
+        channels.append(np.select(
+            [temp3 * 6.0 < 1.0, temp3 * 2.0 < 1.0, temp3 * 3.0 < 2.0],
+            [temp1 + (temp2 - temp1) * temp3 * 6.0,
+             temp2,
+             temp1 + (temp2 - temp1) * (2.0 / 3.0 - temp3) * 6.0],
+            temp1))
+
+    rgb16 = _qround(np, np.stack(channels, axis=1) * 65535)
+
+    achromatic = ((saturation == 0) | (hue == 0xFFFF))[:, None]
+    return np.where(achromatic, lightness[:, None], rgb16)
+
+
+def _as_rgb16(np, colors):
+    """Returns the 16-bit RGB channels of 8-bit RGB(A) colors, as QColor
+    stores them. """
+    colors = np.asarray(colors, dtype=np.int64)
+    if colors.ndim != 2 or colors.shape[1] not in (3, 4):
+        raise ValueError('Expected an array of RGB or RGBA colors, got shape '
+                         '{shape!r}'.format(shape=colors.shape))
+
+    return colors, colors[:, :3] * 0x101
+
+
+def _as_result(np, colors, rgb16):
+    """Returns 8-bit colors with the channels of the input, opaque. """
+    result = np.full(colors.shape, 255, dtype=np.uint8)
+    result[:, :3] = _to_8bit(rgb16)
+
+    return result
+
+
+def pastelize_colors(colors):
+    """Batch version of pastelize_color.
+
+    Args:
+        colors (array-like): RGB or RGBA values, shaped (count, 3) or
+            (count, 4).
+
+    Returns:
+        numpy.ndarray: Pastelized uint8 colors, shaped like the input. Like
+            pastelize_color, the results are opaque.
+    """
+    np = _import_numpy()
+    colors, rgb16 = _as_rgb16(np, colors)
+
+    # lighter(140), through HSV.
+    hue, maximum, minimum = _rgb16_to_hue(np, rgb16)
+    delta = maximum - minimum
+    saturation = np.where(delta > 0, _qround(
+        np, delta / np.where(maximum > 0, maximum, 1.0) * 65535), 0)
+    value = _qround(np, maximum * 65535) * 140 // 100
+
+    saturation = np.maximum(saturation - np.maximum(value - 0xFFFF, 0), 0)
+    value = np.minimum(value, 0xFFFF)
+    rgb16 = _hsv16_to_rgb16(np, hue, saturation, value)
+
+    # setHsl(hslHue(), 150, clamped lightness()).
+    hue, maximum, minimum = _rgb16_to_hue(np, rgb16)
+    hue = np.where(hue == 0xFFFF, hue, hue // 100 * 100)
+    lightness = _to_8bit(_qround(np, (maximum + minimum) * 0.5 * 65535))
+    lightness = np.clip(lightness, 100, 160) * 0x101
+    saturation = np.full(hue.shape, 150 * 0x101, dtype=np.int64)
+
+    return _as_result(np, colors,
+                      _hsl16_to_rgb16(np, hue, saturation, lightness))
+
+
+def desaturate_colors(colors, percent):
+    """Batch version of desaturate.
+
+    Args:
+        colors (array-like): RGB or RGBA values, shaped (count, 3) or
+            (count, 4).
+        percent (float): Percentage to reduce the saturation value by.
+
+    Returns:
+        numpy.ndarray: Desaturated uint8 colors, shaped like the input. Like
+            desaturate, the results are opaque.
+    """
+    np = _import_numpy()
+    colors, rgb16 = _as_rgb16(np, colors)
+
+    hue, maximum, minimum = _rgb16_to_hue(np, rgb16)
+    delta = maximum - minimum
+    saturation = np.where(delta > 0, _qround(
+        np, delta / np.where(maximum > 0, maximum, 1.0) * 65535), 0)
+    value = _qround(np, maximum * 65535)
+
+    # setHsvF(hsvHueF(), saturationF - percent, valueF()).
+    saturation = _qround(
+        np, np.maximum(saturation / 65535.0 - percent / 100.0, 0) * 65535)
+
+    return _as_result(np, colors, _hsv16_to_rgb16(np, hue, saturation, value))
+
+
+def to_qcolors(colors):
+    """Build QColors from RGB(A) values, e.g. the results of the batch
+    functions.
+
+    Args:
+        colors (array-like): RGB or RGBA values, shaped (count, 3) or
+            (count, 4).
+
+    Returns:
+        list: QColor of each color.
+    """
+    return [QtGui.QColor(*color) for color in _import_numpy().asarray(
+        colors, dtype=int).tolist()]
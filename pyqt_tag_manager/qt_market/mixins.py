@@ -16,6 +16,10 @@ from pyqt_tag_manager import QtGui
 from pyqt_tag_manager import QtWidgets
 
 
+# Constants.
+_ELIDED_TEXT_CACHE_SIZE = 1024  # Per widget.
+
+
 class MixinElided(object):
     """Adds text elision parameters and functionality, when used with text
     widgets.
@@ -31,7 +35,19 @@ class MixinElided(object):
         using QObject as base for mixin.
         It appears to be resolved when using python object instead.
 
+        Elision is cached, so dragging a splitter over many elided widgets
+        stays cheap:
+            - Font metrics, by font, shared by all the widgets.
+            - Elided texts, by text, width and mode, per widget.
+            - The range of widths the displayed text was elided at. The
+              elided text only changes at a few widths (when a character
+              fits or no longer does), so resizing within the range, or
+              above the width fitting the whole text, does nothing.
+
     """
+    # Font metrics, shared by all the widgets.
+    _font_metrics = {}  # Font key: QFontMetrics.
+
     def __init__(self, parent=None):
         # Validation.
         assert isinstance(self, (QtWidgets.QLineEdit,
@@ -48,28 +64,90 @@ class MixinElided(object):
 
         self.elide_mode = QtCore.Qt.ElideRight
 
+        self.__has_text_margins = hasattr(self, 'textMargins')
+        self.__font_metrics = None  # See __elide.
+        self.__elided_texts = {}  # (text, width, mode): elided text.
+        self.__reset_elision()
+
         self.setObjectName('test')
 
     # Private.
+    def __reset_elision(self):
+        """Forget the range of widths of the displayed text, so that the
+        next elision isn't skipped. """
+        self.__elided_text = None  # Displayed text.
+        self.__min_width = self.__max_width = None  # Range of the text.
+
+    def __elide(self, width):
+        """Returns the real text elided to the width.
+
+        Args:
+            width (int): Width available for the text.
+
+        Returns:
+            str: The elided text.
+        """
+        key = (self._real_text, width, self.elide_mode)
+        elided_text = self.__elided_texts.get(key)
+
+        if elided_text is None:
+            if self.__font_metrics is None:
+                font = self.font()
+                font_key = font.key()
+                self.__font_metrics = self._font_metrics.get(font_key)
+
+                if self.__font_metrics is None:
+                    self.__font_metrics = self._font_metrics[font_key] = \
+                        QtGui.QFontMetrics(font)
+
+            if len(self.__elided_texts) >= _ELIDED_TEXT_CACHE_SIZE:
+                self.__elided_texts.clear()
+
+            elided_text = self.__elided_texts[key] = \
+                self.__font_metrics.elidedText(self._real_text,
+                                               self.elide_mode, width)
+
+        return elided_text
+
     def __set_elided_text(self):
-        """Elide the real text and display it on the widget."""
+        """Elide the real text and display it on the widget.
+
+        Nothing is done if the width is within the range of widths the
+        displayed text was elided at.
+        """
         r_margin_padding = 0
 
-        if hasattr(self, 'textMargins'):
+        if self.__has_text_margins:
             r_margin_padding = self.textMargins().right() + \
                                self.textMargins().left() + \
                                2  # Cuts off elision within display area.
 
-        font_metrics = QtGui.QFontMetrics(self.font())
         width = self.geometry().width() - r_margin_padding
 
-        elided_text = font_metrics.elidedText(self._real_text,
-                                              self.elide_mode,
-                                              width
-                                              )
+        if self.__elided_text is not None and \
+                self.__min_width <= width <= self.__max_width:
+            return
+
+        elided_text = self.__elide(width)
+        is_changed = elided_text != self.__elided_text
+
+        # Same text: widen its range. The whole text fits any wider width.
+        if not is_changed:
+            self.__min_width = min(self.__min_width, width)
+            self.__max_width = max(self.__max_width, width)
+        else:
+            self.__elided_text = elided_text
+            self.__min_width = self.__max_width = width
+
+        if elided_text == self._real_text:
+            self.__max_width = float('inf')
 
-        super(MixinElided, self).setText(elided_text)
-        self.__set_cursor_to_start()
+        # Only update the widget (and its layout) when the text changed. Done
+        # last, since it may resize the widget (e.g. the scroll bars of a
+        # QTextEdit) and come back here.
+        if is_changed:
+            super(MixinElided, self).setText(elided_text)
+            self.__set_cursor_to_start()
 
     def __set_cursor_to_start(self):
         """If the widget has editable text, move the text cursor position
@@ -96,6 +174,7 @@ class MixinElided(object):
                 use for the displayed text.
         """
         self.elide_mode = elide_mode
+        self.__reset_elision()
 
     # Overrides.
     def setText(self, text):
@@ -107,6 +186,7 @@ class MixinElided(object):
         """
         # Store the real text.
         self._real_text = text
+        self.__reset_elision()
 
         # If elision is enabled, display the elided text.
         if self._use_elision:
@@ -131,6 +211,23 @@ class MixinElided(object):
 
         event.accept()
 
+    def changeEvent(self, event):
+        """Override the inherited changeEvent method.
+        Elides the text again when the font of the widget changes.
+
+        Args:
+            event (QtCore.QEvent): Pass-through event.
+        """
+        super(MixinElided, self).changeEvent(event)
+
+        if event.type() == QtCore.QEvent.FontChange:
+            self.__font_metrics = None
+            self.__elided_texts.clear()
+            self.__reset_elision()
+
+            if self._use_elision:
+                self.__set_elided_text()
+
 
 class MixinTextToolTip(object):
     """Updates tooltip for text/editor widgets with the real text value.
@@ -0,0 +1,312 @@
+"""Delegate painting a list of tags as chips, inside the cells of any view.
+
+TagManagers are widgets, so one per row of a table with thousands of assets
+isn't an option. TagChipDelegate paints the tags of a cell instead, wrapped
+over as many lines as the cell allows, without any widget or model of its
+own.
+
+Everything that's expensive to paint is cached:
+    - Chip pixmaps, by tag name, width, font, palette and theme, shared by
+      all the delegates. Painting a cell only blits pixmaps.
+    - Text widths, by font and tag name, shared by all the delegates.
+    - Cell layouts (where each chip goes), by tag list and cell width. Rows
+      with the same tags share their layout, and a row whose data changed
+      gets a new one, since its tags are part of the key.
+
+Usage:
+    >>> view = QtWidgets.QTableView()
+    >>> view.setModel(asset_model)  # Tags column: lists of tag names.
+    >>> view.setItemDelegateForColumn(TAGS_COLUMN, TagChipDelegate(view))
+
+"""
+# Import built-in modules.
+import collections
+import math
+
+# Import local modules.
+from pyqt_tag_manager import QtCore, QtGui, QtWidgets
+from pyqt_tag_manager.qt_market import color_utils
+
+
+# Constants.
+_PIXMAP_CACHE_SIZE = 4096
+_LAYOUT_CACHE_SIZE = 2048
+_TEXT_WIDTH_CACHE_SIZE = 65536
+
+
+class TagChipDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints the tags of a cell as wrapped chips.
+
+    The tags are read from the `role` of the index, either as a sequence of
+    names or as a single string of names separated by `separator`. Chips
+    that don't fit in the cell are clipped, and names wider than the cell
+    are elided.
+
+    sizeHint returns the height needed to show every tag at the current
+    column width, so views resizing their rows to contents (e.g.
+    QTableView.resizeRowsToContents) show them all.
+
+    Args:
+        parent (QtCore.QObject): Parent of the delegate, usually the view.
+        role (int): Data role holding the tags of the cells.
+        separator (str): Separator of the names, for string data.
+    """
+    # Chip pixmaps and text widths, shared by all the delegates.
+    _chip_pixmaps = collections.OrderedDict()  # Chip key: QPixmap.
+    _text_widths = {}  # (font key, tag name): width.
+
+    def __init__(self, parent=None, role=QtCore.Qt.DisplayRole, separator=','):
+        super(TagChipDelegate, self).__init__(parent)
+        self.role = role
+        self.separator = separator
+
+        self.__dark_mode_enabled = True
+        self.__palette = color_utils.get_palette()
+        self.__layouts = collections.OrderedDict()  # (tags, width): layout.
+
+        self._margin = 2
+        self._spacing = 4
+        self._width_padding = 12
+        self._radius = 4
+
+        font = QtGui.QFont(parent.font()) if isinstance(
+            parent, QtWidgets.QWidget) else QtGui.QFont()
+        self.set_font(font)
+
+    # Private.
+    def __tags(self, index):
+        """Returns the tags of a cell, as a tuple of names. """
+        value = index.data(self.role)
+
+        if not value:
+            return ()
+        elif isinstance(value, str):
+            return tuple(name.strip() for name in value.split(self.separator)
+                         if name.strip())
+
+        return tuple(value)
+
+    def __text_width(self, tag_name):
+        key = (self.__font_key, tag_name)
+        width = self._text_widths.get(key)
+
+        if width is None:
+            if len(self._text_widths) >= _TEXT_WIDTH_CACHE_SIZE:
+                self._text_widths.clear()
+
+            width = self._text_widths[key] = int(math.ceil(
+                self.__font_metrics.horizontalAdvance(tag_name)))
+
+        return width
+
+    def __layout(self, tags, width):
+        """Returns where the chips of a cell go, wrapping them to the width.
+
+        Args:
+            tags (tuple): Names of the tags.
+            width (int): Width available for the chips. Zero or less puts
+                every chip on the same line.
+
+        Returns:
+            tuple: The chips as (x, y, width, name) tuples, relative to the
+                top left corner of the content, and the content size.
+        """
+        key = (tags, width)
+        layout = self.__layouts.get(key)
+
+        if layout is not None:
+            self.__layouts.move_to_end(key)
+            return layout
+
+        chips = []
+        x = y = content_width = 0
+
+        for tag_name in tags:
+            chip_width = self.__text_width(tag_name) + self._width_padding
+            if width > 0:
+                chip_width = min(chip_width, width)
+
+                # Wrap, unless the chip is the first of its line.
+                if x and x + chip_width > width:
+                    x = 0
+                    y += self._chip_height + self._spacing
+
+            chips.append((x, y, chip_width, tag_name))
+            content_width = max(content_width, x + chip_width)
+            x += chip_width + self._spacing
+
+        height = y + self._chip_height if chips else 0
+        layout = (tuple(chips), QtCore.QSize(content_width, height))
+
+        if len(self.__layouts) >= _LAYOUT_CACHE_SIZE:
+            self.__layouts.popitem(last=False)
+        self.__layouts[key] = layout
+
+        return layout
+
+    def __chip_pixmap(self, tag_name, width, device_pixel_ratio):
+        """Returns the pixmap of a chip, rendering it on first use. """
+        key = (tag_name, width, self.__font_key, self.__palette,
+               self.__dark_mode_enabled, device_pixel_ratio)
+        pixmap = self._chip_pixmaps.get(key)
+
+        if pixmap is not None:
+            self._chip_pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = self.__render_chip(tag_name, width, device_pixel_ratio)
+
+        if len(self._chip_pixmaps) >= _PIXMAP_CACHE_SIZE:
+            self._chip_pixmaps.popitem(last=False)
+        self._chip_pixmaps[key] = pixmap
+
+        return pixmap
+
+    def __render_chip(self, tag_name, width, device_pixel_ratio):
+        """Paint a chip into a transparent pixmap, styled like the tags of
+        the TagManager. """
+        theme = color_utils.DARK_THEME if self.__dark_mode_enabled else \
+            color_utils.LIGHT_THEME
+        colors = self.__palette.get_colors(tag_name, theme)
+
+        fg_color = QtGui.QColor(QtCore.Qt.white)
+        fg_color.setAlpha(235)
+
+        # Dark mode: Make the label full alpha for readability, the border
+        # of the dark theme is transparent.
+        if self.__dark_mode_enabled:
+            fg_color.setAlpha(255)
+
+        pixmap = QtGui.QPixmap(int(math.ceil(width * device_pixel_ratio)),
+                               int(math.ceil(self._chip_height *
+                                             device_pixel_ratio)))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(QtCore.Qt.transparent)
+
+        rect = QtCore.QRectF(1, 1, width - 2, self._chip_height - 2)
+        text = self.__font_metrics.elidedText(
+            tag_name, QtCore.Qt.ElideRight, width - self._width_padding)
+
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(painter.Antialiasing)
+
+        painter.setBrush(QtGui.QBrush(colors.desaturated,
+                                      QtCore.Qt.SolidPattern))
+        painter.setPen(QtGui.QPen(colors.border, 2, QtCore.Qt.SolidLine))
+        painter.drawRoundedRect(rect, self._radius, self._radius,
+                                QtCore.Qt.AbsoluteSize)
+
+        painter.setFont(self.__font)
+        painter.setPen(fg_color)
+        painter.drawText(rect, int(QtCore.Qt.AlignCenter), text)
+        painter.end()
+
+        return pixmap
+
+    # Inherited.
+    def paint(self, painter, option, index):
+        """Override the inherited paint method.
+
+        Draws the item background (selection, hover) with the style, then
+        blits the cached chips over it.
+        """
+        option = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        option.text = ''
+
+        widget = option.widget
+        style = widget.style() if widget is not None else \
+            QtWidgets.QApplication.style()
+        style.drawPrimitive(QtWidgets.QStyle.PE_PanelItemViewItem, option,
+                            painter, widget)
+
+        tags = self.__tags(index)
+        if not tags:
+            return
+
+        rect = option.rect.adjusted(self._margin, self._margin,
+                                    -self._margin, -self._margin)
+        chips, _ = self.__layout(tags, rect.width())
+        device_pixel_ratio = painter.device().devicePixelRatioF()
+
+        painter.save()
+        painter.setClipRect(rect)
+
+        for x, y, width, tag_name in chips:
+            # Chips are laid out top to bottom, the rest are clipped.
+            if y >= rect.height():
+                break
+
+            painter.drawPixmap(rect.left() + x, rect.top() + y,
+                               self.__chip_pixmap(tag_name, width,
+                                                  device_pixel_ratio))
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        """Override the inherited sizeHint method.
+
+        The width is the one needed to show every chip on a single line, the
+        height the one needed to show them all at the width of the cell.
+        """
+        tags = self.__tags(index)
+        margins = 2 * self._margin
+
+        # Cells narrower than their margins still wrap, a width of zero
+        # would lay every chip out on a single line.
+        _, line_size = self.__layout(tags, 0)
+        _, size = self.__layout(tags, max(option.rect.width() - margins, 1))
+
+        return QtCore.QSize(line_size.width() + margins,
+                            max(size.height(), self._chip_height) + margins)
+
+    # Public.
+    def set_font(self, font):
+        """Sets the font of the chip labels.
+
+        Args:
+            font (QtGui.QFont): Font of the labels.
+        """
+        self.__font = QtGui.QFont(font)
+        self.__font_key = self.__font.key()
+        self.__font_metrics = QtGui.QFontMetricsF(self.__font)
+        self._chip_height = int(math.ceil(self.__font_metrics.height())) + 4
+
+        self.invalidate()
+
+    def get_font(self):
+        """Returns the font of the chip labels. """
+        return QtGui.QFont(self.__font)
+
+    def enable_dark_mode(self, enabled):
+        """Enables dark mode styling of the chips.
+
+        Args:
+            enabled (bool): Enables dark mode styling.
+        """
+        self.__dark_mode_enabled = enabled
+
+    def is_dark_mode_enabled(self):
+        """Checks if dark mode is enabled. """
+        return self.__dark_mode_enabled
+
+    def set_palette(self, palette):
+        """Sets the palette the chips are colored with.
+
+        Args:
+            palette (color_utils.Palette): Palette of the chips.
+        """
+        self.__palette = palette
+
+    def get_palette(self):
+        """Returns the palette the chips are colored with. """
+        return self.__palette
+
+    def invalidate(self):
+        """Discard the cached layouts of the cells.
+
+        Layouts are keyed by the tags of the cells, so this is only needed
+        after changing how chips are measured (e.g. a new font). Views
+        should be repainted afterwards.
+        """
+        self.__layouts.clear()
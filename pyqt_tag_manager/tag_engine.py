@@ -0,0 +1,837 @@
+"""Core of the tag lists, without any Qt: registry, ordering, matching and
+change tracking.
+
+A TagEngine holds the tags of a list (e.g. the rows of a TagManager) as ids
+of a TagVocabulary, along with:
+    - Membership and search match flags, as bytes indexed by member index:
+      the tags of the list are numbered as they're first added, so the
+      state of a list only grows with its own tags, even in a large
+      vocabulary shared with other lists.
+    - The sort keys of a collation, cached per tag (see tag_keys).
+    - The display order of the rows, kept by the engine in ordered mode.
+    - The match sets of recent search queries (see match_sets), optionally
+      matched by worker processes (see match_engine).
+    - The tags added and removed since the last commit.
+
+Qt models are thin adapters over an engine: they emit the signals around
+the changes it makes to the rows. Everything else runs headless, e.g. in
+command line tools, farm jobs or worker processes.
+
+This module doesn't depend on Qt.
+
+Usage:
+    >>> engine = TagEngine()
+    >>> engine.add_rows(engine.register(tags, substring_matcher(''))[1])
+    >>> engine.set_ordered(True)
+    >>> engine.sort()
+    >>> sorted_tags = list(engine.iter_tags())
+
+"""
+# Import built-in modules.
+import array
+import weakref
+
+# Import local modules.
+from pyqt_tag_manager import match_sets
+from pyqt_tag_manager import tag_keys
+from pyqt_tag_manager import tag_vocabulary
+
+
+# Constants.
+# Match changes up to which rows are looked up one tag at a time, see
+# TagEngine.changed_match_rows.
+_MAX_SPARSE_MATCH_CHANGES = 32
+
+# Tags added to the vocabulary after its keys were loaded in the match
+# engine, up to which they're matched separately. Past it, keys are loaded
+# again, see TagEngine.set_match_engine.
+_MAX_UNLOADED_MATCH_KEYS = 4096
+
+
+def substring_matcher(text):
+    """Returns the predicate matching the search keys of the tags containing
+    a text, regardless of case and compatibility characters (see
+    tag_keys.search_key).
+
+    Args:
+        text (str): Text to search for.
+
+    Returns:
+        callable: Returns True if the search key of a tag matches.
+    """
+    search_key = tag_keys.search_key(text)
+
+    def is_match(tag_search_key):
+        return search_key in tag_search_key
+
+    return is_match
+
+
+class TagEngine(object):
+    """Registry of the tags of a list, in row order.
+
+    Tags get a member index when they're first added to the list, which
+    they keep while they're removed and added again. Rows and flags refer
+    to the member indexes, and the tags are resolved through their ids in
+    the vocabulary when requested. Indexes follow the tag ids while the
+    list adds its tags in the order they were added to the vocabulary
+    (e.g. one that isn't shared), which doesn't take any lookup table.
+
+    Changes are tracked against a copy of the membership flags taken on
+    commit, so adding and removing a tag again cancels out.
+
+    Args:
+        vocabulary (tag_vocabulary.TagVocabulary): Vocabulary the tags are
+            stored in, e.g. one shared with other lists. A new one if
+            omitted.
+    """
+    def __init__(self, vocabulary=None):
+        self.__vocabulary = vocabulary if vocabulary is not None else \
+            tag_vocabulary.TagVocabulary()
+        self.__mapped = None  # Owned file, see load_vocabulary.
+        self.__rows = array.array('I')  # Member indexes, in row order.
+        self.__member_ids = array.array('I')  # Member index: tag id.
+        self.__member_indexes = {}  # Tag id: member index, see __index_of.
+        self.__identity_count = 0  # Leading indexes equal to their tag id.
+        self.__members = bytearray()  # 1 if the member has a row.
+        self.__matches = bytearray()  # 1 if the member matches the search.
+        self.__committed = bytearray()  # Members as of the last commit.
+        self.__match_cache = match_sets.MatchCache()  # See find_matches.
+        self.__match_engine = None  # See set_match_engine.
+        self.__match_engine_vocabulary = None  # Weak ref, keys loaded from.
+
+        # Sort keys of the collation, see set_collation.
+        self.__collation = tag_keys.PLAIN_COLLATION
+        self.__collation_key = None  # Computes the key of a tag name.
+        self.__collation_cache_key = None
+        self.__collation_keys = None  # Tag id: key, shared via vocabulary.
+
+        # Display order, see set_ordered.
+        self.__is_ordered = False
+        self.__is_sorted = True
+        self.__is_sorting_suspended = False
+
+    # Private.
+    def __close_mapped(self, keep=None):
+        """Unmap the file loaded by load_vocabulary, if any, once its
+        vocabulary is replaced.
+
+        Args:
+            keep (mapped_vocabulary.MappedVocabulary): File that replaces
+                it, kept open if it's the same.
+        """
+        if self.__mapped is not None and self.__mapped is not keep:
+            self.__mapped.close()
+        self.__mapped = None
+
+    def __update_collation_keys(self):
+        """Fetch the cached sort keys of the collation from the vocabulary,
+        after changing either of them.
+
+        Plain keys are stored in the vocabulary already. Other keys are
+        computed once per tag, when first compared, and cached in the
+        vocabulary so every list sharing it benefits.
+        """
+        if self.__collation_key is None:
+            self.__collation_keys = None
+        else:
+            self.__collation_keys = self.__vocabulary.cache(
+                self.__collation_cache_key)
+
+    def __index_of(self, tag_id):
+        """Returns the member index of a tag id, or None if the tag was
+        never added to the list. """
+        if tag_id is None or tag_id < self.__identity_count:
+            return tag_id
+
+        return self.__member_indexes.get(tag_id)
+
+    def __add_member(self, tag_id):
+        """Returns the member index of a tag id, assigning a new one if
+        needed. Its flags are cleared. """
+        index = len(self.__member_ids)
+        self.__member_ids.append(tag_id)
+        self.__members.append(0)
+        self.__matches.append(0)
+        self.__committed.append(0)
+
+        if index == tag_id == self.__identity_count:
+            self.__identity_count += 1
+        else:
+            self.__member_indexes[tag_id] = index
+
+        return index
+
+    def __reset_members(self, count=0):
+        """Forget every member, or make the first tag ids of the
+        vocabulary members (without any flag set). """
+        self.__member_ids = array.array('I', range(count))
+        self.__member_indexes = {}
+        self.__identity_count = count
+        self.__members = bytearray(count)
+        self.__matches = bytearray(count)
+        self.__committed = bytearray(count)
+
+    def __row_of_member(self, index, hint=-1):
+        """Returns the row of a member index, or -1 if it has no row. """
+        rows = self.__rows
+        if 0 <= hint < len(rows) and rows[hint] == index:
+            return hint
+
+        if not self.__members[index]:
+            return -1
+
+        # Sorted rows are binary searched, unless tags have equal keys.
+        if self.__is_ordered and self.__is_sorted:
+            row = self.__bisect(index) - 1
+            if row >= 0 and rows[row] == index:
+                return row
+
+        return rows.index(index)
+
+    def __find_engine_matches(self, is_match, search_key):
+        """Returns the match set of a search key from the match engine, over
+        the members of the list.
+
+        Keys are loaded in the engine when the vocabulary changed, and tags
+        added since are matched with is_match, until there are too many.
+        """
+        engine = self.__match_engine
+        vocabulary = self.__vocabulary
+        loaded = self.__match_engine_vocabulary
+
+        if loaded is None or loaded() is not vocabulary or \
+                len(vocabulary) - len(engine) > _MAX_UNLOADED_MATCH_KEYS:
+            engine.load(vocabulary.search_key(tag_id)
+                        for tag_id in range(len(vocabulary)))
+            self.__match_engine_vocabulary = weakref.ref(vocabulary)
+
+        # The engine matches the whole vocabulary, its flags are picked by
+        # member.
+        engine_flags = match_sets.to_flags(engine.find_matches(search_key),
+                                           len(vocabulary))
+        matches = bytearray(map(engine_flags.__getitem__, self.__member_ids))
+
+        loaded_count = len(engine)
+        for index in self.__rows:
+            tag_id = self.__member_ids[index]
+            if tag_id >= loaded_count:
+                matches[index] = is_match(vocabulary.search_key(tag_id))
+
+        return match_sets.from_flags(matches) & \
+            match_sets.from_flags(self.__members)
+
+    def __order_key(self, index):
+        """Returns the display order key of a member in ordered mode:
+        matches first, then by sort key. """
+        return not self.__matches[index], \
+            self.sort_key_of(self.__member_ids[index])
+
+    def __bisect(self, index):
+        """Returns the row a member goes to in the sorted rows, after the
+        rows of equal keys. """
+        order_key = self.__order_key
+        key = order_key(index)
+        rows = self.__rows
+        low, high = 0, len(rows)
+
+        while low < high:
+            middle = (low + high) // 2
+            if key < order_key(rows[middle]):
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
+
+    def __is_sorted_insertion(self, indexes):
+        """Checks if registered tags go straight to their sorted row: a
+        single tag, in ordered mode. """
+        return self.__is_ordered and len(indexes) == 1 and \
+            self.__is_sorted and not self.__is_sorting_suspended
+
+    def __invalidate_order(self):
+        """Flag the rows as unsorted after their keys changed, in ordered
+        mode. See needs_sorting. """
+        if self.__is_ordered:
+            self.__is_sorted = False
+
+    # Inherited.
+    def __len__(self):
+        return len(self.__rows)
+
+    # Public.
+    def vocabulary(self):
+        """Returns the vocabulary the tags are stored in. """
+        return self.__vocabulary
+
+    def rows(self):
+        """Returns the tag ids of the rows, in row order.
+
+        Returns:
+            array.array: Copy of the tag ids.
+        """
+        return array.array('I', map(self.__member_ids.__getitem__,
+                                    self.__rows))
+
+    def tag_id(self, row):
+        """Returns the vocabulary id of the tag at the row. """
+        return self.__member_ids[self.__rows[row]]
+
+    def name(self, row):
+        """Returns the name of the tag at the row. """
+        return self.__vocabulary.name(self.__member_ids[self.__rows[row]])
+
+    def row_of(self, tag_id, hint=-1):
+        """Returns the row of the tag id, or -1 if it isn't in the list.
+
+        Args:
+            tag_id (int): Id of the tag.
+            hint (int): Row the tag is expected at, e.g. where it was
+                inserted. It's checked first, the rows are searched
+                otherwise.
+        """
+        index = self.__index_of(tag_id)
+        if index is None:
+            return -1
+
+        return self.__row_of_member(index, hint)
+
+    def is_match(self, row):
+        """Checks if the tag at the row matches the search query. """
+        return self.__matches[self.__rows[row]]
+
+    def has_tag(self, tag_name):
+        """Checks if a tag exists in the list.
+
+        Args:
+            tag_name (str): Exact name of the tag.
+
+        Returns:
+            bool: True if tag name exists, otherwise False.
+        """
+        index = self.__index_of(self.__vocabulary.find(tag_name))
+        return index is not None and bool(self.__members[index])
+
+    def iter_tags(self):
+        """Iterate over the tag names, in row order.
+
+        Yields:
+            str: Name of each tag.
+        """
+        name = self.__vocabulary.name
+        member_ids = self.__member_ids
+        for index in self.__rows:
+            yield name(member_ids[index])
+
+    def register(self, tags, is_match, commit=False):
+        """Flag uniquely named tags as members of the list, registering them
+        in the vocabulary if needed. Rows are added by add_rows.
+
+        Args:
+            tags (iterable): Names of the tags. Names that already exist in
+                the list are skipped.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query.
+            commit (bool): Commit the tags, so they aren't reported as
+                changes.
+
+        Returns:
+            tuple: List of the names of the new tags, and array of their
+                member indexes.
+        """
+        added = []
+        indexes = array.array('I')
+        vocabulary = self.__vocabulary
+
+        for tag_name in tags:
+            tag_id = vocabulary.find(tag_name)
+            index = self.__index_of(tag_id)
+
+            if tag_id is None:
+                tag_id = vocabulary.add(tag_name)
+                index = self.__add_member(tag_id)
+            elif index is None:
+                index = self.__add_member(tag_id)
+            elif self.__members[index]:
+                continue
+
+            self.__members[index] = 1
+            self.__matches[index] = is_match(vocabulary.search_key(tag_id))
+            if commit:
+                self.__committed[index] = 1
+
+            added.append(tag_name)
+            indexes.append(index)
+
+        # Cached match sets don't hold the new tags.
+        if indexes:
+            self.__match_cache.clear()
+
+        return added, indexes
+
+    def insertion_row(self, indexes):
+        """Returns the row registered tags are inserted at by add_rows.
+
+        In ordered mode, a single tag goes straight to its sorted row (a
+        binary search). Other tags are appended.
+        """
+        if self.__is_sorted_insertion(indexes):
+            return self.__bisect(indexes[0])
+
+        return len(self.__rows)
+
+    def add_rows(self, indexes):
+        """Insert the rows of registered tags, at their insertion_row.
+
+        Args:
+            indexes (array.array): Member indexes of the tags, see register.
+
+        Returns:
+            int: First row of the tags.
+        """
+        if self.__is_sorted_insertion(indexes):
+            row = self.__bisect(indexes[0])
+            self.__rows.insert(row, indexes[0])
+            return row
+
+        row = len(self.__rows)
+        self.__rows.extend(indexes)
+        if indexes:
+            self.__invalidate_order()
+
+        return row
+
+    def removal_ranges(self, keep):
+        """Returns the contiguous ranges of rows of the tags that aren't
+        flagged in keep.
+
+        Args:
+            keep (bytearray): Flags of the tags to keep, see keep_flags.
+
+        Returns:
+            list: (start, end) rows of each range, in row order.
+        """
+        ranges = []
+        start = None
+
+        for row, index in enumerate(self.__rows):
+            if keep[index]:
+                if start is not None:
+                    ranges.append((start, row))
+                    start = None
+            elif start is None:
+                start = row
+
+        if start is not None:
+            ranges.append((start, len(self.__rows)))
+
+        return ranges
+
+    def remove_rows(self, start, end):
+        """Remove a range of rows.
+
+        Args:
+            start (int): First row.
+            end (int): Row after the last one.
+
+        Returns:
+            array.array: Ids of the removed tags.
+        """
+        indexes = self.__rows[start:end]
+        del self.__rows[start:end]
+
+        for index in indexes:
+            self.__members[index] = 0
+
+        return array.array('I', map(self.__member_ids.__getitem__, indexes))
+
+    def keep_flags(self, removed_tags=(), is_removed=None):
+        """Returns the flags of the tags to keep, by member index, when
+        removing tags by name or by search query (see removal_ranges).
+
+        Args:
+            removed_tags (iterable): Exact names of the tags to remove.
+            is_removed (callable): Returns True if the search key of a tag
+                matches the query of the tags to remove.
+
+        Returns:
+            bytearray: 1 for the tags to keep, or None if no tag is removed.
+        """
+        keep = bytearray(self.__members)
+        find = self.__vocabulary.find
+        removed = False
+
+        for tag_name in removed_tags:
+            index = self.__index_of(find(tag_name))
+
+            if index is not None and keep[index]:
+                keep[index] = 0
+                removed = True
+
+        if is_removed is not None:
+            search_key = self.__vocabulary.search_key
+            member_ids = self.__member_ids
+            for index in self.__rows:
+                if is_removed(search_key(member_ids[index])):
+                    keep[index] = 0
+                    removed = True
+
+        return keep if removed else None
+
+    def diff(self, tags):
+        """Compare the list with the tags it should hold.
+
+        Args:
+            tags (iterable): Names of all the tags the list should hold.
+
+        Returns:
+            tuple: Flags of the tags to keep (see removal_ranges), and the
+                names of the tags that aren't in the list yet.
+        """
+        keep = bytearray(len(self.__members))
+        new_tags = []
+        find = self.__vocabulary.find
+
+        for tag_name in tags:
+            index = self.__index_of(find(tag_name))
+
+            if index is not None and self.__members[index]:
+                keep[index] = 1
+            else:
+                new_tags.append(tag_name)
+
+        return keep, new_tags
+
+    def set_vocabulary(self, vocabulary, is_match):
+        """Store the tags in another vocabulary, e.g. one shared with other
+        lists. The tags are kept, in the same order, along with their
+        pending changes.
+
+        Args:
+            vocabulary (tag_vocabulary.TagVocabulary): Vocabulary to use.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query.
+        """
+        tags = list(self.iter_tags())
+        added, removed = self.get_changes()
+
+        # Names were decoded above, so the file isn't needed anymore.
+        if vocabulary is not self.__vocabulary:
+            self.__close_mapped()
+
+        self.__vocabulary = vocabulary
+        self.clear()
+        self.__update_collation_keys()
+        self.add_rows(self.register(tags, is_match)[1])
+
+        # Carry the pending changes over to the members of the new
+        # vocabulary.
+        self.commit()
+        for tag_name in added:
+            self.__committed[self.__index_of(vocabulary.find(tag_name))] = 0
+        for tag_name in removed:
+            tag_id = vocabulary.find(tag_name)
+            if tag_id is None:
+                tag_id = vocabulary.add(tag_name)
+            self.__committed[self.__add_member(tag_id)] = 1
+
+    def load_vocabulary(self, mapped, is_match=None):
+        """Replace the tags with a memory-mapped vocabulary, in its own
+        TagVocabulary.
+
+        Rows are created in the stored display order, without decoding the
+        tag names.
+
+        The engine owns the file from then on: it's closed when another
+        vocabulary replaces it, or by close.
+
+        Args:
+            mapped (mapped_vocabulary.MappedVocabulary): Vocabulary to load.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query. If omitted, every tag
+                matches.
+        """
+        self.__close_mapped(keep=mapped)
+        self.__mapped = mapped
+
+        self.__vocabulary = tag_vocabulary.TagVocabulary(mapped)
+        self.__update_collation_keys()
+        self.__reset_members(len(mapped))
+        self.__rows = array.array('I', mapped.order)
+        self.__members = bytearray(b'\x01') * len(mapped)
+        self.__committed = bytearray(self.__members)
+        self.__match_cache.clear()
+
+        if is_match is None:
+            self.__matches = bytearray(b'\x01') * len(mapped)
+        else:
+            search_key = self.__vocabulary.search_key
+            self.__matches = bytearray(
+                is_match(search_key(tag_id)) for tag_id in range(len(mapped)))
+
+        # The stored order is the display order of the plain collation,
+        # when every tag matches.
+        self.__is_sorted = is_match is None and \
+            self.__collation == tag_keys.PLAIN_COLLATION
+
+    def close(self):
+        """Unmap the file loaded by load_vocabulary, if any. Its tags are
+        removed, along with its vocabulary.
+        """
+        if self.__mapped is None:
+            return
+
+        self.__vocabulary = tag_vocabulary.TagVocabulary()
+        self.__update_collation_keys()
+        self.clear()
+        self.__close_mapped()
+
+    def clear(self):
+        """Remove all tags. The vocabulary is kept, since it might be shared.
+        """
+        self.__rows = array.array('I')
+        self.__reset_members()
+        self.__match_cache.clear()
+        self.__is_sorted = True
+
+    def collation(self):
+        """Returns the collation the tags are sorted by. """
+        return self.__collation
+
+    def set_collation(self, collation, sort_key=None, locale_name=None):
+        """Set the collation of the sort keys, see sort_key_of.
+
+        Args:
+            collation (str): One of tag_keys.COLLATIONS.
+            sort_key (callable): Computes the sort key of a tag name, for
+                LOCALE_COLLATION (e.g. QCollator.sortKey), which can't be
+                computed without Qt.
+            locale_name (str): Name of the locale of sort_key. Keys are
+                cached per locale.
+        """
+        if collation not in tag_keys.COLLATIONS:
+            raise ValueError('Unsupported collation {col!r}, expected one of '
+                             '{cols!r}'.format(col=collation,
+                                               cols=tag_keys.COLLATIONS))
+
+        if collation == tag_keys.PLAIN_COLLATION:
+            sort_key = cache_key = None
+        elif collation == tag_keys.NATURAL_COLLATION:
+            sort_key = tag_keys.natural_key
+            cache_key = ('collation_key', collation)
+        elif sort_key is None:
+            raise ValueError('Collation {col!r} needs a sort key '
+                             'function'.format(col=collation))
+        else:
+            cache_key = ('collation_key', collation, locale_name)
+
+        self.__collation = collation
+        self.__collation_key = sort_key
+        self.__collation_cache_key = cache_key
+        self.__update_collation_keys()
+        self.__invalidate_order()
+
+    def sort_key_of(self, tag_id):
+        """Returns the sort key of a tag, for the current collation. """
+        if self.__collation_keys is None:
+            return self.__vocabulary.sort_key(tag_id)
+
+        key = self.__collation_keys.get(tag_id)
+        if key is None:
+            key = self.__collation_keys[tag_id] = self.__collation_key(
+                self.__vocabulary.name(tag_id))
+
+        return key
+
+    def sort_key(self, row):
+        """Returns the sort key of the tag at the row, for the current
+        collation (see set_collation). """
+        return self.sort_key_of(self.__member_ids[self.__rows[row]])
+
+    def is_ordered(self):
+        """Checks if the rows are kept in display order. """
+        return self.__is_ordered
+
+    def set_ordered(self, ordered):
+        """Keep the rows in display order: matches first, then by sort key.
+
+        Rows keep their current order until sorted, see resume_sorting.
+
+        Args:
+            ordered (bool): Keep the rows in display order.
+        """
+        self.__is_ordered = ordered
+        self.__is_sorted = not self.__rows
+        self.__is_sorting_suspended = ordered
+
+    def is_sorted(self):
+        """Checks if the rows are in display order, in ordered mode. """
+        return self.__is_sorted
+
+    def suspend_sorting(self):
+        """Stop sorting rows as they're inserted or changed in ordered mode,
+        until resume_sorting is called. Rows changed in bulk are then sorted
+        once, rather than one at a time.
+        """
+        self.__is_sorting_suspended = True
+
+    def resume_sorting(self):
+        """Sort rows as they're inserted or changed again, in ordered mode.
+        """
+        self.__is_sorting_suspended = False
+
+    def needs_sorting(self):
+        """Checks if the rows should be sorted (see sort) after a change:
+        in ordered mode, unless sorted or sorting is suspended. """
+        return self.__is_ordered and not self.__is_sorted and \
+            not self.__is_sorting_suspended
+
+    def sort(self):
+        """Sort the rows in display order. """
+        self.__rows = array.array('I', sorted(self.__rows,
+                                              key=self.__order_key))
+        self.__is_sorted = True
+
+    def matches(self):
+        """Returns the match set of the tags of the list (see match_sets).
+        """
+        return match_sets.from_flags(self.__matches) & \
+            match_sets.from_flags(self.__members)
+
+    def find_matches(self, is_match, query=None):
+        """Returns the match set of a search query, over the tags of the
+        list. Match flags aren't changed, see set_match_flags.
+
+        Args:
+            is_match (callable): Returns True if the search key of a tag
+                matches the query.
+            query (hashable): Identifies the query (e.g. its search key), to
+                cache its match set until tags are added. Not cached if None.
+                With a match engine (see set_match_engine), the query must
+                be the search key of a substring query: it's matched by the
+                engine rather than is_match.
+
+        Returns:
+            int: The match set.
+        """
+        match_set = self.__match_cache.get(query) if query is not None \
+            else None
+
+        if match_set is None and self.__match_engine is not None and \
+                query is not None:
+            match_set = self.__match_cache.put(
+                query, self.__find_engine_matches(is_match, query))
+
+        elif match_set is None:
+            search_key = self.__vocabulary.search_key
+            member_ids = self.__member_ids
+            matches = bytearray(len(self.__members))
+            for index in self.__rows:
+                if is_match(search_key(member_ids[index])):
+                    matches[index] = 1
+
+            match_set = match_sets.from_flags(matches)
+            if query is not None:
+                self.__match_cache.put(query, match_set)
+
+        return match_set
+
+    def match_engine(self):
+        """Returns the engine matching the search queries, if any. """
+        return self.__match_engine
+
+    def set_match_engine(self, engine):
+        """Match the search queries with an engine, e.g. with worker
+        processes for large vocabularies (see match_engine.MatchEngine).
+
+        The search keys of the vocabulary are loaded in the engine on the
+        next query, and loaded again when the vocabulary changes. The engine
+        isn't closed by the list.
+
+        Args:
+            engine (match_engine.MatchEngine): Engine to use, or None to
+                match the queries one tag at a time.
+        """
+        self.__match_engine = engine
+        self.__match_engine_vocabulary = None
+        self.__match_cache.clear()
+
+    def count_match_changes(self, match_set):
+        """Returns the number of tags whose match flag would change, if the
+        match set was set (see changed_match_rows). """
+        return match_sets.popcount(self.matches() ^ (
+            match_set & match_sets.from_flags(self.__members)))
+
+    def changed_match_rows(self, match_set):
+        """Returns the rows whose match flag changes with a match set.
+
+        Rows are looked up before any flag is changed, since the order of
+        the rows depends on them in ordered mode.
+
+        Args:
+            match_set (int): The match set, see find_matches.
+
+        Returns:
+            tuple: Sorted list of the changed rows, and the match flags of
+                the match set (see set_match_flags).
+        """
+        size = len(self.__members)
+        match_set &= match_sets.from_flags(self.__members)
+        changed = self.matches() ^ match_set
+
+        if not changed:
+            return [], None
+
+        if match_sets.popcount(changed) <= _MAX_SPARSE_MATCH_CHANGES:
+            rows = sorted(self.__row_of_member(index)
+                          for index in match_sets.iter_ids(changed))
+        else:
+            changed_flags = match_sets.to_flags(changed, size)
+            rows = [row for row, index in enumerate(self.__rows)
+                    if changed_flags[index]]
+
+        return rows, match_sets.to_flags(match_set, size)
+
+    def set_match_flags(self, matches, start=None, end=None):
+        """Set the match flags of the tags, from changed_match_rows.
+
+        Args:
+            matches (bytearray): Match flags, by member index.
+            start (int): First row to update. Every tag if omitted.
+            end (int): Row after the last one to update.
+        """
+        if start is None:
+            self.__matches = matches
+            self.__invalidate_order()
+            return
+
+        for index in self.__rows[start:end]:
+            self.__matches[index] = matches[index]
+
+    def get_changes(self):
+        """Returns the tags added and removed since the last commit.
+
+        Returns:
+            tuple: Sets of the tag names added and removed.
+        """
+        added = set()
+        removed = set()
+
+        if self.__members != self.__committed:
+            name = self.__vocabulary.name
+            for tag_id, member, committed in zip(
+                    self.__member_ids, self.__members, self.__committed):
+                if member != committed:
+                    (added if member else removed).add(name(tag_id))
+
+        return added, removed
+
+    def has_changes(self):
+        """Checks if tags were added or removed since the last commit. """
+        return self.__members != self.__committed
+
+    def commit(self):
+        """Mark the current tags as the checkpoint changes are tracked from.
+        """
+        self.__committed = bytearray(self.__members)
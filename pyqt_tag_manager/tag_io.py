@@ -0,0 +1,265 @@
+"""Streaming readers and writers for tag vocabulary files.
+
+Tags are read and written one at a time, so vocabulary files of any size can
+be processed with bounded memory.
+
+Supported formats:
+    newline: One tag per line (.txt, .tags). Names can't contain line
+        breaks.
+    csv: One tag per row, in the first column by default (.csv).
+    jsonl: JSON Lines (.jsonl, .ndjson). Each line is either a JSON string
+        or an object holding the tag in its "name" field.
+
+Usage:
+    >>> for chunk in iter_chunks(read_tags('vocabulary.csv'), 10000):
+    >>>     tag_manager.add_tags(chunk)
+    >>>
+    >>> write_tags('vocabulary.jsonl', tag_manager.iter_tags())
+
+"""
+# Import built-in modules.
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+
+
+# Constants.
+NEWLINE_FORMAT = 'newline'
+CSV_FORMAT = 'csv'
+JSONL_FORMAT = 'jsonl'
+
+FORMATS = (NEWLINE_FORMAT, CSV_FORMAT, JSONL_FORMAT)
+EXTENSION_FORMATS = {
+    '.txt': NEWLINE_FORMAT,
+    '.tags': NEWLINE_FORMAT,
+    '.csv': CSV_FORMAT,
+    '.jsonl': JSONL_FORMAT,
+    '.ndjson': JSONL_FORMAT,
+}
+
+JSONL_NAME_FIELD = 'name'
+
+
+# Private.
+@contextlib.contextmanager
+def _open_text(path_or_file, mode, encoding):
+    """Open a path as text, or pass through an already open file object.
+
+    File objects aren't closed on exit, since they're owned by the caller.
+    """
+    if hasattr(path_or_file, 'read') or hasattr(path_or_file, 'write'):
+        yield path_or_file
+        return
+
+    # newline='' leaves line endings to the csv module, which needs it, and
+    # is harmless for the line based formats.
+    with io.open(path_or_file, mode, encoding=encoding, newline='') as f:
+        yield f
+
+
+def _check_format(path, fmt):
+    """Returns the format of a vocabulary file, guessed from its path if
+    omitted. """
+    fmt = fmt or guess_format(path)
+    if fmt not in FORMATS:
+        raise ValueError('Unsupported vocabulary format {fmt!r}, expected '
+                         'one of {fmts!r}'.format(fmt=fmt, fmts=FORMATS))
+
+    return fmt
+
+
+def _read_newline(f):
+    for line in f:
+        yield line.rstrip('\r\n')
+
+
+def _read_csv(f, column):
+    reader = csv.reader(f)
+
+    # Columns referenced by name require a header row.
+    if not isinstance(column, int):
+        header = next(reader, None)
+        if header is None:
+            return
+
+        try:
+            column = header.index(column)
+        except ValueError:
+            raise ValueError('Column {col!r} not found in CSV header '
+                             '{header!r}'.format(col=column, header=header))
+
+    for row in reader:
+        if len(row) > column:
+            yield row[column]
+
+
+def _read_jsonl(f, field):
+    for line_number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        value = json.loads(line)
+        if isinstance(value, dict):
+            value = value.get(field)
+
+        if not isinstance(value, str):
+            raise ValueError('Line {num}: expected a string or an object with '
+                             'a {field!r} string, got {line!r}'.format(
+                                 num=line_number, field=field, line=line))
+
+        yield value
+
+
+def _iter_tags(path, fmt, encoding, column, field):
+    """Stream the tag names of a vocabulary file, see read_tags. """
+    with _open_text(path, 'r', encoding) as f:
+        if fmt == NEWLINE_FORMAT:
+            names = _read_newline(f)
+        elif fmt == CSV_FORMAT:
+            names = _read_csv(f, column)
+        else:
+            names = _read_jsonl(f, field)
+
+        for name in names:
+            if name:
+                yield name
+
+
+# Public.
+def guess_format(path):
+    """Guess the vocabulary file format from the file extension.
+
+    Args:
+        path (str): Path of the vocabulary file.
+
+    Raises:
+        ValueError: If the extension isn't one of EXTENSION_FORMATS, or
+            path isn't a path (e.g. an open file).
+
+    Returns:
+        str: One of FORMATS.
+    """
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        raise ValueError('Unable to guess the vocabulary format of {path!r}, '
+                         'the format is required for open files'.format(
+                             path=path))
+
+    extension = os.path.splitext(os.fsdecode(path))[1].lower()
+
+    try:
+        return EXTENSION_FORMATS[extension]
+    except KeyError:
+        raise ValueError('Unable to guess the vocabulary format of {path!r}, '
+                         'expected one of: {exts}'.format(
+                             path=path,
+                             exts=', '.join(sorted(EXTENSION_FORMATS))))
+
+
+def read_tags(path, fmt=None, encoding='utf-8', column=0,
+              field=JSONL_NAME_FIELD):
+    """Stream the tag names stored in a vocabulary file.
+
+    Names are read as they were written, whitespace included, and empty
+    names are skipped. Duplicates are yielded as they appear,
+    de-duplication is left to the consumer (e.g. TagManager.add_tags).
+
+    Args:
+        path (Union[str, file]): Path or open text file to read from.
+        fmt (str): One of FORMATS. Guessed from the extension of a path if
+            omitted, required for open files.
+        encoding (str): Text encoding of the file.
+        column (Union[int, str]): CSV column holding the tag names. Columns
+            referenced by name require a header row.
+        field (str): JSON Lines object field holding the tag names.
+
+    Raises:
+        ValueError: If the format is unsupported, or can't be guessed. The
+            format is checked when called, the file when iterated.
+
+    Returns:
+        iterator: Tag names, in file order.
+    """
+    return _iter_tags(path, _check_format(path, fmt), encoding, column,
+                      field)
+
+
+def write_tags(path, tags, fmt=None, encoding='utf-8',
+               field=JSONL_NAME_FIELD):
+    """Stream tag names to a vocabulary file.
+
+    Args:
+        path (Union[str, file]): Path or open text file to write to.
+        tags (iterable): Tag names to write. Consumed lazily.
+        fmt (str): One of FORMATS. Guessed from the extension of a path if
+            omitted, required for open files.
+        encoding (str): Text encoding of the file.
+        field (str): JSON Lines object field holding the tag names.
+
+    Raises:
+        ValueError: If the format is unsupported, or can't be guessed, or
+            a name contains a line break in the newline format. Names are
+            written as they're consumed, so the tags before it are written.
+
+    Returns:
+        int: Number of tags written.
+    """
+    fmt = _check_format(path, fmt)
+
+    count = 0
+    with _open_text(path, 'w', encoding) as f:
+        if fmt == CSV_FORMAT:
+            writer = csv.writer(f, lineterminator='\n')
+            # Only the characters of the line terminator are quoted, and
+            # unquoted carriage returns are read back as line breaks.
+            quoted_writer = csv.writer(f, lineterminator='\n',
+                                       quoting=csv.QUOTE_ALL)
+            for name in tags:
+                if '\r' in name:
+                    quoted_writer.writerow((name,))
+                else:
+                    writer.writerow((name,))
+                count += 1
+
+        elif fmt == JSONL_FORMAT:
+            for name in tags:
+                f.write(json.dumps({field: name}, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+
+        else:
+            for name in tags:
+                # Lines would be read back as separate tags.
+                if '\n' in name or '\r' in name:
+                    raise ValueError('Unsupported tag name {name!r}, the '
+                                     '{fmt!r} format can\'t hold line '
+                                     'breaks'.format(name=name, fmt=fmt))
+
+                f.write(name)
+                f.write('\n')
+                count += 1
+
+    return count
+
+
+def iter_chunks(tags, size):
+    """Group tag names into lists of, at most, the given size.
+
+    Args:
+        tags (iterable): Tag names to group. Consumed lazily.
+        size (int): Maximum number of tag names per chunk.
+
+    Yields:
+        list: Chunk of tag names.
+    """
+    tags = iter(tags)
+
+    while True:
+        chunk = list(itertools.islice(tags, size))
+        if not chunk:
+            return
+
+        yield chunk
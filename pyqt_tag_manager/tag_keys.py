@@ -0,0 +1,93 @@
+"""Keys derived from tag names, used for sorting and searching.
+
+This module doesn't depend on Qt, so the same keys can be computed by
+headless tools (e.g. when writing vocabulary files) and by the widgets.
+
+Keys are computed once per tag, when the tag is registered in a vocabulary
+(see tag_vocabulary), and read from there by the sorting and searching
+code.
+"""
+# Import built-in modules.
+import re
+import unicodedata
+
+# Constants.
+# Collations, the orders tags can be displayed in.
+PLAIN_COLLATION = 'plain'  # Case-insensitive, see sort_key.
+NATURAL_COLLATION = 'natural'  # Numbers by value, see natural_key.
+LOCALE_COLLATION = 'locale'  # Locale rules, QCollator (needs Qt).
+COLLATIONS = (PLAIN_COLLATION, NATURAL_COLLATION, LOCALE_COLLATION)
+
+_DIGITS_REGEX = re.compile(r'(\d+)')
+
+
+def sort_key(name):
+    """Returns the key used to sort tags in ascending order.
+
+    Ascii comparisons will prioritize uppercase over lowercase, so tags are
+    compared case-insensitively instead.
+    E.g. ['cat', 'Cave', 'con', 'Zoo'] rather than ['Cave', 'Zoo', 'cat', 'con']
+
+    Args:
+        name (str): Name of the tag.
+
+    Returns:
+        str: Case-insensitive sort key.
+    """
+    return name.casefold()
+
+
+def natural_key(name):
+    """Returns the key used to sort tags in natural order, where numbers
+    are compared by value rather than digit by digit.
+    E.g. ['shot_2', 'shot_10'] rather than ['shot_10', 'shot_2']
+
+    Text is compared case-insensitively, like sort_key.
+
+    Args:
+        name (str): Name of the tag.
+
+    Returns:
+        tuple: Text and number parts, alternating. Numbers are always at odd
+            indices, so keys are comparable with each other.
+    """
+    parts = _DIGITS_REGEX.split(sort_key(name))
+    parts[1::2] = [int(part) for part in parts[1::2]]
+
+    return tuple(parts)
+
+
+def search_key(name):
+    """Returns the key used to search tags, a case-insensitive and
+    compatibility-normalized (NFKC) form of the name.
+
+    Compatibility characters are searched as their plain equivalent, e.g.
+    the ligature 'ﬁ' or the full-width 'ｆｉ' are found when searching 'fi'.
+
+    Args:
+        name (str): Name of the tag.
+
+    Returns:
+        str: Search key.
+    """
+    return normalize_sort_key(sort_key(name))
+
+
+def normalize_sort_key(key):
+    """Returns the search key of a tag from its sort key, see search_key.
+
+    Most keys are already normalized, in which case the sort key itself is
+    returned, so both keys share one string.
+
+    Args:
+        key (str): Sort key of the tag.
+
+    Returns:
+        str: Search key.
+    """
+    normalized = unicodedata.normalize('NFKC', key)
+    if normalized == key:
+        return key
+
+    return normalized.casefold()
+
@@ -0,0 +1,465 @@
+"""Tag store I/O off the GUI thread.
+
+Tag stores may live on slow network shares, so calling them from Qt slots
+can freeze the UI for seconds. TagLoader runs the store calls on a worker
+thread and hands the results back to the TagManagers on the GUI thread.
+
+Tags are fetched one page at a time and sent back in batches (one queued
+signal per page, rather than per tag), then applied to the TagManager at
+once with sync_tags, so only the differences reach the viewer.
+
+Repeated requests are coalesced: refreshing a TagManager that's already
+being refreshed doesn't queue another fetch, and publishing changes while a
+previous publish is still waiting only publishes once.
+
+TagManagers paging from a tag store (see TagManager.set_tag_store) go
+through a loader as well: pages and search queries are fetched by the
+worker, and handed to the model when they arrive. Only the last of the
+queries typed while one is waiting is run.
+
+Usage:
+    >>> loader = TagLoader(SQLiteTagStore('tags.db'))
+    >>> loader.loaded.connect(on_loaded)
+    >>>
+    >>> loader.refresh(preview_tag_manager)  # Returns immediately.
+    >>> loader.publish(editor_tag_manager)
+
+"""
+# Import built-in modules.
+import atexit
+import functools
+import itertools
+import threading
+
+# Import local modules.
+from pyqt_tag_manager import QtCore
+
+
+# Constants.
+REFRESH_REQUEST = 'refresh'
+PUBLISH_REQUEST = 'publish'
+FETCH_REQUEST = 'fetch'  # A page of the store, see TagLoader.fetch.
+QUERY_REQUEST = 'query'  # Tags matching a query, see TagLoader.query.
+
+# Worker threads of the loaders, and their requests, until they're stopped.
+_threads = {}
+
+
+# Private.
+def _stop_thread(thread, requests, *args):
+    """Cancel the requests and stop the worker thread of a loader, once the
+    request being run (if any) is completed.
+
+    Only holds the thread and the requests, rather than the loader, since
+    it's called while the loader is destroyed.
+    """
+    _threads.pop(thread, None)
+
+    for request in requests:
+        request.cancelled = True
+
+    if thread.isRunning():
+        thread.quit()
+        thread.wait()
+
+
+@atexit.register
+def _stop_threads():
+    """Stop the worker threads of the loaders still alive at exit, before
+    the interpreter tears them down: Qt signals (e.g. destroyed) aren't
+    handled in Python by then. """
+    for thread, requests in list(_threads.items()):
+        try:
+            _stop_thread(thread, requests)
+        except RuntimeError:
+            pass  # Already deleted, along with its loader.
+
+
+class _TagRequest(object):
+    """A store call submitted to the worker thread.
+
+    The payload of a request can be replaced until the worker starts it,
+    see TagLoader.publish.
+    """
+    def __init__(self, kind, tag_manager, payload=None, callback=None):
+        self.kind = kind
+        self.tag_manager = tag_manager
+        self.callback = callback  # Called with the result, if any.
+        self.tags = []  # Fetched tags, see TagLoader._on_page_fetched.
+        self.cancelled = False
+        self.coalescable = True
+
+        self.__payload = payload
+        self.__started = False
+        self.__lock = threading.Lock()
+
+    # Public.
+    @property
+    def payload(self):
+        with self.__lock:
+            return self.__payload
+
+    def start(self):
+        """Mark the request as started, from the worker thread.
+
+        Returns:
+            object: The final payload of the request.
+        """
+        with self.__lock:
+            self.__started = True
+            return self.__payload
+
+    def update(self, payload):
+        """Replace the payload of a request that hasn't started yet.
+
+        Returns:
+            bool: True if the payload was replaced, otherwise False.
+        """
+        with self.__lock:
+            if self.__started:
+                return False
+
+            self.__payload = payload
+            return True
+
+
+class _TagWorker(QtCore.QObject):
+    """Runs the requests on the worker thread, one at a time, in order. """
+    # Signals.
+    page_fetched = QtCore.Signal(object, object)  # Request, list of tags.
+    finished = QtCore.Signal(object, object)  # Request, result.
+    failed = QtCore.Signal(object, str)  # Request, error message.
+
+    def __init__(self, store, page_size):
+        super(_TagWorker, self).__init__()
+        self.__store = store
+        self.__page_size = page_size
+
+    # Private.
+    def __refresh(self, request):
+        count = 0
+
+        for offset in itertools.count(0, self.__page_size):
+            if request.cancelled:
+                break
+
+            page = self.__store.fetch(offset, self.__page_size)
+            if page:
+                self.page_fetched.emit(request, page)
+                count += len(page)
+
+            if len(page) < self.__page_size:
+                break
+
+        return count
+
+    def __publish(self, changes):
+        return self.__store.publish(changes.added, changes.removed)
+
+    def __fetch(self, page):
+        offset, limit = page
+        return self.__store.fetch(offset, limit)
+
+    def __query(self, query):
+        text, limit = query
+        return self.__store.query(text, limit=limit)
+
+    # Slots.
+    @QtCore.Slot(object)
+    def _on_request_submitted(self, request):
+        payload = request.start()
+        if request.cancelled:
+            return
+
+        try:
+            if request.kind == REFRESH_REQUEST:
+                result = self.__refresh(request)
+            elif request.kind == PUBLISH_REQUEST:
+                result = self.__publish(payload)
+            elif request.kind == FETCH_REQUEST:
+                result = self.__fetch(payload)
+            else:
+                result = self.__query(payload)
+
+        except Exception as error:
+            self.failed.emit(request, '{cls}: {msg}'.format(
+                cls=type(error).__name__, msg=error))
+
+        else:
+            self.finished.emit(request, result)
+
+
+class TagLoader(QtCore.QObject):
+    """Refresh and publish the tags of TagManagers from a worker thread.
+
+    Requests are run one at a time, in the order they're submitted, so a
+    refresh requested after a publish sees the published tags. Results are
+    applied to the TagManagers on the GUI thread.
+
+    Any TagStore can be used, as long as it can be called from another
+    thread (SQLiteTagStore can, including in-memory databases).
+
+    Args:
+        store (tag_store.TagStore): Store to load from and publish to.
+        page_size (int): Number of tags fetched and sent back at once.
+        parent (QtCore.QObject): Parent of the loader.
+    """
+    # Signals.
+    progress = QtCore.Signal(object, int)  # TagManager, tags fetched so far.
+    loaded = QtCore.Signal(object, object)  # TagManager, TagChanges applied.
+    published = QtCore.Signal(object, object)  # TagManager, (added, removed).
+    failed = QtCore.Signal(object, str, str)  # TagManager, request, message.
+    idle = QtCore.Signal()  # Emitted once every request has completed.
+
+    # Private signals.
+    _request_submitted = QtCore.Signal(object)
+
+    def __init__(self, store, page_size=5000, parent=None):
+        super(TagLoader, self).__init__(parent)
+        self.store = store
+
+        self.__requests = []  # Requests submitted and not completed yet.
+        self.__tag_managers = set()  # TagManagers watched for deletion.
+
+        # Owned by the loader, so it's never destroyed before being stopped.
+        self.__thread = QtCore.QThread(self)
+        self.__worker = _TagWorker(store, page_size)
+        self.__worker.moveToThread(self.__thread)
+
+        # Signals crossing threads are queued, so the slots run in the
+        # thread of the receiving object.
+        self._request_submitted.connect(self.__worker._on_request_submitted)
+        self.__worker.page_fetched.connect(self._on_page_fetched)
+        self.__worker.finished.connect(self._on_request_finished)
+        self.__worker.failed.connect(self._on_request_failed)
+
+        # The thread must be stopped before the application is destroyed,
+        # and before the loader (its parent) is: destroyed is emitted before
+        # the children are deleted, whether the loader is garbage-collected
+        # or deleted along with its parent.
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+        self.destroyed.connect(functools.partial(
+            _stop_thread, self.__thread, self.__requests))
+        _threads[self.__thread] = self.__requests
+
+        self.__thread.start()
+
+    # Private.
+    def __pending(self, kind, tag_manager):
+        """Returns the pending request of a kind for the TagManager, if any.
+        """
+        for request in self.__requests:
+            if request.kind == kind and request.tag_manager is tag_manager \
+                    and request.coalescable and not request.cancelled:
+                return request
+
+        return None
+
+    def __submit(self, request):
+        tag_manager = request.tag_manager
+
+        # Results of TagManagers deleted in the meantime are discarded.
+        if tag_manager not in self.__tag_managers:
+            self.__tag_managers.add(tag_manager)
+            tag_manager.destroyed.connect(
+                functools.partial(self._on_tag_manager_destroyed,
+                                  tag_manager))
+
+        self.__requests.append(request)
+        self._request_submitted.emit(request)
+
+    def __complete(self, request):
+        if request not in self.__requests:
+            return
+
+        self.__requests.remove(request)
+        if not self.__requests:
+            self.idle.emit()
+
+    # Public.
+    def refresh(self, tag_manager):
+        """Fetch all the tags of the store and sync the TagManager with them,
+        see TagManager.sync_tags.
+
+        Refreshing a TagManager that's already being refreshed is a no-op,
+        the pending refresh will apply the same tags.
+
+        Args:
+            tag_manager (TagManager): TagManager to refresh.
+
+        Emits:
+            progress: Number of tags fetched, after each page.
+            loaded: The changes applied to the TagManager, once refreshed.
+            failed: The error message, if the store call failed.
+
+        Returns:
+            bool: True if a refresh was queued, False if it was coalesced
+                with the pending one.
+        """
+        if self.__pending(REFRESH_REQUEST, tag_manager) is not None:
+            return False
+
+        self.__submit(_TagRequest(REFRESH_REQUEST, tag_manager))
+        return True
+
+    def publish(self, tag_manager):
+        """Publish the changes of the TagManager to the store, see
+        TagManager.get_changes.
+
+        The changes are committed once they're published, unless the tags
+        were changed again in the meantime, in which case they're published
+        again the next time. Publishing the same changes twice is harmless.
+
+        Args:
+            tag_manager (TagManager): TagManager to publish.
+
+        Emits:
+            published: The number of tags added and removed in the store.
+            failed: The error message, if the store call failed.
+
+        Returns:
+            bool: True if a publish was queued, False if it was coalesced
+                with one that hasn't started yet.
+        """
+        changes = tag_manager.get_changes()
+
+        # Pending changes are a superset of the ones still waiting to be
+        # published, so they replace them.
+        pending = self.__pending(PUBLISH_REQUEST, tag_manager)
+        if pending is not None and pending.update(changes):
+            return False
+
+        # Refreshes that are already queued might miss these changes, so
+        # later refreshes can't be coalesced with them.
+        refresh = self.__pending(REFRESH_REQUEST, tag_manager)
+        if refresh is not None:
+            refresh.coalescable = False
+
+        self.__submit(_TagRequest(PUBLISH_REQUEST, tag_manager, changes))
+        return True
+
+    def fetch(self, tag_manager, offset, limit, callback):
+        """Fetch a page of tags of the store, see TagStore.fetch.
+
+        Args:
+            tag_manager (TagManager): TagManager the page is fetched for.
+                The page is discarded if it's deleted in the meantime.
+            offset (int): Index of the first tag of the page.
+            limit (int): Maximum number of tags of the page.
+            callback (callable): Called with the list of tag names on the
+                GUI thread, or None if the store call failed.
+
+        Emits:
+            failed: The error message, if the store call failed.
+        """
+        self.__submit(_TagRequest(FETCH_REQUEST, tag_manager,
+                                  (offset, limit), callback))
+
+    def query(self, tag_manager, text, limit, callback):
+        """Fetch the tags of the store matching a search query, see
+        TagStore.query.
+
+        A query replaces the one of the TagManager that hasn't started yet,
+        if any, so typing a search only runs the queries the worker keeps up
+        with.
+
+        Args:
+            tag_manager (TagManager): TagManager the tags are fetched for.
+                They're discarded if it's deleted in the meantime.
+            text (str): Text to search for.
+            limit (int): Maximum number of tags.
+            callback (callable): Called with the list of tag names on the
+                GUI thread, or None if the store call failed.
+
+        Emits:
+            failed: The error message, if the store call failed.
+
+        Returns:
+            bool: True if a query was queued, False if it replaced the
+                pending one.
+        """
+        pending = self.__pending(QUERY_REQUEST, tag_manager)
+        if pending is not None and pending.callback == callback and \
+                pending.update((text, limit)):
+            return False
+
+        self.__submit(_TagRequest(QUERY_REQUEST, tag_manager, (text, limit),
+                                  callback))
+        return True
+
+    def is_busy(self):
+        """Checks if requests are pending.
+
+        Returns:
+            bool: True if any request hasn't completed yet, otherwise False.
+        """
+        return bool(self.__requests)
+
+    def cancel(self, tag_manager=None):
+        """Cancel the pending requests, the ones being run are completed but
+        their results aren't applied.
+
+        Args:
+            tag_manager (TagManager): Only cancel the requests of this
+                TagManager. All requests if omitted.
+        """
+        for request in list(self.__requests):
+            if tag_manager is None or request.tag_manager is tag_manager:
+                request.cancelled = True
+                self.__complete(request)
+
+    def shutdown(self):
+        """Cancel the pending requests and stop the worker thread.
+
+        Waits for the request being run, if any. The loader can't be used
+        afterwards.
+        """
+        self.cancel()
+        _stop_thread(self.__thread, self.__requests)
+
+    # Slots.
+    @QtCore.Slot(object, object)
+    def _on_page_fetched(self, request, page):
+        if request.cancelled:
+            return
+
+        request.tags.extend(page)
+        self.progress.emit(request.tag_manager, len(request.tags))
+
+    @QtCore.Slot(object, object)
+    def _on_request_finished(self, request, result):
+        tag_manager = request.tag_manager
+        self.__complete(request)
+
+        if request.cancelled:
+            return
+
+        if request.kind == REFRESH_REQUEST:
+            changes = tag_manager.sync_tags(request.tags)
+            self.loaded.emit(tag_manager, changes)
+
+        elif request.callback is not None:
+            request.callback(result)
+
+        else:
+            if tag_manager.get_changes() == request.payload:
+                tag_manager.commit()
+            self.published.emit(tag_manager, result)
+
+    @QtCore.Slot(object, str)
+    def _on_request_failed(self, request, message):
+        tag_manager = request.tag_manager
+        self.__complete(request)
+
+        if request.cancelled:
+            return
+
+        if request.callback is not None:
+            request.callback(None)
+        self.failed.emit(tag_manager, request.kind, message)
+
+    def _on_tag_manager_destroyed(self, tag_manager, *args):
+        self.__tag_managers.discard(tag_manager)
+        self.cancel(tag_manager)
@@ -1,7 +1,17 @@
+# Import built-in modules.
+import collections
+import functools
+import itertools
+
 # Import local modules.
 from pyqt_tag_manager import QtCore
 from pyqt_tag_manager import QtGui
 from pyqt_tag_manager import QtWidgets
+from pyqt_tag_manager import mapped_vocabulary
+from pyqt_tag_manager import tag_engine
+from pyqt_tag_manager import tag_io
+from pyqt_tag_manager import tag_keys
+from pyqt_tag_manager import tag_loader
 from pyqt_tag_manager.qt_market import widget_vendor
 from pyqt_tag_manager.qt_market import color_utils
 from pyqt_tag_manager.qt_market import animations
@@ -10,6 +20,14 @@ from pyqt_tag_manager.qt_market import animations
 # Constants.
 DISPLAY_ROLE = QtCore.Qt.DisplayRole  # Text display for tag.
 SORTING_MATCH_ROLE = QtCore.Qt.UserRole + 1  # Tag is prioritized when sorting.
+TAG_ID_ROLE = QtCore.Qt.UserRole + 3  # Id of the tag in the vocabulary.
+
+# Match changes up to which rows are moved one at a time by the sort proxy
+# model, as a fraction of the rows. Past it, all rows are sorted at once.
+_MAX_RESORTED_ROWS_RATIO = 1 / 32.0
+
+# Sets of tag names added and removed, see TagManager.get_changes.
+TagChanges = collections.namedtuple('TagChanges', ['added', 'removed'])
 
 
 class TagManager(QtWidgets.QWidget):
@@ -19,17 +37,31 @@ class TagManager(QtWidgets.QWidget):
     tag_is_valid = QtCore.Signal(str)
     tag_is_invalid = QtCore.Signal(str)
     tag_registered = QtCore.Signal(bool)
+    population_progress = QtCore.Signal(int)  # Number of tags consumed.
+    population_finished = QtCore.Signal(int)  # Number of tags added.
+    population_cancelled = QtCore.Signal(int)  # Number of tags added.
+    tags_deleted = QtCore.Signal(list)  # Names of the deleted tags.
+    tags_ingested = QtCore.Signal(list)  # Names of the tags added.
+    tags_fetched = QtCore.Signal(list)  # Names of the tags paged in.
 
     # Constants.
     EDIT_MODE = 'TagManager.editor_mode'
     VIEWER_MODE = 'TagManager.viewer_mode'
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, vocabulary=None):
         super(TagManager, self).__init__(parent)
         self.editing_mode = True
+        self.__populator = None
+        self.__ingester = None  # See set_ingestion_queue.
+        self.__store_loader = None  # Owned loader, see set_tag_store.
+        self.__fail_animation = None  # See _on_tag_is_invalid.
+        self.__low_overhead_mode_enabled = False
 
         self.__build_ui()
 
+        if vocabulary is not None:
+            self.set_vocabulary(vocabulary)
+
     # Private.
     def __build_ui(self):
         """Build the base UI."""
@@ -46,6 +78,7 @@ class TagManager(QtWidgets.QWidget):
         # Signals.
         self.tag_editor.textChanged.connect(self._on_editor_text_changed)
         self.tag_editor.returnPressed.connect(self._on_return_pressed)
+        self.tag_viewer.tags_fetched.connect(self.tags_fetched)
 
         self.mode_changed.connect(self._on_mode_changed)
         self.tag_is_valid.connect(self._on_tag_is_valid)
@@ -64,6 +97,13 @@ class TagManager(QtWidgets.QWidget):
         else:
             return False
 
+    def __release_store_loader(self):
+        """Stop the loader created for the tag store, if any. """
+        if self.__store_loader is not None:
+            self.__store_loader.shutdown()
+            self.__store_loader.deleteLater()
+            self.__store_loader = None
+
     # Public.
     def add_tag(self, tag_name):
         """Add a uniquely named tag item to the viewer.
@@ -83,17 +123,227 @@ class TagManager(QtWidgets.QWidget):
             return False
 
     def add_tags(self, tags):
-        """Add a list of tags to the viewer.
+        """Add a list of uniquely named tags to the viewer.
+
+        Tags are inserted in bulk and the viewer is only sorted once.
+        Use populate_tags instead for very large lists, to keep the UI
+        responsive while they're being added.
+
+        Args:
+            tags (iterable): Names of the tags to add.
+
+        Emits:
+            tag_registered: True if any tag was added, otherwise False.
+
+        Returns:
+            list: Names of the tags that were added.
+        """
+        added = self.tag_viewer.add_tags(tags)
+        self.tag_registered.emit(bool(added))
+
+        return added
+
+    def populate_tags(self, tags, budget_ms=8, chunk_size=250):
+        """Add tags from any iterable without blocking the UI.
+
+        Tags are pulled from the iterable in chunks and inserted during
+        time-sliced passes of the event loop, so the widget stays
+        interactive and searchable while loading. Generators and database
+        cursors are consumed lazily, one chunk at a time.
+
+        Any population that's already running is cancelled first.
+
+        Args:
+            tags (iterable): Names of the tags to add.
+            budget_ms (int): Time budget of each pass of the event loop.
+            chunk_size (int): Number of tags inserted at once.
+
+        Emits:
+            population_progress: Number of tags consumed, after each pass.
+            population_finished: Number of tags added, once exhausted.
+        """
+        self.cancel_population()
+
+        self.__populator = _TagPopulator(self.tag_viewer, tags,
+                                         budget_ms=budget_ms,
+                                         chunk_size=chunk_size,
+                                         parent=self)
+        self.__populator.progress.connect(self.population_progress)
+        self.__populator.finished.connect(self._on_population_finished)
+        self.__populator.cancelled.connect(self._on_population_cancelled)
+        self.__populator.start()
+
+    def cancel_population(self):
+        """Stop populating tags started with populate_tags.
+
+        Tags added so far are kept.
+
+        Emits:
+            population_cancelled: Number of tags added before cancelling.
+        """
+        if self.__populator is not None:
+            self.__populator.cancel()
+
+    def is_populating(self):
+        """Checks if tags are being populated by populate_tags.
+
+        Returns:
+            bool: True if population is in progress, otherwise False.
+        """
+        return self.__populator is not None
+
+    def set_ingestion_queue(self, queue, budget_ms=8, chunk_size=500,
+                            latency_ms=50):
+        """Add the tags put in a queue by other threads.
+
+        Producers on worker threads (e.g. asset scanners) can't call
+        add_tags, which must run in the GUI thread. They put their tags in a
+        tag_queue.TagQueue instead, and the queue is drained during
+        time-sliced passes of the event loop, like populate_tags: batches
+        are deduplicated and inserted through the bulk insert path. The
+        event loop is only woken up once per burst of tags, when they're
+        put in an empty queue, and waits latency_ms for the rest of the
+        burst: every pass lays the viewer out again, so trickling tags are
+        inserted together rather than one pass each.
+
+        Producers are held back while the queue is full, see TagQueue.put.
+        Any previous queue is detached first; its remaining tags are left
+        in it.
 
         Args:
-            tags (list): List of tags toa dd.
+            queue (tag_queue.TagQueue): Queue to drain, or None to stop.
+            budget_ms (int): Time budget of each pass of the event loop.
+            chunk_size (int): Number of tags taken and inserted at once.
+            latency_ms (int): Delay before draining tags put in the empty
+                queue.
+
+        Emits:
+            tags_ingested: Names of the tags added, after each pass.
         """
-        for tag in tags:
-            self.add_tag(tag)
+        if self.__ingester is not None:
+            # Producers may still be putting tags: the queue must be done
+            # with the ingester before it's deleted.
+            self.__ingester.stop()
+            self.__ingester.deleteLater()
+            self.__ingester = None
+
+        if queue is not None:
+            self.__ingester = _TagIngester(self.tag_viewer, queue,
+                                           budget_ms=budget_ms,
+                                           chunk_size=chunk_size,
+                                           latency_ms=latency_ms,
+                                           parent=self)
+            self.__ingester.ingested.connect(self.tags_ingested)
+            self.__ingester.start()
+
+    def get_ingestion_queue(self):
+        """Returns the queue drained by the tag manager, if any. """
+        if self.__ingester is not None:
+            return self.__ingester.queue()
+
+        return None
 
     def clear_tags(self):
-        """Clear all existing tags from the viewer's model."""
+        """Clear all existing tags from the viewer's model.
+
+        Pending changes are discarded, see get_changes. The tag store (if
+        any) is detached.
+        """
+        self.cancel_population()
         self.tag_viewer.clear_tags()
+        self.__release_store_loader()
+
+    def delete_tags(self, tags):
+        """Delete tags from the viewer, by name.
+
+        Rows are removed one contiguous range at a time, rather than one tag
+        at a time, so deleting many tags only updates the viewer a few times.
+
+        Args:
+            tags (iterable): Names of the tags to delete. Names that aren't
+                registered are skipped.
+
+        Emits:
+            tags_deleted: Names of the deleted tags, once, if any.
+
+        Returns:
+            list: Names of the tags that were deleted.
+        """
+        deleted = self.tag_viewer.delete_tags(tags)
+        if deleted:
+            self.tags_deleted.emit(deleted)
+
+        return deleted
+
+    def delete_matching(self, query):
+        """Delete the tags matching a search query, as searched in the
+        editor (see sort_tags_by_search_criteria).
+
+        Tags of the tag store that weren't fetched yet are kept.
+
+        Args:
+            query (str): Text to search for. Nothing is deleted if empty.
+
+        Emits:
+            tags_deleted: Names of the deleted tags, once, if any.
+
+        Returns:
+            list: Names of the tags that were deleted.
+        """
+        deleted = self.tag_viewer.delete_matching(query)
+        if deleted:
+            self.tags_deleted.emit(deleted)
+
+        return deleted
+
+    def sync_tags(self, tags):
+        """Update the registered tags to match the given ones, only adding
+        and removing the differences.
+
+        Tags that are kept aren't touched, so refreshing a large viewer after
+        a few changes is nearly free, unlike clear_tags followed by
+        add_tags. The tags become the checkpoint changes are tracked from,
+        and the tag store (if any) is detached.
+
+        Args:
+            tags (iterable): Names of all the tags to display.
+
+        Returns:
+            TagChanges: Names of the tags that were added and removed.
+        """
+        self.cancel_population()
+        added, removed = self.tag_viewer.sync_tags(tags)
+        self.__release_store_loader()
+
+        return TagChanges(set(added), set(removed))
+
+    def get_changes(self):
+        """Returns the tags added and removed since the last commit.
+
+        Tags added with add_tag(s), populate_tags or import_tags and the ones
+        deleted from the viewer are tracked. A tag that's added and then
+        removed again (or vice versa) isn't reported. Replacing all the tags
+        (clear_tags, sync_tags, load_vocabulary, set_tag_store) discards
+        pending changes.
+
+        Returns:
+            TagChanges: Sets of the tag names added and removed.
+        """
+        return self.tag_viewer.get_changes()
+
+    def has_changes(self):
+        """Checks if tags were added or removed since the last commit.
+
+        Returns:
+            bool: True if there are pending changes, otherwise False.
+        """
+        return self.tag_viewer.has_changes()
+
+    def commit(self):
+        """Mark the current tags as the checkpoint changes are tracked from,
+        typically once the changes have been published.
+        """
+        self.tag_viewer.commit()
 
     def has_tag(self, tag_name):
         """Check if a tag already exists in the viewer's model.
@@ -114,6 +364,274 @@ class TagManager(QtWidgets.QWidget):
         """
         return self.tag_viewer.get_tags()
 
+    def iter_tags(self):
+        """Iterate over the registered tags, without copying them first.
+
+        The tags shouldn't be added or removed while iterating.
+
+        Yields:
+            str: Name of each registered tag.
+        """
+        return self.tag_viewer.iter_tags()
+
+    def import_tags(self, path, fmt=None, chunk_size=10000, **kwargs):
+        """Add the tags stored in a vocabulary file.
+
+        The file is streamed and added in chunks through the bulk insert
+        path, so memory stays bounded by the chunk size (plus the tags
+        themselves). Duplicates are skipped.
+        To keep the UI responsive while importing, pass
+        `tag_io.read_tags(path)` to populate_tags instead.
+
+        Args:
+            path (Union[str, file]): Path or open text file to read from.
+            fmt (str): One of tag_io.FORMATS. Guessed from the extension
+                of a path if omitted, required for open files.
+            chunk_size (int): Number of tags inserted at once.
+            **kwargs: Extra keyword arguments for tag_io.read_tags.
+
+        Emits:
+            tag_registered: True if any tag was added, otherwise False.
+
+        Returns:
+            int: Number of tags added.
+        """
+        count = 0
+        for chunk in tag_io.iter_chunks(tag_io.read_tags(path, fmt, **kwargs),
+                                        chunk_size):
+            count += len(self.tag_viewer.add_tags(chunk, sort=False))
+
+        if count:
+            self.tag_viewer.sort()
+
+        self.tag_registered.emit(bool(count))
+        return count
+
+    def export_tags(self, path, fmt=None, **kwargs):
+        """Write the registered tags to a vocabulary file, streaming them
+        straight from the model.
+
+        Args:
+            path (Union[str, file]): Path or open text file to write to.
+            fmt (str): One of tag_io.FORMATS. Guessed from the extension
+                of a path if omitted, required for open files.
+            **kwargs: Extra keyword arguments for tag_io.write_tags.
+
+        Returns:
+            int: Number of tags written.
+        """
+        return tag_io.write_tags(path, self.iter_tags(), fmt, **kwargs)
+
+    def set_tag_store(self, store, page_size=500, loader=None):
+        """Display the tags of a tag store, paging them in lazily.
+
+        The existing tags are replaced. Only the first page is fetched,
+        the following ones are fetched as the viewer is scrolled down.
+        Searching also fetches the first page of matching tags from the
+        store. The store is detached by clear_tags, sync_tags and
+        load_vocabulary, which also stop the loader created for it.
+
+        The store is called by the worker thread of a tag_loader.TagLoader,
+        never from the GUI thread: pages and matching tags are added when
+        they arrive.
+
+        Args:
+            store (tag_store.TagStore): Store to page from, or None.
+            page_size (int): Number of tags fetched at once.
+            loader (tag_loader.TagLoader): Loader of the store, e.g. shared
+                by the TagManagers of the store. If omitted, the tag manager
+                creates its own.
+
+        Emits:
+            tags_fetched: Names of the tags added, after each page.
+        """
+        if loader is not None and loader.store is not store:
+            raise ValueError('The loader {loader!r} runs the calls of '
+                             'another store than {store!r}'.format(
+                                 loader=loader, store=store))
+
+        self.cancel_population()
+        self.__release_store_loader()
+
+        if store is not None and loader is None:
+            self.__store_loader = tag_loader.TagLoader(
+                store, page_size=page_size, parent=self)
+            loader = self.__store_loader
+
+        self.tag_viewer.set_tag_store(store, page_size, loader, self)
+
+    def get_tag_store(self):
+        """Returns the tag store the tags are paged from, if any.
+
+        Returns:
+            tag_store.TagStore: The attached store, or None.
+        """
+        return self.tag_viewer.get_tag_store()
+
+    def set_vocabulary(self, vocabulary):
+        """Store the tags in a vocabulary shared with other TagManagers.
+
+        The tag names, their keys and the sizes of their labels are stored
+        once in the vocabulary, each TagManager only keeping track of which
+        tags it displays. The current tags are kept.
+
+        Args:
+            vocabulary (tag_vocabulary.TagVocabulary): Vocabulary to use,
+                e.g. from tag_vocabulary.get_shared_vocabulary.
+        """
+        self.cancel_population()
+        self.tag_viewer.set_vocabulary(vocabulary)
+
+    def get_vocabulary(self):
+        """Returns the vocabulary the tags are stored in.
+
+        Returns:
+            tag_vocabulary.TagVocabulary: The vocabulary of the tags.
+        """
+        return self.tag_viewer.get_vocabulary()
+
+    def load_vocabulary(self, path):
+        """Replace the tags with a binary vocabulary file.
+
+        The file is memory-mapped and displayed in its stored order, so
+        large vocabularies show up instantly: nothing is sorted and tag names
+        are only decoded when the viewer requests them.
+        Files are written with save_vocabulary or
+        mapped_vocabulary.write_vocabulary.
+
+        The file gets its own vocabulary, it isn't shared with other
+        TagManagers (see set_vocabulary). It stays open until another
+        vocabulary replaces it, or the TagManager is destroyed.
+
+        Args:
+            path (str): Path of the vocabulary file.
+        """
+        self.cancel_population()
+        self.tag_viewer.load_vocabulary(
+            mapped_vocabulary.MappedVocabulary(path))
+        self.__release_store_loader()
+
+    def save_vocabulary(self, path):
+        """Write the registered tags to a binary vocabulary file, see
+        load_vocabulary.
+
+        Args:
+            path (str): Path of the vocabulary file.
+
+        Returns:
+            int: Number of tags written.
+        """
+        return mapped_vocabulary.write_vocabulary(path, self.iter_tags())
+
+    def set_palette(self, palette):
+        """Set the colors of the tags.
+
+        Tags are colored by their first character. Custom palettes can be
+        registered with color_utils.register_palette, e.g. a
+        color_utils.HashPalette for non-Latin scripts.
+
+        Args:
+            palette (Union[str, color_utils.Palette]): Palette, or name of
+                a registered palette.
+        """
+        if not isinstance(palette, color_utils.Palette):
+            palette = color_utils.get_palette(palette)
+
+        self.tag_viewer.set_palette(palette)
+
+    def get_palette(self):
+        """Returns the palette the tags are colored with.
+
+        Returns:
+            color_utils.Palette: Palette of the tags.
+        """
+        return self.tag_viewer.get_palette()
+
+    def enable_low_overhead_mode(self, enabled):
+        """Use cheaper visual feedback, e.g. on remote desktops or software
+        rendering.
+
+        Invalid input is then signaled by tinting the editor, rather than
+        with a graphics effect rendering it offscreen on every frame.
+
+        Args:
+            enabled (bool): Enables low overhead mode.
+        """
+        self.__low_overhead_mode_enabled = enabled
+
+        if self.__fail_animation is not None:
+            self.__fail_animation.stop()
+            self.__fail_animation.low_overhead = enabled
+
+    def is_low_overhead_mode_enabled(self):
+        """Checks if low overhead mode is enabled. """
+        return self.__low_overhead_mode_enabled
+
+    def enable_ordered_view_mode(self, enabled):
+        """Keep the tags in display order in the model of the viewer, rather
+        than sorting them with a proxy model.
+
+        Recommended for large vocabularies: the per-row mapping tables of
+        the proxy model aren't needed, and sorting uses the cached keys of
+        the tags rather than comparing them one pair at a time.
+
+        Args:
+            enabled (bool): Enables ordered view mode.
+        """
+        self.tag_viewer.enable_ordered_view_mode(enabled)
+
+    def is_ordered_view_mode_enabled(self):
+        """Checks if ordered view mode is enabled. """
+        return self.tag_viewer.is_ordered_view_mode_enabled()
+
+    def set_match_engine(self, engine):
+        """Match the search queries with an engine, rather than one tag at a
+        time in the GUI thread.
+
+        Recommended for vocabularies of hundreds of thousands of tags: a
+        match_engine.MatchEngine spreads the matching over worker processes,
+        started once and kept for every query. The engine can be shared by
+        TagManagers using the same vocabulary, and must be closed by the
+        caller.
+
+        Args:
+            engine (match_engine.MatchEngine): Engine to use, or None to
+                stop using one.
+        """
+        self.tag_viewer.set_match_engine(engine)
+
+    def get_match_engine(self):
+        """Returns the engine matching the search queries, if any. """
+        return self.tag_viewer.get_match_engine()
+
+    def set_collation(self, collation, locale=None):
+        """Set the order the tags are displayed in.
+
+        Collations:
+            tag_keys.PLAIN_COLLATION: Case-insensitive, the default.
+            tag_keys.NATURAL_COLLATION: Numbers are compared by value, e.g.
+                'shot_2' before 'shot_10'.
+            tag_keys.LOCALE_COLLATION: The rules of a locale, e.g. accented
+                characters next to their base letter.
+
+        Keys are computed once per tag, so sorting costs the same in every
+        collation.
+
+        Args:
+            collation (str): One of tag_keys.COLLATIONS.
+            locale (QtCore.QLocale): Locale of LOCALE_COLLATION. The default
+                locale if omitted.
+        """
+        self.tag_viewer.set_collation(collation, locale)
+
+    def get_collation(self):
+        """Returns the collation the tags are displayed in.
+
+        Returns:
+            str: One of tag_keys.COLLATIONS.
+        """
+        return self.tag_viewer.get_collation()
+
     def enable_tag_management(self, enabled):
         """Allows editing functionality for tags within the manager.
 
@@ -167,11 +685,226 @@ class TagManager(QtWidgets.QWidget):
     @QtCore.Slot()
     def _on_tag_is_invalid(self, tag_name):
         """Triggered when the tag input editor value is invalid. """
-        anm = animations.FailColorAnimation(parent=self.tag_editor)
-        anm.play()
+        # Re-used, so repeated invalid input restarts the same animation.
+        if self.__fail_animation is None:
+            self.__fail_animation = animations.FailColorAnimation(
+                parent=self.tag_editor,
+                low_overhead=self.__low_overhead_mode_enabled)
+
+        self.__fail_animation.play()
+
+    @QtCore.Slot()
+    def _on_population_finished(self, count):
+        """Triggered when populate_tags consumed all of its tags. """
+        self.__populator.deleteLater()
+        self.__populator = None
+        self.population_finished.emit(count)
+
+    @QtCore.Slot()
+    def _on_population_cancelled(self, count):
+        """Triggered when populate_tags is cancelled. """
+        self.__populator.deleteLater()
+        self.__populator = None
+        self.population_cancelled.emit(count)
 
 
 # Protected: Not intended for use outside this module!
+def _close_engine(engine, *args):
+    """Close the engine of a model that's destroyed, see TagEngine.close.
+    """
+    engine.close()
+
+
+class _TagPopulator(QtCore.QObject):
+    """Inserts tags from an iterable in time-sliced chunks.
+
+    Each timeout of the timer pulls chunks from the iterable and adds them to
+    the viewer, until the time budget of the pass is spent. Control is then
+    returned to the event loop, so painting and input are processed between
+    passes.
+
+    Note:
+        Chunks are added without sorting, since sorting every inserted row
+        costs more than sorting all of them at once. New rows are appended
+        to the end of the viewer until population finishes (or the user
+        searches), at which point the viewer is sorted once.
+    """
+    # Signals.
+    progress = QtCore.Signal(int)  # Number of tags consumed.
+    finished = QtCore.Signal(int)  # Number of tags added.
+    cancelled = QtCore.Signal(int)  # Number of tags added.
+
+    def __init__(self, viewer, tags, budget_ms=8, chunk_size=250,
+                 parent=None):
+        super(_TagPopulator, self).__init__(parent)
+        self.__viewer = viewer
+        self.__tags = iter(tags)
+        self.__budget_ms = budget_ms
+        self.__chunk_size = chunk_size
+
+        self.__consumed = 0
+        self.__added = 0
+
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setInterval(0)
+        self.__timer.timeout.connect(self._on_timeout)
+
+    # Private.
+    def __stop(self):
+        """Stop the passes and sort the tags added so far. """
+        self.__timer.stop()
+        self.__tags = iter(())
+
+        if self.__added:
+            self.__viewer.sort()
+
+    # Public.
+    def start(self):
+        """Start inserting tags on the next passes of the event loop. """
+        self.__timer.start()
+
+    def cancel(self):
+        """Stop inserting tags, keeping the ones added so far. """
+        if self.__timer.isActive():
+            self.__stop()
+            self.cancelled.emit(self.__added)
+
+    # Slots.
+    @QtCore.Slot()
+    def _on_timeout(self):
+        """Triggered on every pass of the event loop. """
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+
+        # At least one chunk is inserted per pass, whatever the budget.
+        while True:
+            try:
+                chunk = list(itertools.islice(self.__tags, self.__chunk_size))
+            except Exception:
+                # Don't keep polling a broken iterable (e.g. closed cursor).
+                self.__stop()
+                raise
+
+            if not chunk:
+                self.__stop()
+                self.progress.emit(self.__consumed)
+                self.finished.emit(self.__added)
+                return
+
+            self.__consumed += len(chunk)
+            self.__added += len(self.__viewer.add_tags(chunk, sort=False))
+
+            if timer.elapsed() >= self.__budget_ms:
+                break
+
+        self.progress.emit(self.__consumed)
+
+
+class _TagIngester(QtCore.QObject):
+    """Drains a tag queue filled by other threads, in time-sliced batches.
+
+    Each timeout of the timer takes batches from the queue and adds them to
+    the viewer, until the time budget of the pass is spent or the queue is
+    empty. The timer stops once the queue is drained, and is started again
+    by the queue's listener when tags are put in the empty queue: the
+    listener only emits a signal, queued to the thread of the ingester. The
+    first pass then waits for the latency, so a burst of tags is drained at
+    once, and the next passes follow right away while tags are left.
+
+    Note:
+        Like _TagPopulator, batches are added without sorting, and the
+        viewer is sorted once the queue is drained.
+    """
+    # Signals.
+    ingested = QtCore.Signal(list)  # Names of the tags added.
+    pending = QtCore.Signal()  # Tags were put in the empty queue.
+
+    def __init__(self, viewer, queue, budget_ms=8, chunk_size=500,
+                 latency_ms=50, parent=None):
+        super(_TagIngester, self).__init__(parent)
+        self.__viewer = viewer
+        self.__queue = queue
+        self.__budget_ms = budget_ms
+        self.__chunk_size = chunk_size
+        self.__latency_ms = latency_ms
+        self.__needs_sorting = False
+
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.timeout.connect(self._on_timeout)
+
+        # Emitted from the producer threads.
+        self.pending.connect(self._on_pending, QtCore.Qt.QueuedConnection)
+        # The queue may outlive the tag manager.
+        self.destroyed.connect(lambda *_: queue.set_listener(None))
+
+    # Private.
+    def __sort_if_needed(self):
+        """Sort the tags added since the queue was last drained. """
+        if self.__needs_sorting:
+            self.__needs_sorting = False
+            self.__viewer.sort()
+
+    # Public.
+    def queue(self):
+        """Returns the queue being drained. """
+        return self.__queue
+
+    def start(self):
+        """Drain the queue on the next passes of the event loop, and
+        whenever tags are put in it. """
+        self.__queue.set_listener(self.pending.emit)
+        self.__timer.start(0)
+
+    def stop(self):
+        """Stop draining the queue, keeping the tags added so far.
+
+        Once this returns, producers no longer notify the ingester, so it can
+        be deleted.
+        """
+        self.__queue.set_listener(None)
+        self.__timer.stop()
+        self.__sort_if_needed()
+
+    # Slots.
+    @QtCore.Slot()
+    def _on_pending(self):
+        """Triggered when tags are put in the empty queue. """
+        if not self.__timer.isActive():
+            self.__timer.start(self.__latency_ms)
+
+    @QtCore.Slot()
+    def _on_timeout(self):
+        """Triggered on every pass of the event loop, while tags are
+        queued. """
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+        added = []
+
+        # At least one batch is taken per pass, whatever the budget.
+        while True:
+            batch = self.__queue.take(self.__chunk_size)
+            if not batch:
+                break
+
+            # Producers often report the same tags, e.g. one per asset.
+            added.extend(self.__viewer.add_tags(dict.fromkeys(batch),
+                                                sort=False))
+
+            if timer.elapsed() >= self.__budget_ms:
+                break
+
+        if added:
+            self.__needs_sorting = True
+            self.ingested.emit(added)
+
+        # Tags put from now on wake the ingester up again, see _on_pending.
+        if not len(self.__queue):
+            self.__timer.stop()
+            self.__sort_if_needed()
+        else:
+            self.__timer.setInterval(0)
+
+
 class _TaggingWidget(QtWidgets.QFrame):
     """Base widget containing the tag editor and viewer."""
     def __init__(self, parent=None):
@@ -277,11 +1010,19 @@ class _InputEditor(QtWidgets.QWidget):
 
 class _TagListViewer(QtWidgets.QListView):
     """Base list viewport widget used to display all available tags. """
+    # Signals.
+    tags_fetched = QtCore.Signal(list)  # Names of the tags paged in.
+
     def __init__(self, parent=None):
         super(_TagListViewer, self).__init__(parent)
         self.__tag_management_enabled = False
         self.__dark_mode_enabled = True
-        self.__last_item_added = None
+        self.__palette = color_utils.get_palette()
+        self.__last_tag_added = None  # Id of the tag in the model.
+        self.__last_tag_added_row = -1  # Source row it was inserted at.
+
+        self.__search_text = ''
+        self.__search_key = ''  # See tag_keys.search_key.
 
         # Defaults.
         self.setSpacing(3)
@@ -301,28 +1042,91 @@ class _TagListViewer(QtWidgets.QListView):
         self.__setup_model()
         self.enable_tag_management(True)
 
+    # Inherited.
+    def mouseMoveEvent(self, event):
+        """Override the inherited mouseMoveEvent method.
+
+        The hovered delete button is tracked here, rather than by the base
+        class, which repaints whole tags every time the hovered tag changes.
+        Only the delete buttons are repainted, see
+        _TagDelegate.set_hovered_index.
+        """
+        if event.buttons() != QtCore.Qt.NoButton:
+            super(_TagListViewer, self).mouseMoveEvent(event)
+            return
+
+        delegate = self.itemDelegate()
+        index = self.indexAt(event.pos())
+
+        if index.isValid() and delegate.is_over_delete_button(
+                self.visualRect(index), event.pos()):
+            delegate.set_hovered_index(index)
+        else:
+            delegate.set_hovered_index(None)
+
+    def viewportEvent(self, event):
+        """Override the inherited viewportEvent method.
+
+        Hover events are ignored, for the same reason as in mouseMoveEvent.
+        The hovered delete button is reset once the cursor leaves the
+        viewport.
+        """
+        event_type = event.type()
+
+        if event_type in (QtCore.QEvent.HoverEnter, QtCore.QEvent.HoverMove,
+                          QtCore.QEvent.HoverLeave):
+            return False
+
+        if event_type == QtCore.QEvent.Leave:
+            self.itemDelegate().set_hovered_index(None)
+
+        return super(_TagListViewer, self).viewportEvent(event)
+
     # Private.
     def __setup_model(self):
         """Setup for the model(s) used by the viewer. """
-        self._model = QtGui.QStandardItemModel(self)
+        self._model = _TagListModel(self)
+        self._model.tags_fetched.connect(self.tags_fetched)
+        self.__setup_proxy_model()
 
+    def __setup_proxy_model(self):
+        """Display the model through a sort proxy model. """
         self._proxy_model = _TagListProxyModel(self)
         self._proxy_model.setSourceModel(self._model)
         self.setModel(self._proxy_model)
 
+    def __sorting_model(self):
+        """Returns the model sorting the rows: the proxy model, or the model
+        itself in ordered view mode. """
+        return self._model if self._proxy_model is None else \
+            self._proxy_model
+
+    def __suspend_sorting_for(self, count):
+        """Stop sorting rows as they're inserted, when inserting more tags
+        than the model holds. Sorting all rows at once is cheaper then.
+        """
+        if count > self._model.rowCount():
+            self.__sorting_model().suspend_sorting()
+
     def scroll_to_last_added_item(self):
         """Scrolls viewer to the last tag (item) that was added to the model.
 
         Since model sorting is handled by the QSortFilterProxyModel, it will
-        scroll to the positional index of the proxy model.
+        scroll to the positional index of the proxy model. Tags are appended
+        to the source model, so the row is found where the tag was inserted
+        (unless rows were removed since) and mapped through the proxy model
+        in constant time.
         """
-        if self.__last_item_added:
-            index = self.__last_item_added.index()
+        if self.__last_tag_added is not None:
+            row = self._model.row_of(self.__last_tag_added,
+                                     hint=self.__last_tag_added_row)
 
-            if index.isValid():
-                self.scrollTo(self._proxy_model.mapFromSource(index),
-                              self.PositionAtBottom
-                              )
+            if row >= 0:
+                index = self._model.index(row)
+                if self._proxy_model is not None:
+                    index = self._proxy_model.mapFromSource(index)
+
+                self.scrollTo(index, self.PositionAtBottom)
 
     # Public.
     def find_tag(self, tag_name):
@@ -331,8 +1135,7 @@ class _TagListViewer(QtWidgets.QListView):
         Returns:
             bool: True if tag name exists, otherwise False.
         """
-        match = self._model.findItems(tag_name, QtCore.Qt.MatchExactly, 0)
-        return True if match else False
+        return self._model.has_tag(tag_name)
 
     def add_tag(self, tag_name):
         """Add a tag to the model.
@@ -341,77 +1144,358 @@ class _TagListViewer(QtWidgets.QListView):
             tag_name (str): The name of the tag to add.
 
         Returns:
-            item: QStandardItem representation of tag.
+            bool: True if tag was added, otherwise False.
         """
-        item = QtGui.QStandardItem()
-        item.setData(tag_name, DISPLAY_ROLE)
-        item.setData(False, SORTING_MATCH_ROLE)
-        item.setEditable(False)
-        item.setSelectable(False)
-
-        self._model.appendRow(item)
-        self.__last_item_added = item
+        return bool(self.add_tags([tag_name]))
 
-        return item
-
-    def add_tags(self, tags):
-        """Add a list of tags to the model.
+    def add_tags(self, tags, sort=True):
+        """Add uniquely named tags to the model.
 
         Note:
             Sorting after every item has a significant affect on performance
             when adding tags from a large list of tags.
 
-            This is specially true when the proxy model sorting is triggered.
-            Therefore, we'll only sort once all the tags are added.
+            New rows are inserted in sorted position by the proxy model,
+            which is cheap for a few tags. When adding more tags than the
+            model holds, or new tags when sort is False, sorting is
+            suspended and the rows are sorted once all the tags are added.
 
         Args:
-            tags (list): List of tags to add to the model.
+            tags (iterable): Names of the tags to add to the model.
+                Names that already exist in the model are skipped.
+            sort (bool): Sort the proxy model once the tags are added.
+                Otherwise, rows are appended unsorted until sort is called.
+
+        Returns:
+            list: Names of the tags that were added.
         """
-        for tag in tags:
-            self.add_tag(tag)
+        tags = list(tags)
 
-        self.sort()
+        if sort:
+            self.__suspend_sorting_for(len(tags))
+        elif not all(map(self._model.has_tag, tags)):
+            # Resuming sorting sorts all rows again, so it's only suspended
+            # when rows are inserted.
+            self.__sorting_model().suspend_sorting()
 
-    def clear_tags(self):
-        """Clear the model of all tags/items."""
-        self._model.clear()
+        added = self._model.add_tags(tags, self.is_match_for_search_query)
 
-    def delete_tag(self, tag_name):
-        """Delete a specific tag from the model, by name.
+        if added:
+            # Appended to the model, unless in ordered view mode.
+            self.__last_tag_added_row = self._model.rowCount() - 1
+            self.__last_tag_added = self._model.vocabulary().find(added[-1])
 
-        Args:
-            tag_name (str): The name of the tag to delete.
-        """
-        match = self._model.findItems(tag_name, QtCore.Qt.MatchExactly, 0)
+        if sort:
+            self.sort()
 
-        for item in match:
-            self._model.removeRow(item.row())
+        return added
 
-    def get_tags(self):
-        """Returns a list of all available tags in the model."""
-        tag_list = []
-        for row in range(self._model.rowCount()):
-            index = self._model.index(row, 0)
-            tag_name = self._model.data(index, DISPLAY_ROLE)
-            tag_list.append(tag_name)
+    def sync_tags(self, tags):
+        """Update the model to hold exactly the given tags, with a minimal set
+        of row insertions and removals. Pending changes are discarded.
 
-        return tag_list
+        Args:
+            tags (iterable): Names of all the tags the model should hold.
 
-    def sort(self):
-        """Sort the proxy model based on the pre-defined sort criteria.
-        Warning: This can be a time-intensive operation when lots of tags
-        exist (> 200). Use sparingly and only when needed.
+        Returns:
+            tuple: Lists of the tag names that were added and removed.
         """
-        self._proxy_model.sort(0)
+        tags = list(tags)
+        self.__suspend_sorting_for(len(tags) - self._model.rowCount())
 
-    def sort_tags_by_search_criteria(self, text):
+        added, removed = self._model.sync_tags(
+            tags, self.is_match_for_search_query)
+
+        if added:
+            # Appended to the model, unless in ordered view mode.
+            self.__last_tag_added_row = self._model.rowCount() - 1
+            self.__last_tag_added = self._model.vocabulary().find(added[-1])
+
+        self.sort()
+
+        return added, removed
+
+    def get_changes(self):
+        """Returns the tags added and removed since the last commit.
+
+        Returns:
+            TagChanges: Sets of the tag names added and removed.
+        """
+        return TagChanges(*self._model.get_changes())
+
+    def has_changes(self):
+        """Checks if tags were added or removed since the last commit. """
+        return self._model.has_changes()
+
+    def commit(self):
+        """Discard the pending changes, the current tags becoming the
+        checkpoint changes are tracked from.
+        """
+        self._model.commit()
+
+    def get_tag_store(self):
+        """Returns the tag store the tags are paged from, if any. """
+        return self._model.tag_store()
+
+    def get_vocabulary(self):
+        """Returns the vocabulary the tags of the model are stored in. """
+        return self._model.vocabulary()
+
+    def set_vocabulary(self, vocabulary):
+        """Store the tags of the model in another vocabulary, keeping them.
+
+        Args:
+            vocabulary (tag_vocabulary.TagVocabulary): Vocabulary to use.
+        """
+        self.__last_tag_added = None
+        self.__sorting_model().suspend_sorting()
+        self._model.set_vocabulary(vocabulary, self.is_match_for_search_query)
+        self.sort()
+
+    def load_vocabulary(self, vocabulary):
+        """Replace the tags of the model with a memory-mapped vocabulary.
+
+        The vocabulary is already sorted, so it's displayed in its stored
+        order without sorting the proxy model, unless a search query is
+        active.
+
+        Args:
+            vocabulary (mapped_vocabulary.MappedVocabulary): Vocabulary to
+                display.
+        """
+        self.__last_tag_added = None
+
+        # Restore the source order before the reset, so that the proxy model
+        # doesn't sort the new rows while mapping them.
+        if self._proxy_model is not None:
+            self._proxy_model.sort(-1)
+
+        # Files are stored in plain order, see tag_keys.sort_key.
+        if self.has_search_query() or \
+                self._model.collation() != tag_keys.PLAIN_COLLATION:
+            self._model.load_vocabulary(vocabulary,
+                                        self.is_match_for_search_query)
+            self.sort()
+        else:
+            self._model.load_vocabulary(vocabulary)
+
+    def set_tag_store(self, store, page_size=500, loader=None,
+                      tag_manager=None):
+        """Replace the tags of the model with pages of a tag store.
+
+        Args:
+            store (tag_store.TagStore): Store to page from, or None.
+            page_size (int): Number of tags fetched at once.
+            loader (tag_loader.TagLoader): Loader running the store calls.
+            tag_manager (TagManager): TagManager the tags are fetched for.
+        """
+        self.__last_tag_added = None
+        self._model.set_store(store, page_size,
+                              self.is_match_for_search_query, loader,
+                              tag_manager)
+
+        # Fetch the first page, the following ones are fetched as the view
+        # is scrolled down.
+        self._model.fetchMore()
+
+        if self.has_search_query():
+            self._model.fetch_query(self.__search_text)
+
+    def clear_tags(self):
+        """Clear the model of all tags/items. Pending changes are discarded.
+        """
+        self._model.clear()
+        self.__last_tag_added = None
+
+    def delete_tag(self, tag_name):
+        """Delete a specific tag from the model, by name.
+
+        Args:
+            tag_name (str): The name of the tag to delete.
+
+        Returns:
+            bool: True if the tag was deleted, otherwise False.
+        """
+        return self._model.remove_tag(tag_name)
+
+    def delete_tags(self, tags):
+        """Delete tags from the model, by name, one contiguous range of rows
+        at a time.
+
+        Note:
+            The proxy model maps every removed range, so this is only as
+            cheap as the tags are contiguous in the source model. Removing
+            them in a single layout change instead would have the proxy
+            model sort every row again.
+
+        Args:
+            tags (iterable): Names of the tags to delete.
+
+        Returns:
+            list: Names of the tags that were deleted.
+        """
+        return self._model.remove_tags(tags)
+
+    def delete_matching(self, text):
+        """Delete the tags matching a search query from the model, one
+        contiguous range of rows at a time.
+
+        Args:
+            text (str): Text to search for, see is_match_for_search_query.
+                Nothing is deleted if empty.
+
+        Returns:
+            list: Names of the tags that were deleted.
+        """
+        if not text:
+            return []
+
+        return self._model.remove_matching(
+            tag_engine.substring_matcher(text))
+
+    def get_tags(self):
+        """Returns a list of all available tags in the model."""
+        return list(self.iter_tags())
+
+    def iter_tags(self):
+        """Iterate over all available tags in the model.
+
+        Yields:
+            str: Name of each tag, in model order.
+        """
+        return self._model.iter_tags()
+
+    def sort(self):
+        """Sort the proxy model based on the pre-defined sort criteria.
+        Rows then stay sorted as tags are added, see add_tags.
+        Warning: This can be a time-intensive operation when lots of tags
+        exist (> 200), unless the rows are already sorted or the ordered
+        view mode is enabled.
+        """
+        self.__sorting_model().sort_rows()
+
+    def get_collation(self):
+        """Returns the collation the tags are sorted by. """
+        return self._model.collation()
+
+    def set_collation(self, collation, locale=None):
+        """Sort the tags by another collation.
+
+        Args:
+            collation (str): One of tag_keys.COLLATIONS.
+            locale (QtCore.QLocale): Locale of LOCALE_COLLATION. The default
+                locale if omitted.
+        """
+        self.__sorting_model().suspend_sorting()
+        self._model.set_collation(collation, locale)
+        self.sort()
+
+    def sort_tags_by_search_criteria(self, text):
         """Sorts the tags by the provided text.
 
         Args:
             text (str): Text pattern to sort tags by.
         """
         self.scrollToTop()
-        self._proxy_model.sort_by_match(text)
+
+        # When paging from a tag store, matches might not be fetched yet.
+        self._model.fetch_query(text)
+
+        self.__search_text = text
+        self.__search_key = tag_keys.search_key(text)
+
+        # Match sets of recent queries are cached, so backspacing doesn't
+        # match every tag again.
+        match_set = self._model.find_matches(self.is_match_for_search_query,
+                                             query=self.__search_key)
+        changes = self._model.count_match_changes(match_set)
+
+        if not changes:
+            return
+
+        # The proxy model moves the rows whose match changed one at a time,
+        # unless there are too many: all rows are sorted at once then. The
+        # model sorts all rows with cached keys, in ordered view mode.
+        if self._proxy_model is None or \
+                changes > self._model.rowCount() * _MAX_RESORTED_ROWS_RATIO:
+            self.__sorting_model().suspend_sorting()
+
+        self._model.set_matches(match_set)
+        self.sort()
+
+    def search_text(self):
+        """Returns the text of the current search query. """
+        return self.__search_text
+
+    def get_match_engine(self):
+        """Returns the engine matching the search queries, if any. """
+        return self._model.match_engine()
+
+    def set_match_engine(self, engine):
+        """Match the search queries with an engine, see
+        _TagListModel.set_match_engine.
+
+        Args:
+            engine (match_engine.MatchEngine): Engine to use, or None.
+        """
+        self._model.set_match_engine(engine)
+
+    def has_search_query(self):
+        """Checks if tags are currently being searched.
+
+        Returns:
+            bool: True if a search query is set, otherwise False.
+        """
+        return bool(self.__search_text)
+
+    def is_match_for_search_query(self, search_key):
+        """Checks the search key of a tag against the search query, to
+        determine if it's a match.
+
+        Tags match if they contain the search text anywhere, regardless of
+        case and compatibility characters (see tag_keys.search_key).
+
+        Args:
+            search_key (str): The search key of the tag to check.
+
+        Returns:
+            bool: True if the tag matches the search query, otherwise False.
+        """
+        return self.__search_key in search_key
+
+    def enable_ordered_view_mode(self, enabled):
+        """Display the model directly, without a sort proxy model.
+
+        The model then keeps the rows in display order itself (see
+        _TagListModel.set_ordered), which saves the mapping tables of the
+        proxy model and sorts with cached keys rather than lessThan calls.
+
+        Args:
+            enabled (bool): Enables the ordered view mode.
+        """
+        if enabled == self.is_ordered_view_mode_enabled():
+            return
+
+        self.itemDelegate().set_hovered_index(None)
+
+        if enabled:
+            # Detach the proxy model first, so it doesn't sort again as the
+            # model sorts its rows.
+            self.setModel(self._model)
+            self._proxy_model.setSourceModel(None)
+            self._proxy_model.deleteLater()
+            self._proxy_model = None
+
+            self._model.set_ordered(True)
+        else:
+            self._model.set_ordered(False)
+            self.__setup_proxy_model()
+
+        self.sort()
+
+    def is_ordered_view_mode_enabled(self):
+        """Checks if the model is displayed without a sort proxy model. """
+        return self._proxy_model is None
 
     def enable_tag_management(self, enabled):
         """Allows editing functionality for tags within the manager.
@@ -442,12 +1526,34 @@ class _TagListViewer(QtWidgets.QListView):
         """Checks if dark mode is enabled. """
         return self.__dark_mode_enabled
 
+    def set_palette(self, palette):
+        """Sets the palette the tags are colored with.
+
+        Args:
+            palette (color_utils.Palette): Palette of the tags.
+        """
+        self.__palette = palette
+        self.viewport().update()
+
+    def get_palette(self):
+        """Returns the palette the tags are colored with. """
+        return self.__palette
+
 
 class _TagDelegate(QtWidgets.QStyledItemDelegate):
-    """Custom delegate representation of the tag/item in the viewer. """
+    """Custom delegate representation of the tag/item in the viewer.
+
+    Colors are read from the lookup table of the viewer's palette, see
+    color_utils.Palette. Label sizes and size hints are cached in the
+    vocabulary of the tags, so TagManagers sharing a vocabulary measure each
+    tag only once. Views lay out every tag whenever one is added, so size
+    hints of known tags are a single lookup.
+    """
     def __init__(self, parent=None):
         super(_TagDelegate, self).__init__(parent)
-        self.__is_hovering_delete_btn = False
+        # Index of the tag whose delete button is hovered, if any. Persistent
+        # indexes follow their row as the proxy model is sorted.
+        self.__hovered_index = QtCore.QPersistentModelIndex()
 
         self._height = 20
         self._height_padding = 2
@@ -488,16 +1594,17 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
         self._label_font.setWeight(self._label_font.Black)
         self._label_font.setKerning(False)
 
-    # TODO: Deprecate? Now that editorEvent is informing the paint method when
-    #  the cursor is hovering over the delete button, is this still needed?
-    # def __is_cursor_in_delete_button_rect(self, rect, pos):
-    #     """Checks if the cursor is within the bounds of the "Delete Tag"
-    #     button of the delegate.
-    #
-    #     Args:
-    #         rect(QtCore.QRect):
-    #     """
-    #     return self.__delete_button_rect(rect).contains(pos)
+        self._label_font_metrics = QtGui.QFontMetricsF(self._label_font)
+        self._label_sizes_key = ('label_size', self._label_font.key())
+
+        # Size hints depend on whether the delete button is shown.
+        self._size_hints_keys = {
+            enabled: ('size_hint', self._label_font.key(), enabled)
+            for enabled in (True, False)}
+
+        self._button_font = QtGui.QFont('verdana')
+        self._button_font.setBold(True)
+        self._button_font.setPointSize(10)
 
     def __delete_button_rect(self, rect):
         """Returns a custom adjusted rect for the "delete" button of the
@@ -529,7 +1636,9 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
         Custom paint implementation is used here to draw and style the item.
         """
         tag_name = index.data(DISPLAY_ROLE)
-        base_color = color_utils.get_mapped_color(text=tag_name)
+        theme = color_utils.DARK_THEME if self.is_dark_mode_enabled() else \
+            color_utils.LIGHT_THEME
+        colors = self.parent().get_palette().get_colors(tag_name, theme)
 
         # Styling.
         radius = 4
@@ -539,21 +1648,18 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
         fg_color = QtGui.QColor(QtCore.Qt.white)
         fg_color.setAlpha(235)
 
-        bg_color = color_utils.pastelize_color(base_color)
-        bg_color = color_utils.desaturate(bg_color, percent=15)
-        bg_color.setAlpha(255)
+        # Copies, since the alpha is adjusted below. The border of the dark
+        # theme is transparent.
+        bg_color = QtGui.QColor(colors.desaturated)
+        border_color = QtGui.QColor(colors.border)
 
         fg_button_color = QtGui.QColor(fg_color)
         fg_button_color.setAlpha(125)
 
-        border_color = base_color.darker(125)
-        border_color.setAlpha(255)  # Border only visible in light mode.
-
         # Dark mode: Hide the border and make the label full alpha for
         # readability.
         if self.is_dark_mode_enabled():
             fg_color.setAlpha(255)
-            border_color.setAlpha(0)  # Hide border in dark mode.
 
         # Check the item's data for SORTING_MATCH_ROLE, to determine if it
         # matches the search query. If it doesn't, make it semi-transparent.
@@ -603,26 +1709,15 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
                 self.__delete_button_rect(rect), 0, 0, QtCore.Qt.AbsoluteSize)
 
             # Draw button text.
-            font = QtGui.QFont('verdana')
-            font.setBold(True)
-            font.setPointSize(10)
-            painter.setFont(font)
-
-            # First, check if delegate/item has cursor focus (hover).
-            # Note: Skipping this step can result in false-positives,
-            # since the editorEvent is only aware of hovering while the
-            # respective item is being edited.
-            # This can fool the delegate into thinking that there's focus on
-            # the delete buttons for both the current and previous item.
-            if option.state & QtWidgets.QStyle.State_MouseOver:
-                # Now that we've determined the current item is in focus,
-                # we check if editorEvent determined the cursor is hovering
-                # over the delete button.
-                if self.__is_hovering_delete_btn:
-                    if not index.data(SORTING_MATCH_ROLE):
-                        fg_button_color.setAlpha(fg_button_color.alpha() + 50)
-                    else:
-                        fg_button_color.setAlpha(225)
+            painter.setFont(self._button_font)
+
+            # Highlight the button if the cursor is hovering over it, see
+            # set_hovered_index.
+            if self.__hovered_index == index:
+                if not index.data(SORTING_MATCH_ROLE):
+                    fg_button_color.setAlpha(fg_button_color.alpha() + 50)
+                else:
+                    fg_button_color.setAlpha(225)
 
             painter.setPen(fg_button_color)
             painter.drawText(self.__delete_button_rect(rect),
@@ -637,21 +1732,16 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
         """
         # If tag management is enabled, capture QMouseEvents for delete button.
         if self.is_tag_management_enabled():
-            if self.__delete_button_rect(option.rect).contains(event.pos()):
+            if self.is_over_delete_button(option.rect, event.pos()):
                 # Delete tag when button is pressed.
                 if event.type() == QtCore.QEvent.MouseButtonRelease:
+                    self.set_hovered_index(None)
                     self.parent().delete_tag(index.data(DISPLAY_ROLE))
                     return True
 
-                # For styling purposes, inform the painter that the cursor is
-                # moving (hovering) over the delete button.
-                if event.type() == QtCore.QEvent.MouseMove:
-                    self.__is_hovering_delete_btn = True
-                    return True
-
-            # Once event (cursor) exists delete button, disable styling.
+            # Hovering is tracked by the viewer, see
+            # _TagListViewer.mouseMoveEvent.
             else:
-                self.__is_hovering_delete_btn = False
                 return True
 
         return super(_TagDelegate, self).editorEvent(event, model, option,
@@ -662,19 +1752,36 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
 
         Custom logic re-calculates the correct size of the delegate so that
         items don't get overlapped in the viewport.
+        Sizes are computed once per tag and font, see class docstring.
         """
-        rect = QtGui.QFontMetricsF(self._label_font).boundingRect(
-            option.rect,
-            QtCore.Qt.TextSingleLine,
-            index.data(DISPLAY_ROLE)
-        )
+        viewer = self.parent()
+        vocabulary = viewer.get_vocabulary()
+        is_tag_management_enabled = viewer.is_tag_management_enabled()
+
+        size_hints = vocabulary.cache(
+            self._size_hints_keys[is_tag_management_enabled])
+        tag_id = index.data(TAG_ID_ROLE)
+        size_hint = size_hints.get(tag_id)
+
+        if size_hint is not None:
+            return size_hint
 
-        label_width = rect.width()
-        label_height = rect.height()
+        label_sizes = vocabulary.cache(self._label_sizes_key)
+        label_size = label_sizes.get(tag_id)
+
+        if label_size is None:
+            rect = self._label_font_metrics.boundingRect(
+                QtCore.QRectF(option.rect),
+                QtCore.Qt.TextSingleLine,
+                index.data(DISPLAY_ROLE)
+            )
+            label_size = label_sizes[tag_id] = (rect.width(), rect.height())
+
+        label_width, label_height = label_size
 
         # Ignore the "hidden" delete button if tag management is disabled.
         delete_btn_width = self._delete_btn_size.width() if \
-            self.is_tag_management_enabled() else 0
+            is_tag_management_enabled else 0
 
         width = self._width_padding + label_width + delete_btn_width
 
@@ -683,9 +1790,64 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
         else:
             height = self._height_padding + label_height
 
-        return QtCore.QSize(width, height)
+        size_hint = size_hints[tag_id] = QtCore.QSize(width, height)
+        return size_hint
 
     # Public.
+    def is_over_delete_button(self, rect, pos):
+        """Checks if the cursor is within the bounds of the "Delete Tag"
+        button of a tag.
+
+        Args:
+            rect (QtCore.QRect): Rect of the tag.
+            pos (QtCore.QPoint): Position of the cursor.
+
+        Returns:
+            bool: True if the cursor is over the button, otherwise False.
+        """
+        return self.is_tag_management_enabled() and \
+            self.__delete_button_rect(rect).contains(pos)
+
+    def set_hovered_index(self, index):
+        """Set the tag whose delete button the cursor is hovering over.
+
+        Only the delete buttons of the previous and the new tag are
+        repainted, and only if the hovered tag changed.
+
+        Args:
+            index (QtCore.QModelIndex): Index of the tag, or None if no
+                button is hovered.
+        """
+        hovered = QtCore.QPersistentModelIndex(index) if index is not None \
+            else QtCore.QPersistentModelIndex()
+
+        if hovered == self.__hovered_index:
+            return
+
+        previous = self.__hovered_index
+        self.__hovered_index = hovered
+
+        viewer = self.parent()
+        for persistent_index in (previous, hovered):
+            if persistent_index.isValid():
+                rect = viewer.visualRect(persistent_index.model().index(
+                    persistent_index.row(), persistent_index.column()))
+                viewer.viewport().update(self.__delete_button_rect(rect))
+
+    def get_hovered_index(self):
+        """Returns the index of the tag whose delete button the cursor is
+        hovering over, see set_hovered_index.
+
+        Returns:
+            QtCore.QModelIndex: Index of the tag, invalid if no button is
+                hovered.
+        """
+        hovered = self.__hovered_index
+        if not hovered.isValid():
+            return QtCore.QModelIndex()
+
+        return hovered.model().index(hovered.row(), hovered.column())
+
     def is_tag_management_enabled(self):
         """Checks if tag editing functionality is enabled on the parent
         viewer.
@@ -703,6 +1865,593 @@ class _TagDelegate(QtWidgets.QStyledItemDelegate):
         return self.parent().is_dark_mode_enabled()
 
 
+class _TagListModel(QtCore.QAbstractListModel):
+    """Lightweight list model of the tags, adapting a TagEngine.
+
+    The engine (see tag_engine) holds the tags, their keys, matches and
+    changes, without any Qt. The model emits the signals around the changes
+    it makes to the rows, and pages the rows from the tag store, if any.
+
+    Rows only store the ids of the tags in a TagVocabulary, so tag names
+    are resolved when the view requests them. This allows a memory-mapped
+    vocabulary to be displayed without decoding every name up-front.
+
+    Only the rows whose search match changed are updated, from the match
+    sets of the queries (see match_sets), cached for recent queries. Large
+    vocabularies can be matched by worker processes, see set_match_engine.
+
+    In ordered mode (see set_ordered), the model keeps the rows in display
+    order itself, so views don't need a sort proxy model: the rows are
+    sorted by match flag and sort key, a tag added on its own is inserted
+    at its sorted row (a binary search) and other changes sort the rows
+    again, with a single layout change.
+    """
+    # Signals.
+    tags_fetched = QtCore.Signal(list)  # Names of the tags paged in.
+
+    def __init__(self, parent=None):
+        super(_TagListModel, self).__init__(parent)
+        self.__engine = tag_engine.TagEngine()
+
+        # Unmap the vocabulary file loaded in the engine, if any, rather
+        # than waiting for the engine to be garbage-collected.
+        self.destroyed.connect(functools.partial(_close_engine, self.__engine))
+
+        # Tag store the rows are paged from, see set_store.
+        self.__store = None
+        self.__store_page_size = 0
+        self.__store_offset = 0
+        self.__store_exhausted = True
+        self.__store_is_match = None
+        self.__store_loader = None
+        self.__store_tag_manager = None
+        self.__store_fetching = False  # A page was requested, see fetchMore.
+        self.__store_token = None  # Identifies the results, see set_store.
+        self.__store_callbacks = None  # Page and query callbacks.
+
+    # Private.
+    def __detach_store(self):
+        """Stop paging from the tag store. Results of the requests still
+        running are discarded. """
+        self.__store = None
+        self.__store_offset = 0
+        self.__store_exhausted = True
+        self.__store_loader = None
+        self.__store_tag_manager = None
+        self.__store_fetching = False
+        self.__store_token = None
+        self.__store_callbacks = None
+
+    def __on_page_fetched(self, token, page):
+        """Called by the loader with a page of the store, or None if the
+        store call failed. """
+        if token is not self.__store_token:
+            return
+
+        self.__store_fetching = False
+        if page is None:
+            return
+
+        self.__store_offset += len(page)
+        self.__store_exhausted = len(page) < self.__store_page_size
+
+        added = self.add_tags(page, self.__store_is_match, commit=True)
+        self.tags_fetched.emit(added)
+
+    def __on_query_fetched(self, token, tags):
+        """Called by the loader with the tags of the store matching a
+        query, or None if the store call failed. """
+        if token is not self.__store_token or tags is None:
+            return
+
+        added = self.add_tags(tags, self.__store_is_match, commit=True)
+        if added:
+            self.tags_fetched.emit(added)
+
+    def __sort_if_needed(self):
+        """Sort the rows after their keys changed, in ordered mode, unless
+        sorting is suspended. """
+        if self.__engine.needs_sorting():
+            self.__sort()
+
+    def __sort(self):
+        """Sort the rows in display order, with a single layout change.
+
+        Persistent indexes (e.g. the hovered tag) follow their tag.
+        """
+        self.layoutAboutToBeChanged.emit()
+
+        persistent_indexes = self.persistentIndexList()
+        tag_ids = [self.__engine.tag_id(index.row())
+                   for index in persistent_indexes]
+
+        self.__engine.sort()
+
+        if persistent_indexes:
+            rows = {tag_id: row
+                    for row, tag_id in enumerate(self.__engine.rows())}
+            self.changePersistentIndexList(
+                persistent_indexes,
+                [self.index(rows[tag_id]) for tag_id in tag_ids])
+
+        self.layoutChanged.emit()
+
+    def __remove_rows(self, keep):
+        """Remove the rows of the tag ids that aren't flagged in keep, one
+        contiguous range of rows at a time.
+
+        Returns:
+            list: Names of the tags that were removed.
+        """
+        if keep is None:
+            return []
+
+        removed = []
+        name = self.__engine.vocabulary().name
+
+        # Remove the last ranges first, so the rows of the others don't move.
+        for start, end in reversed(self.__engine.removal_ranges(keep)):
+            self.beginRemoveRows(QtCore.QModelIndex(), start, end - 1)
+            tag_ids = self.__engine.remove_rows(start, end)
+            self.endRemoveRows()
+
+            removed.extend(name(tag_id) for tag_id in tag_ids)
+
+        return removed
+
+    # Inherited.
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Override the inherited rowCount method. """
+        if parent.isValid():
+            return 0
+
+        return len(self.__engine)
+
+    def data(self, index, role=DISPLAY_ROLE):
+        """Override the inherited data method.
+
+        Tag names are only resolved here, when requested by the view.
+        """
+        if not index.isValid():
+            return None
+
+        row = index.row()
+
+        if role == DISPLAY_ROLE:
+            return self.__engine.name(row)
+        elif role == SORTING_MATCH_ROLE:
+            return bool(self.__engine.is_match(row))
+        elif role == TAG_ID_ROLE:
+            return self.__engine.tag_id(row)
+
+        return None
+
+    def flags(self, index):
+        """Override the inherited flags method.
+
+        Tags can't be edited or selected.
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+
+        return QtCore.Qt.ItemIsEnabled
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        """Override the inherited canFetchMore method.
+
+        Checks if the tag store has pages that haven't been fetched yet.
+        """
+        if parent.isValid():
+            return False
+
+        return self.__store is not None and not self.__store_exhausted
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """Override the inherited fetchMore method.
+
+        Called by the view when the last rows become visible, requests the
+        next page of the tag store from the loader. The page is appended
+        when it arrives, and no other page is requested in the meantime.
+        """
+        if not self.canFetchMore(parent) or self.__store_fetching:
+            return
+
+        self.__store_fetching = True
+        self.__store_loader.fetch(self.__store_tag_manager,
+                                  self.__store_offset,
+                                  self.__store_page_size,
+                                  self.__store_callbacks[0])
+
+    # Public.
+    def engine(self):
+        """Returns the engine holding the tags of the model. """
+        return self.__engine
+
+    def tag_id(self, row):
+        """Returns the vocabulary id of the tag at the row. """
+        return self.__engine.tag_id(row)
+
+    def row_of(self, tag_id, hint=-1):
+        """Returns the row of the tag id, or -1 if it isn't in the model.
+        See tag_engine.TagEngine.row_of.
+        """
+        return self.__engine.row_of(tag_id, hint)
+
+    def sort_key(self, row):
+        """Returns the sort key of the tag at the row, for the current
+        collation (see set_collation). """
+        return self.__engine.sort_key(row)
+
+    def is_match(self, row):
+        """Checks if the tag at the row matches the search query. """
+        return self.__engine.is_match(row)
+
+    def has_tag(self, tag_name):
+        """Checks if a tag exists in the model.
+
+        Args:
+            tag_name (str): Exact name of the tag.
+
+        Returns:
+            bool: True if tag name exists, otherwise False.
+        """
+        return self.__engine.has_tag(tag_name)
+
+    def iter_tags(self):
+        """Iterate over the tag names, in model order.
+
+        Yields:
+            str: Name of each tag.
+        """
+        return self.__engine.iter_tags()
+
+    def add_tags(self, tags, is_match, commit=False):
+        """Append uniquely named tags to the model, in a single insertion.
+
+        Args:
+            tags (iterable): Names of the tags to add. Names that already
+                exist in the model are skipped.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query.
+            commit (bool): Commit the added tags, e.g. when loaded from the
+                tag store, so they aren't reported as changes.
+
+        Returns:
+            list: Names of the tags that were added.
+        """
+        added, members = self.__engine.register(tags, is_match, commit)
+
+        if not members:
+            return added
+
+        # Ordered mode: a single tag goes straight to its sorted row.
+        row = self.__engine.insertion_row(members)
+        self.beginInsertRows(QtCore.QModelIndex(), row,
+                             row + len(members) - 1)
+        self.__engine.add_rows(members)
+        self.endInsertRows()
+
+        self.__sort_if_needed()
+
+        return added
+
+    def remove_tag(self, tag_name):
+        """Remove a tag from the model, by name.
+
+        Args:
+            tag_name (str): Exact name of the tag.
+
+        Returns:
+            bool: True if the tag was removed, otherwise False.
+        """
+        if not self.has_tag(tag_name):
+            return False
+
+        row = self.__engine.row_of(self.__engine.vocabulary().find(tag_name))
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.__engine.remove_rows(row, row + 1)
+        self.endRemoveRows()
+
+        return True
+
+    def remove_tags(self, tags):
+        """Remove tags from the model, by name, one contiguous range of rows
+        at a time.
+
+        Args:
+            tags (iterable): Exact names of the tags. Names that aren't in
+                the model are skipped.
+
+        Returns:
+            list: Names of the tags that were removed.
+        """
+        return self.__remove_rows(self.__engine.keep_flags(removed_tags=tags))
+
+    def remove_matching(self, is_match):
+        """Remove the tags matching a search query, one contiguous range of
+        rows at a time.
+
+        Only the rows of the model are searched, so tags of the tag store
+        that weren't fetched yet are kept.
+
+        Args:
+            is_match (callable): Returns True if the search key of a tag
+                matches the query.
+
+        Returns:
+            list: Names of the tags that were removed.
+        """
+        return self.__remove_rows(self.__engine.keep_flags(
+            is_removed=is_match))
+
+    def sync_tags(self, tags, is_match):
+        """Update the model to hold exactly the given tags.
+
+        Only the differences are applied: rows of removed tags are removed
+        one contiguous range at a time and new tags are appended, while the
+        rows of the other tags are left untouched. The tag store, if any, is
+        detached.
+
+        Args:
+            tags (iterable): Names of all the tags the model should hold.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query.
+
+        Returns:
+            tuple: Lists of the tag names that were added and removed.
+        """
+        self.__detach_store()
+
+        keep, new_tags = self.__engine.diff(tags)
+        removed = self.__remove_rows(keep)
+        added = self.add_tags(new_tags, is_match)
+        self.commit()
+
+        return added, removed
+
+    def vocabulary(self):
+        """Returns the vocabulary the tags are stored in. """
+        return self.__engine.vocabulary()
+
+    def collation(self):
+        """Returns the collation the tags are sorted by. """
+        return self.__engine.collation()
+
+    def set_collation(self, collation, locale=None):
+        """Set the collation of the sort keys, see sort_key.
+
+        Rows aren't re-sorted, that's up to the proxy model, unless in
+        ordered mode.
+
+        Args:
+            collation (str): One of tag_keys.COLLATIONS.
+            locale (QtCore.QLocale): Locale of LOCALE_COLLATION. The default
+                locale if omitted.
+        """
+        if collation == tag_keys.LOCALE_COLLATION:
+            locale = locale if locale is not None else QtCore.QLocale()
+            collator = QtCore.QCollator(locale)
+            collator.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+            self.__engine.set_collation(collation, collator.sortKey,
+                                        locale.name())
+        else:
+            self.__engine.set_collation(collation)
+
+        self.__sort_if_needed()
+
+    def set_vocabulary(self, vocabulary, is_match):
+        """Store the tags in another vocabulary, e.g. one shared with other
+        models. The tags of the model are kept, in the same order.
+
+        Args:
+            vocabulary (tag_vocabulary.TagVocabulary): Vocabulary to use.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query.
+        """
+        self.beginResetModel()
+        self.__engine.set_vocabulary(vocabulary, is_match)
+        self.endResetModel()
+
+        self.__sort_if_needed()
+
+    def tag_store(self):
+        """Returns the tag store the rows are paged from, if any. """
+        return self.__store
+
+    def set_store(self, store, page_size, is_match, loader=None,
+                  tag_manager=None):
+        """Page the rows from a tag store, instead of holding every tag.
+
+        The existing tags are removed. Pages are fetched as the view
+        requests them (see fetchMore), in the store's display order.
+
+        Args:
+            store (tag_store.TagStore): Store to page from, or None.
+            page_size (int): Number of tags fetched at once.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query.
+            loader (tag_loader.TagLoader): Loader running the store calls
+                on its worker thread. Required with a store.
+            tag_manager (TagManager): TagManager the tags are fetched for,
+                see TagLoader.fetch.
+        """
+        self.clear()
+        if store is None:
+            return
+
+        self.__store = store
+        self.__store_page_size = page_size
+        self.__store_exhausted = False
+        self.__store_is_match = is_match
+        self.__store_loader = loader
+        self.__store_tag_manager = tag_manager
+
+        # Results of the requests made for a previous store are discarded.
+        self.__store_token = object()
+        self.__store_callbacks = (
+            functools.partial(self.__on_page_fetched, self.__store_token),
+            functools.partial(self.__on_query_fetched, self.__store_token))
+
+    def fetch_query(self, text):
+        """Fetch the first page of tags matching the text from the tag store,
+        so that searching isn't limited to the pages fetched so far.
+
+        The tags are added when the loader hands them back. Queries typed
+        in the meantime replace the ones that haven't started yet.
+
+        Args:
+            text (str): Text to search for.
+        """
+        if self.__store is None or not text:
+            return
+
+        self.__store_loader.query(self.__store_tag_manager, text,
+                                  self.__store_page_size,
+                                  self.__store_callbacks[1])
+
+    def load_vocabulary(self, mapped, is_match=None):
+        """Replace the tags of the model with a memory-mapped vocabulary.
+
+        Rows are created in the stored display order, without decoding the
+        tag names.
+
+        Args:
+            mapped (mapped_vocabulary.MappedVocabulary): Vocabulary to load.
+            is_match (callable): Returns True if the search key of a tag
+                matches the current search query. If omitted, every tag
+                matches.
+        """
+        self.beginResetModel()
+
+        self.__detach_store()
+        self.__engine.load_vocabulary(mapped, is_match)
+
+        self.endResetModel()
+
+    def find_matches(self, is_match, query=None):
+        """Returns the match set of a search query, over the tags of the
+        model. See tag_engine.TagEngine.find_matches.
+        """
+        return self.__engine.find_matches(is_match, query)
+
+    def match_engine(self):
+        """Returns the engine matching the search queries, if any. """
+        return self.__engine.match_engine()
+
+    def set_match_engine(self, engine):
+        """Match the search queries with an engine, see
+        tag_engine.TagEngine.set_match_engine.
+
+        Args:
+            engine (match_engine.MatchEngine): Engine to use, or None.
+        """
+        self.__engine.set_match_engine(engine)
+
+    def count_match_changes(self, match_set):
+        """Returns the number of tags whose match flag would change, if the
+        match set was set (see set_matches). """
+        return self.__engine.count_match_changes(match_set)
+
+    def set_matches(self, match_set):
+        """Update the search match flags of the tags, from a match set.
+
+        Only the rows whose match flag changed are updated, one contiguous
+        range at a time.
+
+        Args:
+            match_set (int): The match set, see find_matches.
+
+        Returns:
+            int: Number of rows whose match flag changed.
+        """
+        rows, matches = self.__engine.changed_match_rows(match_set)
+
+        if not rows:
+            return 0
+
+        # Ordered mode: the rows are sorted again (a layout change) anyway.
+        if self.__engine.is_ordered():
+            self.__engine.set_match_flags(matches)
+            self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]))
+            self.__sort_if_needed()
+
+            return len(rows)
+
+        # Flags are changed one range at a time, right before it's signaled:
+        # the sort proxy model moves the rows of each range in turn, by
+        # binary search over the rows it didn't get signaled yet.
+        first = last = rows[0]
+
+        for row in itertools.chain(rows[1:], [None]):
+            if row == last + 1:
+                last = row
+                continue
+
+            self.__engine.set_match_flags(matches, first, last + 1)
+            self.dataChanged.emit(self.index(first), self.index(last))
+
+            first = last = row
+
+        self.__engine.set_match_flags(matches)
+
+        return len(rows)
+
+    def clear(self):
+        """Remove all tags from the model and stop paging from the tag store.
+
+        The vocabulary is kept, since it might be shared.
+        """
+        self.beginResetModel()
+        self.__detach_store()
+        self.__engine.clear()
+        self.endResetModel()
+
+    def get_changes(self):
+        """Returns the tags added and removed since the last commit.
+
+        Returns:
+            tuple: Sets of the tag names added and removed.
+        """
+        return self.__engine.get_changes()
+
+    def has_changes(self):
+        """Checks if tags were added or removed since the last commit. """
+        return self.__engine.has_changes()
+
+    def commit(self):
+        """Mark the current tags as the checkpoint changes are tracked from.
+        """
+        self.__engine.commit()
+
+    def is_ordered(self):
+        """Checks if the model keeps the rows in display order itself. """
+        return self.__engine.is_ordered()
+
+    def set_ordered(self, ordered):
+        """Keep the rows in display order, instead of a sort proxy model.
+
+        Rows keep their current order until sort_rows is called.
+
+        Args:
+            ordered (bool): Keep the rows in display order.
+        """
+        self.__engine.set_ordered(ordered)
+
+    def suspend_sorting(self):
+        """Stop sorting rows as they're inserted or changed in ordered mode,
+        until sort_rows is called. See _TagListProxyModel.suspend_sorting.
+        """
+        self.__engine.suspend_sorting()
+
+    def sort_rows(self):
+        """Sort the rows in ordered mode, unless they already are, and keep
+        them sorted as they're inserted or changed.
+        """
+        self.__engine.resume_sorting()
+        self.__sort_if_needed()
+
+
 class _TagListProxyModel(QtCore.QSortFilterProxyModel):
     """Custom model for sorting and filtering.
 
@@ -735,38 +2484,12 @@ class _TagListProxyModel(QtCore.QSortFilterProxyModel):
         super(_TagListProxyModel, self).__init__(parent)
         self.setSortRole(DISPLAY_ROLE)
 
-        # DynamicSortFilter can't be True when updating source model via proxy.
-        # Since we need to do this (item_matches_query) to inform the source
-        # model when an item matches the search criteria (for delegate
-        # styling), let's disable it.
-        self.setDynamicSortFilter(False)
-
-        self.__search_query_regex = QtCore.QRegExp(
-            '.*',
-            QtCore.Qt.CaseInsensitive,
-            QtCore.QRegExp.RegExp
-        )
+        # Once sorted, new rows are inserted in sorted position (a binary
+        # search), so a few tags can be added without re-sorting all rows.
+        # Bulk changes suspend it, see suspend_sorting.
+        self.setDynamicSortFilter(True)
 
     # Inherited.
-    def sort(self, column, order=QtCore.Qt.AscendingOrder):
-        """Override the inherited sort method.
-
-        Most of the time tags will be added to the viewer manually using
-        the InputEditor, which triggers the textChanged signal and calls
-        sort_by_match.
-        Adding tags directly to TagListViewer skips sort_by_match and it also
-        doesn't trigger lessThan, since only 1 item exists in the list.
-
-        As a result SORTING_MATCH_ROLE won't be updated and the delegate
-        will be painted incorrectly.
-        To get around this, we can force sort_by_match to trigger when the
-        model only contains 1 item.
-        """
-        super(_TagListProxyModel, self).sort(column, order)
-
-        if self.rowCount() == 1:
-            self.sort_by_match('')
-
     def lessThan(self, left, right):
         """Override the inherited lessThan method.
 
@@ -777,22 +2500,14 @@ class _TagListProxyModel(QtCore.QSortFilterProxyModel):
 
         See class docstring for more details.
         """
-        # Get the items from the source modules.
-        l_item = self.sourceModel().itemFromIndex(left)
-        r_item = self.sourceModel().itemFromIndex(right)
-
-        # Get the values from the item.
-        # Ascii comparisons will prioritize uppercase over lowercase,
-        # which can mess up our intended order.
-        # We don't want this, so let's force a lowercase comparison instead.
-        # E.g. Original list: ['cat', 'con', 'Zoo', 'Cave']
-        #   - Incorrect sort (mixed case): ['Cave', 'Zoo', 'cat', 'con']
-        #   - Correct sort (forced lowercase): ['cat', 'Cave', 'con', 'Zoo']
-        l_data = l_item.data(DISPLAY_ROLE).lower()
-        r_data = r_item.data(DISPLAY_ROLE).lower()
+        model = self.sourceModel()
+        l_row = left.row()
+        r_row = right.row()
 
-        is_l_match = self.__is_match_for_search_query(l_item)
-        is_r_match = self.__is_match_for_search_query(r_item)
+        # Match flags are stored on the source model by the viewer, see
+        # _TagListViewer.sort_tags_by_search_criteria.
+        is_l_match = model.is_match(l_row)
+        is_r_match = model.is_match(r_row)
 
         # Left items matching search pattern will always be less than
         # non-matching right items.
@@ -808,71 +2523,24 @@ class _TagListProxyModel(QtCore.QSortFilterProxyModel):
             return False
 
         # Now that priorities have been established, all other comparisons are
-        # sorted in ascending order.
-        return l_data < r_data
-
-    # Private.
-    def __is_match_for_search_query(self, item):
-        """Checks the item against the search regex, to determine if it's a
-        match.
-
-        Sets the data on the item so it's available to the delegate for
-        styling.
-
-        Note:
-            Initially there was a signal being emitted here, to notify the
-            associated QListView that a comparison was performed.
-            Unfortunately, due to the frequency of comparisons performed
-            with larger data sets, this put a significant strain on the
-            event loop and overall performance.
-            Now I'm updating the item data directly in the proxy.
-
-        Args:
-            item (QtGui.QStandardItem): The current item being compared.
-
-        Returns:
-            bool: True if item matches search regex, otherwise False.
-        """
-        data = item.data(DISPLAY_ROLE).lower()
-        is_match = self.__search_query_regex.exactMatch(data)
-
-        # Set the sorting role data on the item, so it's available to the
-        # delegate for styling.
-        item.setData(is_match, SORTING_MATCH_ROLE)
-
-        return is_match
+        # sorted in ascending order, case-insensitively (see tag_keys).
+        return model.sort_key(l_row) < model.sort_key(r_row)
 
     # Public.
-    def sort_by_match(self, search_text):
-        """Sort the proxy model with the provided text.
-
-        Args:
-            search_text (str): The text pattern to sort tags by.
-
+    def suspend_sorting(self):
+        """Stop sorting rows as they're inserted or changed, until sort_rows
+        is called. Rows changed in bulk are then sorted once, rather than one
+        at a time.
         """
-        # Make sure any Regex special characters are escaped.
-        search_text = self.__search_query_regex.escape(search_text)
-
-        # Search pattern to find tags is a fixed word anywhere in the string.
-        # I'm intentionally enforcing wildcards as I want to find any
-        # matching text within a tag.
-        search_pattern = '.*{pat}.*'.format(pat=search_text) if search_text \
-            else '.*'
-
-        self.__search_query_regex.setPattern(search_pattern)
+        self.setDynamicSortFilter(False)
 
-        # Start sorting: Sorting won't trigger lessThan, unless more than one
-        # item exists in the model.
-        # Since delegate painting relies on SORTING_MATCH_ROLE, we need to
-        # account for single item models, so that searching re-paints the
-        # delegate appropriately. Otherwise the item's SORTING_MATCH_ROLE
-        # will stay False until a second item is added and allows lessThan
-        # to trigger.
-        self.invalidate()
-        if self.rowCount() == 1:
-            src_index = self.mapToSource(self.index(0, 0))
-            item = self.sourceModel().itemFromIndex(src_index)
+    def sort_rows(self):
+        """Sort the rows, unless they already are, and keep them sorted as
+        they're inserted or changed.
+        """
+        if not self.dynamicSortFilter():
+            # Re-sorts the rows, unless the source order is displayed.
+            self.setDynamicSortFilter(True)
 
-            self.__is_match_for_search_query(item)
-        else:
+        if self.sortColumn() != 0:
             self.sort(0)
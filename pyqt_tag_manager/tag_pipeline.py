@@ -0,0 +1,159 @@
+"""Pipeline stages for raw tag streams, before they're added in bulk.
+
+Tags harvested from shot metadata come by the tens of millions, with the
+same names repeated in every case and compatibility form ('Tree', 'TREE',
+'ｔｒｅｅ'). Normalizing them (casefold and NFKC, see tag_keys.search_key)
+one at a time before adding them takes minutes, so this stage spreads the
+work over a pool of worker processes:
+    - The stream is split into chunks, consumed lazily. Only a few chunks
+      per worker are in flight at once, so memory stays bounded.
+    - Each worker strips, normalizes and deduplicates its chunk locally,
+      and returns the keys of the first occurrences.
+    - Chunks are merged in stream order into the global unique set, so each
+      tag keeps the display casing it was first seen with.
+
+Unique tags are yielded chunk by chunk, ready for the bulk insert (e.g.
+TagManager.add_tags), with a progress callback.
+
+This module doesn't depend on Qt.
+
+Usage:
+    >>> for chunk in iter_unique_chunks(tag_io.read_tags('harvest.txt'),
+    >>>                                 progress=print):
+    >>>     tag_manager.add_tags(chunk)
+
+"""
+# Import built-in modules.
+import collections
+import itertools
+import multiprocessing
+import operator
+import os
+
+# Import local modules.
+from pyqt_tag_manager import tag_io
+from pyqt_tag_manager import tag_keys
+
+
+# Constants.
+EXACT_DEDUPE = 'exact'  # Only identical names are duplicates, like add_tags.
+NORMALIZED_DEDUPE = 'normalized'  # Names with the same search key are.
+DEDUPE_MODES = (EXACT_DEDUPE, NORMALIZED_DEDUPE)
+
+_PENDING_CHUNKS_PER_PROCESS = 2
+
+
+# Private.
+def _dedupe_chunk(names, mode):
+    """Deduplicate a chunk of names, in a worker process.
+
+    Names are stripped and empty names skipped.
+
+    Args:
+        names (list): Names of the chunk, in stream order.
+        mode (str): What makes names duplicates, one of DEDUPE_MODES.
+
+    Returns:
+        tuple: Keys of the first occurrences, in stream order, and their
+            index in the chunk.
+    """
+    names = list(map(str.strip, names))
+    keys = list(map(tag_keys.search_key, names)) \
+        if mode == NORMALIZED_DEDUPE else names
+
+    # Keys are stored in reverse, so the index kept for each key is the one
+    # of its first occurrence.
+    first_indexes = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+    first_indexes.pop('', None)  # Empty names.
+
+    firsts = sorted(first_indexes.items(), key=operator.itemgetter(1))
+    return [key for key, _ in firsts], [index for _, index in firsts]
+
+
+def _iter_deduped_chunks(tags, mode, processes, chunk_size):
+    """Iterate over the chunks of a stream and their local deduplication
+    (see _dedupe_chunk), in stream order. """
+    chunks = tag_io.iter_chunks(tags, chunk_size)
+
+    if processes == 0:
+        for chunk in chunks:
+            yield chunk, _dedupe_chunk(chunk, mode)
+        return
+
+    # Workers are spawned, rather than forked from a process that may be
+    # running threads (e.g. a Qt application).
+    pool = multiprocessing.get_context('spawn').Pool(processes)
+    pending = collections.deque()  # (chunk, async result), in stream order.
+
+    try:
+        for chunk in chunks:
+            pending.append((chunk, pool.apply_async(_dedupe_chunk,
+                                                    (chunk, mode))))
+
+            if len(pending) >= processes * _PENDING_CHUNKS_PER_PROCESS:
+                chunk, result = pending.popleft()
+                yield chunk, result.get()
+
+        while pending:
+            chunk, result = pending.popleft()
+            yield chunk, result.get()
+
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+# Public.
+def iter_unique_chunks(tags, mode=NORMALIZED_DEDUPE, processes=None,
+                       chunk_size=50000, progress=None):
+    """Iterate over the unique tags of a stream, chunk by chunk.
+
+    Args:
+        tags (iterable): Raw tag names, consumed lazily.
+        mode (str): What makes names duplicates, one of DEDUPE_MODES.
+        processes (int): Number of worker processes. Defaults to the number
+            of CPUs. Zero processes the chunks in-process.
+        chunk_size (int): Number of raw names per chunk.
+        progress (callable): Called after each chunk with the number of
+            names read and the number of unique tags so far.
+
+    Yields:
+        list: Names of the tags first seen in each chunk, stripped and in
+            their first-seen display casing. Chunks without new tags are
+            skipped.
+    """
+    if mode not in DEDUPE_MODES:
+        raise ValueError('Unsupported dedupe mode {mode!r}, expected one of '
+                         '{modes!r}'.format(mode=mode, modes=DEDUPE_MODES))
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    seen = set()
+    read_count = unique_count = 0
+
+    for chunk, (keys, indexes) in _iter_deduped_chunks(tags, mode, processes,
+                                                       chunk_size):
+        unique = [chunk[index].strip()
+                  for key, index in zip(keys, indexes) if key not in seen]
+        seen.update(keys)
+
+        read_count += len(chunk)
+        unique_count += len(unique)
+
+        if progress is not None:
+            progress(read_count, unique_count)
+
+        if unique:
+            yield unique
+
+
+def unique_tags(tags, mode=NORMALIZED_DEDUPE, processes=None,
+                chunk_size=50000, progress=None):
+    """Returns the unique tags of a stream, see iter_unique_chunks.
+
+    Returns:
+        list: Names of the unique tags, in first-seen order.
+    """
+    return list(itertools.chain.from_iterable(iter_unique_chunks(
+        tags, mode, processes, chunk_size, progress)))
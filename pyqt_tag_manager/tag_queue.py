@@ -0,0 +1,224 @@
+"""Thread-safe queue of tags discovered by producers on worker threads.
+
+Qt widgets may only be touched from the GUI thread, and marshaling every
+tag through a queued signal floods the event loop. Producers (e.g. asset
+scanners) push their tags to a TagQueue instead, from any thread, and the
+TagManager it's attached to drains it from the GUI thread, in time-budgeted
+batches (see TagManager.set_ingestion_queue).
+
+The queue is bounded, so producers can't outrun the GUI: once it holds
+max_size tags, put blocks until batches are drained (or fails, when not
+blocking). Depth and throughput are reported by stats, e.g. to tune the
+bound or to show a backlog indicator.
+
+This module doesn't depend on Qt.
+
+Usage:
+    >>> queue = TagQueue(max_size=100000)
+    >>> tag_manager.set_ingestion_queue(queue)
+    >>>
+    >>> # On any thread.
+    >>> queue.put(scanned_tags)
+
+"""
+# Import built-in modules.
+import collections
+import threading
+import time
+
+
+# Constants.
+# Snapshot of the metrics of a queue, see TagQueue.stats.
+TagQueueStats = collections.namedtuple('TagQueueStats', [
+    'depth',  # Number of tags waiting to be drained.
+    'peak_depth',  # Highest depth reached.
+    'put_count',  # Number of tags accepted.
+    'take_count',  # Number of tags drained.
+    'rejected_count',  # Number of tags refused: queue full or closed.
+    'blocked_count',  # Number of puts that had to wait for room.
+    'blocked_time',  # Seconds spent waiting for room, by all producers.
+])
+
+
+class TagQueue(object):
+    """Bounded queue of tag names, shared by producer threads and a single
+    consumer.
+
+    Tags are queued in the chunks they're put in, and chunks are only split
+    when taking them, so pushing a batch of tags costs a single lock.
+
+    Note:
+        A put is accepted as a whole once there's room, so the depth can
+        exceed max_size by up to one chunk. Chunks larger than the queue
+        itself can still be put.
+    """
+    def __init__(self, max_size=100000):
+        if max_size < 1:
+            raise ValueError('Unsupported max size {size!r}, expected a '
+                             'positive number of tags'.format(size=max_size))
+
+        self.__max_size = max_size
+        self.__chunks = collections.deque()
+        self.__offset = 0  # Tags of the first chunk already taken.
+        self.__depth = 0
+        self.__closed = False
+        self.__listener = None
+        self.__notifying = 0  # Listener calls in progress.
+
+        self.__peak_depth = 0
+        self.__put_count = 0
+        self.__take_count = 0
+        self.__rejected_count = 0
+        self.__blocked_count = 0
+        self.__blocked_time = 0.0
+
+        self.__lock = threading.Lock()
+        self.__not_full = threading.Condition(self.__lock)
+        self.__notified = threading.Condition(self.__lock)
+
+    def __len__(self):
+        with self.__lock:
+            return self.__depth
+
+    # Public.
+    def max_size(self):
+        """Returns the number of tags from which producers are held back. """
+        return self.__max_size
+
+    def is_full(self):
+        """Checks if a put would block (or fail) right now. """
+        with self.__lock:
+            return self.__depth >= self.__max_size
+
+    def is_closed(self):
+        """Checks if the queue was closed, see close. """
+        with self.__lock:
+            return self.__closed
+
+    def set_listener(self, listener):
+        """Set the callable notified when tags are put in an empty queue.
+
+        The listener is called on the producer's thread, outside of the
+        lock, so it should only wake the consumer up (e.g. emit a signal
+        queued to the GUI thread). It isn't called again until the queue was
+        drained empty, so a busy queue doesn't flood the consumer.
+
+        This waits for the calls of the previous listener in progress, so
+        it's never called once this returns, e.g. when its owner is about to
+        be deleted. It must not be called from a listener.
+
+        Args:
+            listener (callable): Called without arguments, or None.
+        """
+        with self.__lock:
+            self.__listener = listener
+            self.__notified.wait_for(lambda: not self.__notifying)
+
+    def put(self, tags, block=True, timeout=None):
+        """Queue tag names, from any thread.
+
+        Args:
+            tags (iterable): Names of the tags to queue.
+            block (bool): Wait for room while the queue is full. Otherwise,
+                fail right away.
+            timeout (float): Maximum number of seconds to wait for room,
+                forever if None.
+
+        Returns:
+            bool: True if the tags were queued, False if the queue stayed
+                full or is closed.
+        """
+        tags = list(tags)
+        if not tags:
+            return True
+
+        with self.__lock:
+            if self.__depth >= self.__max_size and not self.__closed:
+                if not block:
+                    self.__rejected_count += len(tags)
+                    return False
+
+                self.__blocked_count += 1
+                start = time.perf_counter()
+                self.__not_full.wait_for(
+                    lambda: self.__depth < self.__max_size or self.__closed,
+                    timeout)
+                self.__blocked_time += time.perf_counter() - start
+
+            if self.__closed or self.__depth >= self.__max_size:
+                self.__rejected_count += len(tags)
+                return False
+
+            was_empty = not self.__depth
+            self.__chunks.append(tags)
+            self.__depth += len(tags)
+            self.__put_count += len(tags)
+            self.__peak_depth = max(self.__peak_depth, self.__depth)
+            listener = self.__listener if was_empty else None
+            if listener is not None:
+                self.__notifying += 1
+
+        if listener is not None:
+            try:
+                listener()
+            finally:
+                with self.__lock:
+                    self.__notifying -= 1
+                    if not self.__notifying:
+                        self.__notified.notify_all()
+
+        return True
+
+    def take(self, max_count):
+        """Take the oldest queued tags, without blocking. Meant for the
+        consumer.
+
+        Args:
+            max_count (int): Maximum number of tags to take.
+
+        Returns:
+            list: Names of the tags taken, in the order they were put. Empty
+                if the queue is empty.
+        """
+        taken = []
+
+        with self.__lock:
+            while self.__chunks and len(taken) < max_count:
+                chunk = self.__chunks[0]
+                end = self.__offset + max_count - len(taken)
+                taken.extend(chunk[self.__offset:end])
+
+                if end < len(chunk):
+                    self.__offset = end
+                else:
+                    self.__chunks.popleft()
+                    self.__offset = 0
+
+            self.__depth -= len(taken)
+            self.__take_count += len(taken)
+
+            if taken and self.__depth < self.__max_size:
+                self.__not_full.notify_all()
+
+        return taken
+
+    def close(self):
+        """Refuse any further tags and release the blocked producers.
+
+        Tags already queued can still be taken.
+        """
+        with self.__lock:
+            self.__closed = True
+            self.__not_full.notify_all()
+
+    def stats(self):
+        """Returns the metrics of the queue, see TagQueueStats. """
+        with self.__lock:
+            return TagQueueStats(
+                depth=self.__depth,
+                peak_depth=self.__peak_depth,
+                put_count=self.__put_count,
+                take_count=self.__take_count,
+                rejected_count=self.__rejected_count,
+                blocked_count=self.__blocked_count,
+                blocked_time=self.__blocked_time)
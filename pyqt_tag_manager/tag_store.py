@@ -0,0 +1,454 @@
+"""Tag store backends, the databases tags are fetched from and published to.
+
+TagStore defines the interface used by the TagManager; SQLiteTagStore is
+the reference implementation.
+
+Stores return tags in display order (see tag_keys.sort_key), so pages
+fetched one after the other can be appended to the TagManager as they are.
+Queries match the search keys of the tags (see tag_keys.search_key), like
+the TagManager does, so a search finds the same tags in either.
+
+Usage:
+    >>> store = SQLiteTagStore('tags.db')
+    >>> store.add(['cat', 'car', 'zoo'])
+    >>> store.query('ca', mode=PREFIX_QUERY)
+    ['car', 'cat']
+    >>>
+    >>> tag_manager.set_tag_store(store)  # Pages tags in lazily.
+
+"""
+# Import built-in modules.
+import contextlib
+import itertools
+import queue
+import sqlite3
+import threading
+
+# Import local modules.
+from pyqt_tag_manager import tag_keys
+
+
+# Constants.
+PREFIX_QUERY = 'prefix'
+SUBSTRING_QUERY = 'substring'
+QUERY_MODES = (PREFIX_QUERY, SUBSTRING_QUERY)
+
+# Sorts after any character, used as the upper bound of prefix ranges.
+_MAX_CHARACTER = chr(0x10FFFF)
+
+
+class TagStore(object):
+    """Interface of a tag store.
+
+    Subclasses implement count, fetch, query, add, remove and publish.
+    The other methods are built on top of those.
+    """
+    # Public.
+    def count(self):
+        """Returns the number of tags in the store. """
+        raise NotImplementedError
+
+    def fetch(self, offset=0, limit=None):
+        """Fetch a page of tags, in display order.
+
+        Args:
+            offset (int): Number of tags to skip.
+            limit (int): Maximum number of tags to return. All remaining
+                tags if omitted.
+
+        Returns:
+            list: Tag names.
+        """
+        raise NotImplementedError
+
+    def query(self, text, mode=SUBSTRING_QUERY, limit=None):
+        """Fetch the tags matching the text, in display order.
+
+        Text and tags are compared by search key: case-insensitively, and
+        compatibility characters as their plain equivalent (e.g. 'ｆｉ').
+
+        Args:
+            text (str): Text to search for.
+            mode (str): One of QUERY_MODES.
+            limit (int): Maximum number of tags to return.
+
+        Returns:
+            list: Tag names.
+        """
+        raise NotImplementedError
+
+    def add(self, tags):
+        """Add tags to the store. Existing tags are skipped.
+
+        Args:
+            tags (iterable): Names of the tags to add.
+
+        Returns:
+            int: Number of tags added.
+        """
+        raise NotImplementedError
+
+    def remove(self, tags):
+        """Remove tags from the store. Missing tags are skipped.
+
+        Args:
+            tags (iterable): Names of the tags to remove.
+
+        Returns:
+            int: Number of tags removed.
+        """
+        raise NotImplementedError
+
+    def publish(self, added=(), removed=()):
+        """Apply a diff to the store, atomically.
+
+        Args:
+            added (iterable): Names of the tags to add.
+            removed (iterable): Names of the tags to remove.
+
+        Returns:
+            tuple: Number of tags added and removed.
+        """
+        raise NotImplementedError
+
+    def iter_tags(self, page_size=1000):
+        """Iterate over every tag, in display order, one page at a time.
+
+        Args:
+            page_size (int): Number of tags fetched at once.
+
+        Yields:
+            str: Tag names.
+        """
+        for offset in itertools.count(0, page_size):
+            page = self.fetch(offset, page_size)
+            for tag_name in page:
+                yield tag_name
+
+            if len(page) < page_size:
+                return
+
+    def replace_all(self, tags):
+        """Replace the content of the store with the tags, only writing the
+        differences.
+
+        Args:
+            tags (iterable): Names of all the tags the store should contain.
+
+        Returns:
+            tuple: Number of tags added and removed.
+        """
+        tags = set(tags)
+        existing = set(self.iter_tags())
+
+        return self.publish(added=tags - existing, removed=existing - tags)
+
+    def close(self):
+        """Release the resources held by the store. """
+
+
+class SQLiteTagStore(TagStore):
+    """Tag store backed by an SQLite database.
+
+    Tags are indexed by their sort key, which serves the display order, and
+    by their search key, which serves prefix queries. Substring queries use
+    an FTS5 trigram index of the search keys when SQLite supports it, and
+    fall back to a scan otherwise.
+
+    Connections are pooled and can be used from any thread. Writes are
+    serialized and batched in transactions of `batch_size` rows, and the FTS
+    index is updated once per batch rather than once per row.
+
+    Args:
+        path (str): Path of the database. ':memory:' creates a private
+            in-memory database, served by a single connection.
+        pool_size (int): Maximum number of pooled connections.
+        batch_size (int): Number of rows written per statement batch.
+        timeout (float): Seconds to wait for a connection or a locked
+            database.
+    """
+    def __init__(self, path=':memory:', pool_size=4, batch_size=5000,
+                 timeout=30.0):
+        self.path = path
+        self.batch_size = batch_size
+
+        self.__timeout = timeout
+        self.__closed = False
+        self.__write_lock = threading.Lock()
+
+        # In-memory databases are private to their connection, so they can
+        # only be served by one.
+        self.__pool_size = 1 if path == ':memory:' else pool_size
+        self.__pool = queue.LifoQueue()
+        self.__connections = []
+        self.__pool_lock = threading.Lock()
+
+        with self.__connection() as connection:
+            self.__has_fts = self.__create_schema(connection)
+
+    # Private.
+    def __connect(self):
+        connection = sqlite3.connect(self.path,
+                                     timeout=self.__timeout,
+                                     check_same_thread=False,
+                                     isolation_level=None)
+
+        if self.path != ':memory:':
+            # Readers don't block writers (and vice versa) with WAL.
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+
+        return connection
+
+    @contextlib.contextmanager
+    def __connection(self):
+        """Borrow a connection from the pool.
+
+        Connections are created on demand, up to the pool size. Once they're
+        all borrowed, this waits for one to be returned.
+        """
+        if self.__closed:
+            raise RuntimeError('Tag store {path!r} is closed.'.format(
+                path=self.path))
+
+        try:
+            connection = self.__pool.get_nowait()
+
+        except queue.Empty:
+            with self.__pool_lock:
+                create = len(self.__connections) < self.__pool_size
+                if create:
+                    connection = self.__connect()
+                    self.__connections.append(connection)
+
+            if not create:
+                try:
+                    connection = self.__pool.get(timeout=self.__timeout)
+                except queue.Empty:
+                    raise RuntimeError('Timed out waiting for a connection to '
+                                       '{path!r}.'.format(path=self.path))
+
+        try:
+            yield connection
+        finally:
+            self.__pool.put(connection)
+
+    @contextlib.contextmanager
+    def __transaction(self):
+        """Borrow a connection and run the statements in one write
+        transaction. """
+        with self.__write_lock, self.__connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            else:
+                connection.execute('COMMIT')
+
+    def __create_schema(self, connection):
+        """Create the tables and indexes, if they don't exist, in a single
+        transaction.
+
+        Returns:
+            bool: True if the FTS5 trigram index is available.
+        """
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            has_fts = self.__create_tables(connection)
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+        return has_fts
+
+    def __create_tables(self, connection):
+        connection.execute('''
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                sort_key TEXT NOT NULL,
+                search_key TEXT NOT NULL
+            )
+        ''')
+
+        # Databases created before search keys were stored.
+        columns = [row[1] for row in
+                   connection.execute('PRAGMA table_info(tags)')]
+        if 'search_key' not in columns:
+            connection.create_function('tag_search_key', 1,
+                                       tag_keys.search_key,
+                                       deterministic=True)
+            connection.execute("ALTER TABLE tags ADD COLUMN search_key TEXT "
+                               "NOT NULL DEFAULT ''")
+            connection.execute('UPDATE tags SET '
+                               'search_key = tag_search_key(name)')
+
+        connection.execute('CREATE INDEX IF NOT EXISTS tags_sort_key '
+                           'ON tags (sort_key, name)')
+        connection.execute('CREATE INDEX IF NOT EXISTS tags_search_key '
+                           'ON tags (search_key)')
+
+        try:
+            # Indexes created before search keys were stored indexed the
+            # sort keys, they're rebuilt.
+            fts_columns = [row[1] for row in
+                           connection.execute('PRAGMA table_info(tags_fts)')]
+            if fts_columns and 'search_key' not in fts_columns:
+                connection.execute('DROP TABLE tags_fts')
+
+            connection.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS tags_fts USING fts5 (
+                    search_key, content='tags', content_rowid='id',
+                    tokenize='trigram'
+                )
+            ''')
+
+            if fts_columns != ['search_key']:
+                connection.execute(
+                    "INSERT INTO tags_fts (tags_fts) VALUES ('rebuild')")
+
+        # FTS5 or its trigram tokenizer (SQLite 3.34+) is unavailable.
+        except sqlite3.OperationalError:
+            return False
+
+        return True
+
+    def __row(self, tag_name):
+        sort_key = tag_keys.sort_key(tag_name)
+        return tag_name, sort_key, tag_keys.normalize_sort_key(sort_key)
+
+    def __add(self, connection, tags):
+        count = 0
+        rows = (self.__row(tag_name) for tag_name in tags if tag_name)
+
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                return count
+
+            last_id = connection.execute(
+                'SELECT IFNULL(MAX(id), 0) FROM tags').fetchone()[0]
+
+            # The row count excludes the ignored (existing) tags.
+            added = connection.executemany(
+                'INSERT OR IGNORE INTO tags (name, sort_key, search_key) '
+                'VALUES (?, ?, ?)', batch).rowcount
+
+            # New rows get increasing ids, index them all at once.
+            if added and self.__has_fts:
+                connection.execute(
+                    'INSERT INTO tags_fts (rowid, search_key) '
+                    'SELECT id, search_key FROM tags WHERE id > ?',
+                    (last_id,))
+
+            count += added
+
+    def __remove(self, connection, tags):
+        count = 0
+        rows = ((tag_name,) for tag_name in tags)
+
+        connection.execute('CREATE TEMP TABLE IF NOT EXISTS removed_tags '
+                           '(name TEXT PRIMARY KEY) WITHOUT ROWID')
+
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                return count
+
+            connection.execute('DELETE FROM temp.removed_tags')
+            connection.executemany(
+                'INSERT OR IGNORE INTO temp.removed_tags (name) VALUES (?)',
+                batch)
+
+            # External content FTS tables need the old values to be removed.
+            if self.__has_fts:
+                connection.execute(
+                    "INSERT INTO tags_fts (tags_fts, rowid, search_key) "
+                    "SELECT 'delete', id, search_key FROM tags "
+                    "WHERE name IN (SELECT name FROM temp.removed_tags)")
+
+            count += connection.execute(
+                'DELETE FROM tags '
+                'WHERE name IN (SELECT name FROM temp.removed_tags)').rowcount
+
+    # Public.
+    def count(self):
+        with self.__connection() as connection:
+            return connection.execute('SELECT COUNT(*) FROM tags').fetchone()[0]
+
+    def fetch(self, offset=0, limit=None):
+        with self.__connection() as connection:
+            rows = connection.execute(
+                'SELECT name FROM tags ORDER BY sort_key, name '
+                'LIMIT ? OFFSET ?',
+                (-1 if limit is None else limit, offset))
+
+            return [row[0] for row in rows]
+
+    def query(self, text, mode=SUBSTRING_QUERY, limit=None):
+        if mode not in QUERY_MODES:
+            raise ValueError('Unsupported query mode {mode!r}, expected one '
+                             'of {modes!r}'.format(mode=mode,
+                                                   modes=QUERY_MODES))
+
+        key = tag_keys.search_key(text)
+        limit = -1 if limit is None else limit
+
+        if not key:
+            return self.fetch(limit=None if limit < 0 else limit)
+
+        with self.__connection() as connection:
+            if mode == PREFIX_QUERY:
+                rows = connection.execute(
+                    'SELECT name FROM tags WHERE search_key >= ? AND '
+                    'search_key < ? ORDER BY sort_key, name LIMIT ?',
+                    (key, key + _MAX_CHARACTER, limit))
+
+            # Trigrams need at least 3 characters to be searched.
+            elif self.__has_fts and len(key) >= 3:
+                rows = connection.execute(
+                    'SELECT tags.name FROM tags_fts '
+                    'JOIN tags ON tags.id = tags_fts.rowid '
+                    'WHERE tags_fts MATCH ? '
+                    'ORDER BY tags.sort_key, tags.name LIMIT ?',
+                    ('"{key}"'.format(key=key.replace('"', '""')), limit))
+
+            else:
+                rows = connection.execute(
+                    'SELECT name FROM tags WHERE instr(search_key, ?) > 0 '
+                    'ORDER BY sort_key, name LIMIT ?',
+                    (key, limit))
+
+            return [row[0] for row in rows]
+
+    def add(self, tags):
+        with self.__transaction() as connection:
+            return self.__add(connection, tags)
+
+    def remove(self, tags):
+        with self.__transaction() as connection:
+            return self.__remove(connection, tags)
+
+    def publish(self, added=(), removed=()):
+        with self.__transaction() as connection:
+            removed_count = self.__remove(connection, removed)
+            added_count = self.__add(connection, added)
+
+        return added_count, removed_count
+
+    def close(self):
+        """Close every connection of the pool.
+
+        Connections that are still borrowed by other threads are closed as
+        well, so the store shouldn't be in use anymore.
+        """
+        with self.__pool_lock:
+            self.__closed = True
+
+            for connection in self.__connections:
+                connection.close()
+            self.__connections = []
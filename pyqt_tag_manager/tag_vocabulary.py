@@ -0,0 +1,210 @@
+"""Id-addressed tag vocabularies, which can be shared by many TagManagers.
+
+A vocabulary holds every tag name once, along with the keys derived from it
+(see tag_keys) and caches of values computed by the views (e.g. the size of
+the labels). TagManagers only store the ids of their tags, so any number of
+them can display tags from the same vocabulary without copying the tags.
+
+Shared vocabularies are reference counted: they're kept alive as long as a
+TagManager (or anything else) uses them.
+
+This module doesn't depend on Qt.
+
+Usage:
+    >>> vocabulary = get_shared_vocabulary('assets')
+    >>> for asset in assets:
+    >>>     tag_manager = TagManager(vocabulary=vocabulary)
+    >>>     tag_manager.add_tags(asset.tags)
+
+"""
+# Import built-in modules.
+import sys
+import weakref
+
+# Import local modules.
+from pyqt_tag_manager import tag_keys
+
+
+# Shared vocabularies, by name. Entries are removed when unused.
+_SHARED_VOCABULARIES = weakref.WeakValueDictionary()
+
+
+class TagVocabulary(object):
+    """Id-addressed storage of the tag names and their derived keys.
+
+    The keys of a tag (sort key and search key) are computed once, when it's
+    added, so sorting and searching never derive new strings from the
+    names.
+
+    Ids below the size of the memory-mapped vocabulary (if any) are resolved
+    lazily from the mapped file, the others refer to tags added at runtime.
+    Ids are never re-used, so they stay valid while tags are removed from the
+    TagManagers and the same id is returned when a tag is added again.
+
+    Names are interned, so the vocabulary, the callers and any other
+    interned copy share a single string per tag.
+
+    Args:
+        mapped (mapped_vocabulary.MappedVocabulary): Vocabulary file to
+            resolve the first ids from.
+    """
+    def __init__(self, mapped=None):
+        self.__mapped = mapped
+        self.__mapped_count = len(mapped) if mapped is not None else 0
+        self.__mapped_keys = None  # Decoded on first sort, see sort_key.
+        self.__mapped_search_keys = None  # Derived on first search.
+
+        # Tags added at runtime.
+        self.__names = []
+        self.__keys = []
+        self.__search_keys = []
+        self.__ids = {}  # Tag name: id.
+
+        self.__caches = {}  # Cache key: {tag id: value}, see cache.
+
+    # Inherited.
+    def __len__(self):
+        return self.__mapped_count + len(self.__names)
+
+    # Public.
+    def name(self, tag_id):
+        """Returns the name of a tag.
+
+        Args:
+            tag_id (int): Id of the tag.
+
+        Returns:
+            str: Name of the tag.
+        """
+        if tag_id < self.__mapped_count:
+            return self.__mapped.name(tag_id)
+
+        return self.__names[tag_id - self.__mapped_count]
+
+    def sort_key(self, tag_id):
+        """Returns the sort key of a tag, see tag_keys.sort_key.
+
+        Keys of mapped tags are decoded once, when first compared.
+
+        Args:
+            tag_id (int): Id of the tag.
+
+        Returns:
+            str: Sort key of the tag.
+        """
+        if tag_id < self.__mapped_count:
+            if self.__mapped_keys is None:
+                self.__mapped_keys = [None] * self.__mapped_count
+
+            key = self.__mapped_keys[tag_id]
+            if key is None:
+                key = self.__mapped_keys[tag_id] = \
+                    self.__mapped.sort_key(tag_id)
+
+            return key
+
+        return self.__keys[tag_id - self.__mapped_count]
+
+    def search_key(self, tag_id):
+        """Returns the search key of a tag, see tag_keys.search_key.
+
+        Keys of mapped tags are derived from their sort key once, when first
+        searched.
+
+        Args:
+            tag_id (int): Id of the tag.
+
+        Returns:
+            str: Search key of the tag.
+        """
+        if tag_id < self.__mapped_count:
+            if self.__mapped_search_keys is None:
+                self.__mapped_search_keys = [None] * self.__mapped_count
+
+            key = self.__mapped_search_keys[tag_id]
+            if key is None:
+                key = self.__mapped_search_keys[tag_id] = \
+                    tag_keys.normalize_sort_key(self.sort_key(tag_id))
+
+            return key
+
+        return self.__search_keys[tag_id - self.__mapped_count]
+
+    def find(self, tag_name):
+        """Find the id of a tag by name.
+
+        Args:
+            tag_name (str): Exact name of the tag.
+
+        Returns:
+            int: Id of the tag, or None if it doesn't exist.
+        """
+        tag_id = self.__ids.get(tag_name)
+
+        if tag_id is None and self.__mapped is not None:
+            tag_id = self.__mapped.find(tag_name)
+
+        return tag_id
+
+    def add(self, tag_name):
+        """Add a tag that doesn't exist in the vocabulary yet.
+
+        Args:
+            tag_name (str): Name of the tag.
+
+        Returns:
+            int: Id of the new tag.
+        """
+        tag_id = len(self)
+        tag_name = sys.intern(tag_name)
+        key = tag_keys.sort_key(tag_name)
+
+        self.__names.append(tag_name)
+        self.__keys.append(key)
+        self.__search_keys.append(tag_keys.normalize_sort_key(key))
+        self.__ids[tag_name] = tag_id
+
+        return tag_id
+
+    def cache(self, key):
+        """Returns a cache of values computed per tag, shared by every user
+        of the vocabulary.
+
+        Values that only depend on the tag name and the key (e.g. the size
+        of a label for a given font) are computed once for all the
+        TagManagers sharing the vocabulary.
+
+        Args:
+            key (hashable): Identifies what's cached, including whatever the
+                values depend on.
+
+        Returns:
+            dict: Cached values, by tag id.
+        """
+        cache = self.__caches.get(key)
+
+        if cache is None:
+            cache = self.__caches[key] = {}
+
+        return cache
+
+
+def get_shared_vocabulary(name):
+    """Returns the shared vocabulary of the given name, creating it if it
+    isn't used yet.
+
+    The vocabulary is released once nothing references it anymore, so it
+    doesn't outlive the TagManagers using it.
+
+    Args:
+        name (str): Name of the vocabulary.
+
+    Returns:
+        TagVocabulary: The shared vocabulary.
+    """
+    vocabulary = _SHARED_VOCABULARIES.get(name)
+
+    if vocabulary is None:
+        vocabulary = _SHARED_VOCABULARIES[name] = TagVocabulary()
+
+    return vocabulary
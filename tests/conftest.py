@@ -0,0 +1,27 @@
+"""Shared fixtures of the tests.
+
+Usage:
+    python -m pytest tests
+"""
+# Import built-in modules.
+import os
+import sys
+
+# Import third-party modules.
+import pytest
+
+
+# Constants.
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Widgets are created without a display.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Returns the application, created once for all the tests. """
+    from pyqt_tag_manager import QtWidgets
+
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,114 @@
+# Import third-party modules.
+import pytest
+
+
+@pytest.fixture
+def editor(qapp):
+    from Qt import QtWidgets
+
+    editor = QtWidgets.QLineEdit()
+
+    yield editor
+    editor.deleteLater()
+
+
+def _effect_destroyed(effect):
+    destroyed = []
+    effect.destroyed.connect(lambda *args: destroyed.append(True))
+    return destroyed
+
+
+def _flush_deletes():
+    from Qt import QtCore
+
+    QtCore.QCoreApplication.sendPostedEvents(None,
+                                             QtCore.QEvent.DeferredDelete)
+
+
+def test_effect_is_installed_while_running(editor):
+    from Qt import QtWidgets
+    from pyqt_tag_manager.qt_market.animations import FailColorAnimation
+
+    animation = FailColorAnimation(editor)
+    animation.play(duration=10000)
+
+    effect = editor.graphicsEffect()
+    assert isinstance(effect, QtWidgets.QGraphicsColorizeEffect)
+    destroyed = _effect_destroyed(effect)
+
+    animation.stop()
+    _flush_deletes()
+
+    assert editor.graphicsEffect() is None
+    assert destroyed
+
+
+def test_playing_again_restarts_with_the_same_effect(editor):
+    from pyqt_tag_manager.qt_market.animations import FailColorAnimation
+
+    animation = FailColorAnimation(editor)
+    animation.play(duration=10000)
+    effect = editor.graphicsEffect()
+
+    animation.setCurrentTime(5000)
+    animation.play(duration=10000)
+
+    assert animation.state() == animation.Running
+    assert animation.currentTime() == 0
+    assert editor.graphicsEffect() is effect
+
+    animation.stop()
+
+
+def test_replaced_effects_are_kept(editor):
+    from Qt import QtWidgets
+    from pyqt_tag_manager.qt_market.animations import FailColorAnimation
+
+    animation = FailColorAnimation(editor)
+    animation.play(duration=10000)
+
+    effect = QtWidgets.QGraphicsOpacityEffect(editor)
+    editor.setGraphicsEffect(effect)
+    animation.stop()
+
+    assert editor.graphicsEffect() is effect
+
+
+def test_low_overhead_mode_tints_the_widget(editor):
+    from Qt import QtGui
+    from pyqt_tag_manager.qt_market.animations import FailColorAnimation
+
+    base_color = editor.palette().color(QtGui.QPalette.Base)
+    animation = FailColorAnimation(editor, low_overhead=True)
+    animation.play(duration=10000)
+    animation.setCurrentTime(100)
+
+    assert editor.graphicsEffect() is None
+    assert editor.palette().color(QtGui.QPalette.Base) != base_color
+
+    animation.stop()
+    assert editor.palette().color(QtGui.QPalette.Base) == base_color
+
+
+@pytest.mark.parametrize('low_overhead', [False, True],
+                         ids=['effect', 'low_overhead'])
+def test_tag_managers_reuse_their_animation(qapp, low_overhead):
+    from pyqt_tag_manager.qt_market.animations import FailColorAnimation
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    tag_manager.enable_low_overhead_mode(low_overhead)
+    tag_manager.add_tag('ace')
+
+    for _ in range(3):
+        tag_manager.tag_editor.setText('ace')
+        tag_manager._on_return_pressed()
+
+    animations = tag_manager.tag_editor.findChildren(FailColorAnimation)
+    assert len(animations) == 1
+    assert animations[0].state() == animations[0].Running
+    assert animations[0].low_overhead == low_overhead
+    assert (tag_manager.tag_editor.graphicsEffect() is None) == low_overhead
+
+    animations[0].stop()
+    tag_manager.deleteLater()
@@ -0,0 +1,33 @@
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import __main__ as cli
+
+
+def test_stores_are_read_back(tmp_path, capsys):
+    source = tmp_path / 'dump.txt'
+    source.write_text('zoo\ncat\nzoo\nace\n')
+    store = str(tmp_path / 'tags.db')
+    merged = tmp_path / 'merged.txt'
+
+    assert cli.main(['build', str(source), '-o', store]) == 0
+    assert cli.main(['build', store, '-o', str(merged)]) == 0
+    assert merged.read_text().split() == ['ace', 'cat', 'zoo']
+
+    assert cli.main(['bench', store, '--queries', 'a', '--repeat', '1']) == 0
+    assert 'loaded 3 tags' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('name', ['missing.db', 'missing.txt', 'tags.xyz'])
+def test_bad_inputs_are_reported_without_a_traceback(tmp_path, capsys, name):
+    path = tmp_path / name
+    if name.endswith('.xyz'):
+        path.write_text('ace\n')
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['bench', str(path)])
+
+    assert exit_info.value.code == 2
+    assert 'Traceback' not in capsys.readouterr().err
+    assert not (tmp_path / 'missing.db').exists()
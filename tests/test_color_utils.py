@@ -0,0 +1,70 @@
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager.qt_market import color_utils
+
+
+np = pytest.importorskip('numpy')
+
+# Channels may differ by one, from rounding.
+TOLERANCE = 1
+
+
+def _sample_colors():
+    edge_cases = [
+        [0, 0, 0, 255], [255, 255, 255, 255], [128, 128, 128, 0],
+        [255, 0, 0, 255], [0, 255, 0, 255], [0, 0, 255, 255],
+        [255, 255, 0, 128], [0, 255, 255, 10], [255, 0, 255, 255],
+        [1, 2, 3, 255], [254, 253, 255, 255],
+    ]
+    generator = np.random.RandomState(0)
+
+    return np.concatenate([generator.randint(0, 256, (500, 4)),
+                           edge_cases])
+
+
+def _rgba(qcolor):
+    return [qcolor.red(), qcolor.green(), qcolor.blue(), qcolor.alpha()]
+
+
+def _assert_close(batch, expected):
+    difference = np.abs(np.asarray(batch, dtype=int) -
+                        np.asarray(expected, dtype=int))
+    assert difference.max() <= TOLERANCE, np.argwhere(
+        difference > TOLERANCE)[:5]
+
+
+def test_pastelize_colors_matches_pastelize_color(qapp):
+    colors = _sample_colors()
+    expected = [_rgba(color_utils.pastelize_color(color))
+                for color in colors.tolist()]
+
+    _assert_close(color_utils.pastelize_colors(colors), expected)
+    _assert_close(color_utils.pastelize_colors(colors[:, :3]),
+                  [rgba[:3] for rgba in expected])
+
+
+@pytest.mark.parametrize('percent', [0, 15, 50, 100])
+def test_desaturate_colors_matches_desaturate(qapp, percent):
+    colors = _sample_colors()
+    expected = []
+    for color in colors.tolist():
+        desaturated = color_utils.desaturate(color, percent)
+        desaturated.setAlpha(255)  # Batch results are opaque.
+        expected.append(_rgba(desaturated))
+
+    _assert_close(color_utils.desaturate_colors(colors, percent), expected)
+
+
+def test_to_qcolors(qapp):
+    colors = color_utils.pastelize_colors(_sample_colors())
+    qcolors = color_utils.to_qcolors(colors)
+
+    assert len(qcolors) == len(colors)
+    _assert_close([_rgba(qcolor) for qcolor in qcolors], colors)
+
+
+def test_batch_functions_reject_other_shapes():
+    with pytest.raises(ValueError, match='RGB or RGBA'):
+        color_utils.pastelize_colors([1, 2, 3])
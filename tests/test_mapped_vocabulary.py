@@ -0,0 +1,90 @@
+# Import built-in modules.
+import gc
+import os
+
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import mapped_vocabulary
+from pyqt_tag_manager import tag_engine
+from pyqt_tag_manager import tag_vocabulary
+
+
+def _open_paths(path):
+    """Returns the number of file descriptors of the process open on a
+    path. Mapping a file duplicates its descriptor. """
+    fd_dir = '/proc/self/fd'
+    paths = []
+    for fd in os.listdir(fd_dir):
+        try:
+            paths.append(os.readlink(os.path.join(fd_dir, fd)))
+        except OSError:
+            pass
+
+    return paths.count(os.path.realpath(path))
+
+
+@pytest.fixture
+def vocabulary_path(tmp_path):
+    path = str(tmp_path / 'studio.tagvocab')
+    mapped_vocabulary.write_vocabulary(path, ['zoo', 'cat', 'ace'])
+    return path
+
+
+pytestmark = pytest.mark.skipif(not os.path.isdir('/proc/self/fd'),
+                                reason='Open files are listed from /proc.')
+
+
+def test_engine_closes_replaced_files(vocabulary_path):
+    engine = tag_engine.TagEngine()
+    engine.load_vocabulary(mapped_vocabulary.MappedVocabulary(
+        vocabulary_path))
+    open_count = _open_paths(vocabulary_path)
+
+    for _ in range(3):
+        engine.load_vocabulary(mapped_vocabulary.MappedVocabulary(
+            vocabulary_path))
+        assert _open_paths(vocabulary_path) == open_count
+
+    assert list(engine.iter_tags()) == ['ace', 'cat', 'zoo']
+
+    engine.set_vocabulary(tag_vocabulary.TagVocabulary(),
+                          tag_engine.substring_matcher(''))
+    assert _open_paths(vocabulary_path) == 0
+    assert sorted(engine.iter_tags()) == ['ace', 'cat', 'zoo']
+
+
+def test_engine_close(vocabulary_path):
+    engine = tag_engine.TagEngine()
+    engine.load_vocabulary(mapped_vocabulary.MappedVocabulary(
+        vocabulary_path))
+
+    engine.close()
+    assert _open_paths(vocabulary_path) == 0
+    assert len(engine) == 0
+
+    # The file can be replaced once closed (fails on Windows otherwise).
+    mapped_vocabulary.write_vocabulary(vocabulary_path, ['new'])
+
+
+def test_tag_manager_closes_its_files(qapp, vocabulary_path):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    parent = TagManager()
+    tag_manager = TagManager(parent)
+    tag_manager.load_vocabulary(vocabulary_path)
+    open_count = _open_paths(vocabulary_path)
+
+    for _ in range(3):
+        tag_manager.load_vocabulary(vocabulary_path)
+    assert _open_paths(vocabulary_path) == open_count
+    assert tag_manager.get_tags() == ['ace', 'cat', 'zoo']
+
+    # Deleted by Qt, while the Python wrapper is still referenced.
+    parent.deleteLater()
+    qapp.sendPostedEvents(None, 52)  # QEvent.DeferredDelete
+    gc.collect()
+
+    assert _open_paths(vocabulary_path) == 0
+    del tag_manager
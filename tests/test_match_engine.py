@@ -0,0 +1,38 @@
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import match_engine
+from pyqt_tag_manager import match_sets
+
+
+KEYS = ['tree', 'rock\x00fire', 'été', '', '\x00', 'straße', 'fire',
+        'ｔｒｅｅ', 'rock']
+
+
+@pytest.fixture(scope='module')
+def engines():
+    in_process = match_engine.MatchEngine(processes=0)
+    parallel = match_engine.MatchEngine(processes=2, min_parallel_size=0)
+    for engine in (in_process, parallel):
+        engine.load(KEYS)
+
+    yield in_process, parallel
+
+    parallel.close()
+
+
+@pytest.mark.parametrize('mode', match_engine.MATCH_MODES)
+@pytest.mark.parametrize('query', ['fire', 'rock', 'r', '\x00', 'é', 'ß'])
+def test_workers_match_like_in_process(engines, query, mode):
+    in_process, parallel = engines
+    assert parallel.is_parallel()
+
+    expected = [tag_id for tag_id, key in enumerate(KEYS)
+                if query in key] if mode == match_engine.SUBSTRING_MATCH \
+        else None
+    match_set = parallel.find_matches(query, mode)
+
+    assert match_set == in_process.find_matches(query, mode)
+    if expected is not None:
+        assert list(match_sets.iter_ids(match_set)) == expected
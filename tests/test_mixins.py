@@ -0,0 +1,113 @@
+# Import third-party modules.
+import pytest
+
+
+_TEXT = 'a rather long tag name that does not fit in a narrow widget'
+
+
+@pytest.fixture
+def label(qapp):
+    from Qt import QtWidgets
+    from pyqt_tag_manager.qt_market import mixins
+
+    class CountingLabel(QtWidgets.QLabel):
+        """Counts the texts actually displayed. """
+        def __init__(self, parent=None):
+            super(CountingLabel, self).__init__(parent)
+            self.displayed = []
+
+        def setText(self, text):
+            self.displayed.append(text)
+            super(CountingLabel, self).setText(text)
+
+    class ElidedLabel(mixins.MixinElided, CountingLabel):
+        def __init__(self, parent=None):
+            super(ElidedLabel, self).__init__(parent)
+
+    label = ElidedLabel()
+    label.setMinimumSize(1, 1)
+    label.resize(100, 20)
+    label.show()
+    qapp.processEvents()
+
+    yield label
+    label.close()
+    label.deleteLater()
+
+
+def _resize(qapp, widget, width):
+    widget.resize(width, widget.height())
+    qapp.processEvents()
+
+
+def test_text_is_elided_to_the_width(qapp, label):
+    label.setText(_TEXT)
+    assert label.text() != _TEXT
+    assert label.text().endswith('…')
+
+    _resize(qapp, label, 2000)
+    assert label.text() == _TEXT
+
+    label.enable_elision(False)
+    _resize(qapp, label, 100)
+    assert label.text() == _TEXT
+
+
+def test_resizing_within_the_elided_range_does_nothing(qapp, label):
+    label.setText(_TEXT)
+    _resize(qapp, label, 2000)
+    del label.displayed[:]
+
+    # The whole text fits any wider width.
+    for width in range(2001, 2100):
+        _resize(qapp, label, width)
+    assert label.displayed == []
+
+    # Narrower widths only display a new text when the elision changes.
+    for width in range(300, 200, -1):
+        _resize(qapp, label, width)
+    assert 0 < len(label.displayed) < 100
+    assert len(set(label.displayed)) == len(label.displayed)
+
+
+def test_elided_texts_are_cached(qapp, label, monkeypatch):
+    label.setText(_TEXT)
+    for width in (150, 250, 150, 250):
+        _resize(qapp, label, width)
+
+    texts = list(label.displayed)
+    font_metrics = type(label)._font_metrics[label.font().key()]
+
+    def fail(*args):
+        raise AssertionError('Elided again')
+
+    monkeypatch.setattr(font_metrics, 'elidedText', fail)
+    for width in (150, 250):
+        _resize(qapp, label, width)
+
+    assert label.displayed[len(texts):] == texts[-2:]
+
+
+def test_font_changes_elide_again(qapp, label):
+    label.setText(_TEXT)
+    _resize(qapp, label, 200)
+    text = label.text()
+
+    font = label.font()
+    font.setPointSizeF(font.pointSizeF() * 2)
+    label.setFont(font)
+
+    assert len(label.text()) < len(text)
+
+
+def test_line_edit_tool_tips_hold_the_real_text(qapp):
+    from pyqt_tag_manager.qt_market import editors
+
+    line_edit = editors.LineEdit()
+    line_edit.resize(100, 20)
+    line_edit.setText(_TEXT)
+
+    assert line_edit.toolTip() == _TEXT
+    assert line_edit.text() != _TEXT
+
+    line_edit.deleteLater()
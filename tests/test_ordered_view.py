@@ -0,0 +1,86 @@
+# Import third-party modules.
+import pytest
+
+
+TAGS = ['zoo', 'Ace', 'cat', 'bob']
+
+
+def _displayed(tag_manager):
+    model = tag_manager.tag_viewer.model()
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+@pytest.fixture
+def tag_manager(qapp):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    tag_manager.enable_ordered_view_mode(True)
+
+    yield tag_manager
+    tag_manager.deleteLater()
+
+
+def test_the_model_is_displayed_directly(tag_manager):
+    viewer = tag_manager.tag_viewer
+
+    assert tag_manager.is_ordered_view_mode_enabled()
+    assert viewer.model() is viewer._model
+
+
+def test_tags_are_displayed_in_order(tag_manager):
+    tag_manager.add_tags(TAGS)
+    assert _displayed(tag_manager) == ['Ace', 'bob', 'cat', 'zoo']
+
+    tag_manager.add_tags(['Apple'])
+    assert _displayed(tag_manager) == ['Ace', 'Apple', 'bob', 'cat', 'zoo']
+
+
+def test_insertion_order_is_kept_until_sorted(tag_manager):
+    tag_manager.add_tags(TAGS)
+    tag_manager.tag_viewer.add_tags(['dog', 'Apple'], sort=False)
+
+    assert _displayed(tag_manager) == ['Ace', 'bob', 'cat', 'zoo', 'dog',
+                                       'Apple']
+
+    tag_manager.tag_viewer.sort()
+    assert _displayed(tag_manager) == ['Ace', 'Apple', 'bob', 'cat', 'dog',
+                                       'zoo']
+
+
+def test_search_puts_matching_tags_first(tag_manager):
+    tag_manager.add_tags(TAGS + ['dog'])
+
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('O')
+    assert _displayed(tag_manager) == ['bob', 'dog', 'zoo', 'Ace', 'cat']
+
+    # New tags are placed by their match too.
+    tag_manager.add_tags(['owl', 'ant'])
+    assert _displayed(tag_manager) == ['bob', 'dog', 'owl', 'zoo', 'Ace',
+                                       'ant', 'cat']
+
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('')
+    assert _displayed(tag_manager) == ['Ace', 'ant', 'bob', 'cat', 'dog',
+                                       'owl', 'zoo']
+
+
+def test_switching_back_to_the_proxy_model(tag_manager):
+    tag_manager.add_tags(TAGS)
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('a')
+
+    tag_manager.enable_ordered_view_mode(False)
+    viewer = tag_manager.tag_viewer
+
+    assert not tag_manager.is_ordered_view_mode_enabled()
+    assert viewer.model() is not viewer._model
+    assert _displayed(tag_manager) == ['Ace', 'cat', 'bob', 'zoo']
+
+    # The proxy model sorts the tags added and searched from now on.
+    tag_manager.add_tags(['ant'])
+    assert _displayed(tag_manager) == ['Ace', 'ant', 'cat', 'bob', 'zoo']
+
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('')
+    assert _displayed(tag_manager) == ['Ace', 'ant', 'bob', 'cat', 'zoo']
+
+    tag_manager.enable_ordered_view_mode(True)
+    assert _displayed(tag_manager) == ['Ace', 'ant', 'bob', 'cat', 'zoo']
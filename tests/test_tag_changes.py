@@ -0,0 +1,90 @@
+# Import third-party modules.
+import pytest
+
+
+@pytest.fixture(params=[False, True], ids=['proxy', 'ordered'])
+def tag_manager(qapp, request):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    tag_manager.enable_ordered_view_mode(request.param)
+
+    yield tag_manager
+    tag_manager.deleteLater()
+
+
+def test_changes_since_the_last_commit(tag_manager):
+    tag_manager.add_tags(['ace', 'bob', 'cat'])
+    assert tag_manager.get_changes() == ({'ace', 'bob', 'cat'}, set())
+
+    tag_manager.commit()
+    assert not tag_manager.has_changes()
+    assert tag_manager.get_changes() == (set(), set())
+
+    tag_manager.add_tag('dog')
+    tag_manager.delete_tags(['ace'])
+    changes = tag_manager.get_changes()
+
+    assert changes.added == {'dog'}
+    assert changes.removed == {'ace'}
+    assert tag_manager.has_changes()
+
+
+def test_reverted_changes_are_not_reported(tag_manager):
+    tag_manager.add_tags(['ace', 'bob'])
+    tag_manager.commit()
+
+    tag_manager.add_tag('cat')
+    tag_manager.delete_tags(['cat', 'ace'])
+    tag_manager.add_tag('ace')
+
+    assert not tag_manager.has_changes()
+    assert tag_manager.get_changes() == (set(), set())
+
+
+def test_sync_tags_applies_the_difference(tag_manager):
+    tag_manager.add_tags(['ace', 'bob', 'cat'])
+    tag_manager.commit()
+
+    model = tag_manager.tag_viewer._model
+    removed_rows = []
+    inserted_rows = []
+    model.rowsRemoved.connect(
+        lambda parent, first, last: removed_rows.append(last - first + 1))
+    model.rowsInserted.connect(
+        lambda parent, first, last: inserted_rows.append(last - first + 1))
+
+    changes = tag_manager.sync_tags(['bob', 'cat', 'dog', 'emu'])
+
+    assert changes.added == {'dog', 'emu'}
+    assert changes.removed == {'ace'}
+    assert sum(removed_rows) == 1
+    assert sum(inserted_rows) == 2
+    assert tag_manager.get_tags() == ['bob', 'cat', 'dog', 'emu']
+
+    # The synced tags are the new checkpoint.
+    assert not tag_manager.has_changes()
+
+
+def test_sync_tags_discards_pending_changes(tag_manager):
+    tag_manager.add_tags(['ace', 'bob'])
+    tag_manager.commit()
+    tag_manager.add_tag('cat')
+
+    changes = tag_manager.sync_tags(['ace', 'bob', 'cat'])
+
+    assert changes == (set(), set())
+    assert not tag_manager.has_changes()
+
+
+def test_commit_keeps_the_tags(tag_manager):
+    tag_manager.add_tags(['bob', 'ace'])
+    tag_manager.commit()
+
+    assert sorted(tag_manager.get_tags()) == ['ace', 'bob']
+
+    tag_manager.delete_tags(['bob'])
+    tag_manager.commit()
+    tag_manager.add_tag('bob')
+
+    assert tag_manager.get_changes() == ({'bob'}, set())
@@ -0,0 +1,135 @@
+# Import third-party modules.
+import pytest
+
+
+_TAGS = ['ace', 'bob', 'cat', 'dog', 'eel', 'fox']
+
+
+@pytest.fixture
+def delegate(qapp):
+    from pyqt_tag_manager.tag_chip_delegate import TagChipDelegate
+
+    TagChipDelegate._chip_pixmaps.clear()
+    delegate = TagChipDelegate()
+
+    yield delegate
+    delegate.deleteLater()
+
+
+@pytest.fixture
+def model(qapp):
+    from Qt import QtGui
+
+    model = QtGui.QStandardItemModel()
+    for tags in (_TAGS, ', '.join(_TAGS), []):
+        item = QtGui.QStandardItem()
+        item.setData(tags, 0)  # DisplayRole.
+        model.appendRow(item)
+
+    return model
+
+
+def _option(width, height=1000):
+    from Qt import QtCore, QtWidgets
+
+    option = QtWidgets.QStyleOptionViewItem()
+    option.rect = QtCore.QRect(0, 0, width, height)
+    return option
+
+
+def _paint(delegate, index, width, height):
+    from Qt import QtGui
+
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32)
+    image.fill(0)
+    painter = QtGui.QPainter(image)
+    try:
+        delegate.paint(painter, _option(width, height), index)
+    finally:
+        painter.end()
+
+    return image
+
+
+def test_size_hint_wraps_to_the_cell_width(delegate, model):
+    index = model.index(0, 0)
+    line = delegate.sizeHint(_option(10000), index)
+    wrapped = delegate.sizeHint(_option(line.width() // 2), index)
+    column = delegate.sizeHint(_option(1), index)
+
+    # A single line is as high as one chip, plus margins.
+    assert line.height() == delegate._chip_height + 2 * delegate._margin
+    assert line.height() < wrapped.height() < column.height()
+
+    # One chip per line when the cell is narrower than any chip.
+    chip_lines = len(_TAGS) * (delegate._chip_height + delegate._spacing) - \
+        delegate._spacing
+    assert column.height() == chip_lines + 2 * delegate._margin
+
+    # The width is always the one of a single line.
+    assert line.width() == wrapped.width() == column.width()
+
+
+def test_size_hint_of_string_and_empty_cells(delegate, model):
+    option = _option(100)
+    listed = delegate.sizeHint(option, model.index(0, 0))
+
+    assert delegate.sizeHint(option, model.index(1, 0)) == listed
+
+    empty = delegate.sizeHint(option, model.index(2, 0))
+    assert empty.width() == 2 * delegate._margin
+    assert empty.height() == delegate._chip_height + 2 * delegate._margin
+
+
+def test_new_fonts_lay_the_cells_out_again(delegate, model):
+    from Qt import QtGui
+
+    index = model.index(0, 0)
+    size = delegate.sizeHint(_option(10000), index)
+
+    font = delegate.get_font()
+    font.setPointSizeF(font.pointSizeF() * 3)
+    delegate.set_font(font)
+
+    assert delegate.sizeHint(_option(10000), index).height() > size.height()
+    assert delegate.get_font().key() == QtGui.QFont(font).key()
+
+
+def test_chip_pixmaps_are_reused(delegate, model):
+    from pyqt_tag_manager.tag_chip_delegate import TagChipDelegate
+
+    index = model.index(0, 0)
+    first = _paint(delegate, index, 400, 200)
+    pixmap_keys = {key: pixmap.cacheKey()
+                   for key, pixmap in TagChipDelegate._chip_pixmaps.items()}
+    assert len(pixmap_keys) == len(_TAGS)
+
+    # Painting again, or the same tags in another cell, doesn't render any
+    # chip again.
+    assert _paint(delegate, index, 400, 200) == first
+    _paint(delegate, model.index(1, 0), 400, 200)
+
+    other = TagChipDelegate()
+    _paint(other, index, 400, 200)
+    other.deleteLater()
+
+    assert {key: pixmap.cacheKey() for key, pixmap in
+            TagChipDelegate._chip_pixmaps.items()} == pixmap_keys
+
+
+def test_chip_pixmaps_are_keyed_by_style(delegate, model):
+    from pyqt_tag_manager.tag_chip_delegate import TagChipDelegate
+
+    index = model.index(0, 0)
+    dark = _paint(delegate, index, 400, 200)
+    count = len(TagChipDelegate._chip_pixmaps)
+
+    delegate.enable_dark_mode(False)
+    light = _paint(delegate, index, 400, 200)
+
+    assert len(TagChipDelegate._chip_pixmaps) == 2 * count
+    assert light != dark
+
+    # Narrower cells elide the chips into pixmaps of their own width.
+    _paint(delegate, index, 20, 200)
+    assert len(TagChipDelegate._chip_pixmaps) > 2 * count
@@ -0,0 +1,71 @@
+# Import third-party modules.
+import pytest
+
+
+def _displayed(tag_manager):
+    model = tag_manager.tag_viewer.model()
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+@pytest.fixture(params=[False, True], ids=['proxy', 'ordered'])
+def tag_manager(qapp, request):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    tag_manager.enable_ordered_view_mode(request.param)
+    tag_manager.add_tags(['ace', 'Bob', 'cat', 'dog', 'emu', 'ｆｏｘ'])
+    tag_manager.commit()
+
+    yield tag_manager
+    tag_manager.deleteLater()
+
+
+def test_delete_tags(tag_manager):
+    deleted_signals = []
+    tag_manager.tags_deleted.connect(deleted_signals.append)
+
+    deleted = tag_manager.delete_tags(['cat', 'missing', 'ace', 'emu'])
+
+    assert sorted(deleted) == ['ace', 'cat', 'emu']
+    assert deleted_signals == [deleted]
+    assert _displayed(tag_manager) == ['Bob', 'dog', 'ｆｏｘ']
+    assert not tag_manager.has_tag('cat')
+
+
+def test_delete_unknown_tags(tag_manager):
+    deleted_signals = []
+    tag_manager.tags_deleted.connect(deleted_signals.append)
+
+    assert tag_manager.delete_tags(['missing', 'Ace']) == []
+    assert deleted_signals == []
+    assert len(_displayed(tag_manager)) == 6
+
+
+def test_delete_matching(tag_manager):
+    deleted_signals = []
+    tag_manager.tags_deleted.connect(deleted_signals.append)
+
+    # Matched by search key, like searches.
+    deleted = tag_manager.delete_matching('O')
+
+    assert sorted(deleted) == ['Bob', 'dog', 'ｆｏｘ']
+    assert deleted_signals == [deleted]
+    assert _displayed(tag_manager) == ['ace', 'cat', 'emu']
+
+
+def test_delete_matching_nothing(tag_manager):
+    assert tag_manager.delete_matching('') == []
+    assert tag_manager.delete_matching('xyz') == []
+    assert len(_displayed(tag_manager)) == 6
+
+
+def test_deletions_are_tracked(tag_manager):
+    tag_manager.add_tags(['gnu'])
+    tag_manager.delete_tags(['ace', 'gnu'])
+    tag_manager.delete_matching('dog')
+
+    # Deleting a tag added since the last commit cancels its addition.
+    changes = tag_manager.get_changes()
+    assert changes.added == set()
+    assert changes.removed == {'ace', 'dog'}
+    assert tag_manager.has_changes()
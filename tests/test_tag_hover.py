@@ -0,0 +1,102 @@
+# Import third-party modules.
+import pytest
+
+
+@pytest.fixture(params=[False, True], ids=['proxy', 'ordered'])
+def tag_manager(qapp, request):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    tag_manager.enable_ordered_view_mode(request.param)
+    tag_manager.add_tags(['ace', 'bob', 'cat'])
+    tag_manager.resize(400, 300)
+    tag_manager.tag_viewer.doItemsLayout()
+
+    yield tag_manager
+    tag_manager.deleteLater()
+
+
+def _index_of(tag_viewer, tag_name):
+    model = tag_viewer.model()
+    for row in range(model.rowCount()):
+        index = model.index(row, 0)
+        if index.data() == tag_name:
+            return index
+
+
+def _button_pos(tag_viewer, index):
+    """Returns a point over the delete button of a tag. """
+    rect = tag_viewer.visualRect(index)
+    delegate = tag_viewer.itemDelegate()
+
+    for x in range(rect.right(), rect.left(), -1):
+        pos = rect.center()
+        pos.setX(x)
+        if delegate.is_over_delete_button(rect, pos):
+            return pos
+
+    raise AssertionError('No delete button for {!r}'.format(index.data()))
+
+
+def _move(tag_viewer, pos):
+    from Qt import QtCore, QtGui
+
+    tag_viewer.mouseMoveEvent(QtGui.QMouseEvent(
+        QtCore.QEvent.MouseMove, pos, QtCore.Qt.NoButton,
+        QtCore.Qt.NoButton, QtCore.Qt.NoModifier))
+
+
+def _hovered_tag(tag_viewer):
+    return tag_viewer.itemDelegate().get_hovered_index().data()
+
+
+def test_hovering_a_delete_button(tag_manager):
+    tag_viewer = tag_manager.tag_viewer
+    bob = _index_of(tag_viewer, 'bob')
+
+    _move(tag_viewer, _button_pos(tag_viewer, bob))
+    assert _hovered_tag(tag_viewer) == 'bob'
+
+    # The rest of the tag isn't the button.
+    _move(tag_viewer, tag_viewer.visualRect(bob).topLeft())
+    assert _hovered_tag(tag_viewer) is None
+
+    _move(tag_viewer, _button_pos(tag_viewer, _index_of(tag_viewer, 'cat')))
+    assert _hovered_tag(tag_viewer) == 'cat'
+
+
+def test_leaving_the_viewport_resets_the_hovered_button(tag_manager):
+    from Qt import QtCore
+
+    tag_viewer = tag_manager.tag_viewer
+    _move(tag_viewer, _button_pos(tag_viewer, _index_of(tag_viewer, 'ace')))
+    assert _hovered_tag(tag_viewer) == 'ace'
+
+    # Hover events are left to the viewer, the base class would repaint the
+    # whole tag.
+    assert not tag_viewer.viewportEvent(QtCore.QEvent(
+        QtCore.QEvent.HoverMove))
+    assert _hovered_tag(tag_viewer) == 'ace'
+
+    tag_viewer.viewportEvent(QtCore.QEvent(QtCore.QEvent.Leave))
+    assert _hovered_tag(tag_viewer) is None
+
+
+def test_hovered_button_follows_its_tag(tag_manager):
+    tag_viewer = tag_manager.tag_viewer
+    _move(tag_viewer, _button_pos(tag_viewer, _index_of(tag_viewer, 'cat')))
+
+    tag_manager.add_tag('aaa')
+    assert _hovered_tag(tag_viewer) == 'cat'
+
+    tag_manager.delete_tags(['cat'])
+    assert _hovered_tag(tag_viewer) is None
+
+
+def test_buttons_arent_hovered_without_tag_management(tag_manager):
+    tag_viewer = tag_manager.tag_viewer
+    pos = _button_pos(tag_viewer, _index_of(tag_viewer, 'bob'))
+    tag_viewer.enable_tag_management(False)
+
+    _move(tag_viewer, pos)
+    assert _hovered_tag(tag_viewer) is None
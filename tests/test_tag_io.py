@@ -0,0 +1,71 @@
+# Import built-in modules.
+import io
+
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import tag_io
+
+
+def test_open_files_require_a_format():
+    with pytest.raises(ValueError, match='required for open files'):
+        list(tag_io.read_tags(io.StringIO('ace\n')))
+
+    with pytest.raises(ValueError, match='required for open files'):
+        tag_io.write_tags(io.StringIO(), ['ace'])
+
+
+def test_open_files_with_a_format():
+    f = io.StringIO()
+    assert tag_io.write_tags(f, [' ace', 'cat'], tag_io.CSV_FORMAT) == 2
+
+    f.seek(0)
+    assert list(tag_io.read_tags(f, tag_io.CSV_FORMAT)) == [' ace', 'cat']
+
+
+def test_formats_are_guessed_from_paths(tmp_path):
+    assert tag_io.guess_format(tmp_path / 'tags.JSONL') == \
+        tag_io.JSONL_FORMAT
+
+    with pytest.raises(ValueError, match='Unable to guess'):
+        tag_io.guess_format('tags.xyz')
+
+
+@pytest.mark.parametrize('fmt', tag_io.FORMATS)
+def test_names_survive_a_round_trip(tmp_path, fmt):
+    names = [' ace', 'cat ', '\tdog', 'a, "b"', 'ｆｉ', '{"name": 1}']
+    path = str(tmp_path / 'tags')
+
+    assert tag_io.write_tags(path, names, fmt) == len(names)
+    assert list(tag_io.read_tags(path, fmt)) == names
+
+
+@pytest.mark.parametrize('fmt', [tag_io.CSV_FORMAT, tag_io.JSONL_FORMAT])
+def test_line_breaks_survive_a_round_trip(tmp_path, fmt):
+    names = ['multi\nline', 'carriage\rreturn', 'ace']
+    path = str(tmp_path / 'tags')
+
+    tag_io.write_tags(path, names, fmt)
+    assert list(tag_io.read_tags(path, fmt)) == names
+
+
+@pytest.mark.parametrize('name', ['multi\nline', 'carriage\rreturn'])
+def test_newline_format_rejects_line_breaks(name):
+    with pytest.raises(ValueError, match="can't hold line breaks"):
+        tag_io.write_tags(io.StringIO(), ['ace', name],
+                          tag_io.NEWLINE_FORMAT)
+
+
+def test_newline_format_reads_any_line_ending():
+    f = io.StringIO('ace\r\n cat\rdog \n\nemu', newline='')
+    assert list(tag_io.read_tags(f, tag_io.NEWLINE_FORMAT)) == \
+        ['ace', ' cat', 'dog ', 'emu']
+
+
+def test_formats_are_checked_when_called():
+    with pytest.raises(ValueError, match='Unsupported vocabulary format'):
+        tag_io.read_tags(io.StringIO('ace\n'), 'yaml')
+
+    with pytest.raises(ValueError, match='Unable to guess'):
+        tag_io.read_tags('tags.xyz')
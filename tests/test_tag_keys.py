@@ -0,0 +1,107 @@
+# Import built-in modules.
+import unicodedata
+
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import tag_engine
+from pyqt_tag_manager import tag_keys
+
+
+@pytest.mark.parametrize('name, key', [
+    ('tree', 'tree'),
+    ('TREE', 'tree'),
+    ('Straße', 'strasse'),
+    ('ｔｒｅｅ', 'tree'),  # Full-width.
+    ('ＴＲＥＥ', 'tree'),
+    ('ﬁre', 'fire'),  # Ligature.
+    ('shot_①', 'shot_1'),
+    ('Élan', 'élan'),  # Accents are kept.
+    ('E\u0301lan', 'élan'),  # Decomposed accents are composed.
+])
+def test_search_keys(name, key):
+    assert tag_keys.search_key(name) == key
+
+
+@pytest.mark.parametrize('query, name', [
+    ('tree', 'Big TREE'),
+    ('strasse', 'Hauptstraße'),
+    ('fi', 'ｆｉｒｅ'),
+    ('fi', 'ﬁre'),
+    ('ÉLAN', 'élan'),
+])
+def test_searches_match_variants(query, name):
+    assert tag_engine.substring_matcher(query)(tag_keys.search_key(name))
+
+
+def test_searches_dont_strip_accents():
+    is_match = tag_engine.substring_matcher('elan')
+
+    assert not is_match(tag_keys.search_key('Élan'))
+
+
+def test_sort_keys_are_case_insensitive():
+    names = ['Zoo', 'con', 'Cave', 'cat']
+
+    assert sorted(names, key=tag_keys.sort_key) == \
+        ['cat', 'Cave', 'con', 'Zoo']
+
+
+def test_normalized_sort_keys_are_shared():
+    key = tag_keys.sort_key('Big Tree')
+
+    assert tag_keys.normalize_sort_key(key) is key
+
+
+@pytest.mark.parametrize('name', ['ｔｒｅｅ', 'ﬁre', 'Élan', 'ＳＴＲＡＳＳＥ'])
+def test_normalized_sort_keys_are_search_keys(name):
+    key = tag_keys.normalize_sort_key(tag_keys.sort_key(name))
+
+    assert key == tag_keys.search_key(name)
+    assert unicodedata.is_normalized('NFKC', key)
+    assert key == key.casefold()
+
+
+@pytest.mark.parametrize('lower, higher', [
+    ('shot_2', 'shot_10'),
+    ('shot_9', 'Shot_10'),
+    ('shot_2_take_9', 'shot_2_take_10'),
+    ('shot', 'shot_1'),
+    ('10', '10a'),
+    ('2', 'a'),
+])
+def test_natural_keys_compare_numbers_by_value(lower, higher):
+    assert tag_keys.natural_key(lower) < tag_keys.natural_key(higher)
+    assert tag_keys.natural_key(higher) > tag_keys.natural_key(lower)
+
+
+def test_natural_keys_are_case_insensitive():
+    assert tag_keys.natural_key('Shot_02') == tag_keys.natural_key('shot_2')
+
+
+def test_natural_collation_order():
+    names = ['shot_10', 'Shot_1', 'shot_2', 'take', 'shot_100']
+    engine = tag_engine.TagEngine()
+    engine.set_collation(tag_keys.NATURAL_COLLATION)
+    engine.set_ordered(True)
+    engine.resume_sorting()
+    engine.add_rows(engine.register(names, lambda _: True)[1])
+    engine.sort()
+
+    assert list(engine.iter_tags()) == \
+        ['Shot_1', 'shot_2', 'shot_10', 'shot_100', 'take']
+
+    engine.set_collation(tag_keys.PLAIN_COLLATION)
+    engine.sort()
+    assert list(engine.iter_tags()) == \
+        ['Shot_1', 'shot_10', 'shot_100', 'shot_2', 'take']
+
+
+def test_locale_collation_needs_a_sort_key():
+    engine = tag_engine.TagEngine()
+
+    with pytest.raises(ValueError):
+        engine.set_collation(tag_keys.LOCALE_COLLATION)
+    with pytest.raises(ValueError):
+        engine.set_collation('unknown')
@@ -0,0 +1,52 @@
+# Import built-in modules.
+import gc
+import threading
+
+# Import local modules.
+from pyqt_tag_manager import QtCore
+from pyqt_tag_manager import QtWidgets
+from pyqt_tag_manager import tag_loader
+from pyqt_tag_manager import tag_store
+
+
+class _SlowStore(tag_store.SQLiteTagStore):
+    """Store blocking its fetches until released, to drop a busy loader. """
+    def __init__(self):
+        super(_SlowStore, self).__init__(':memory:')
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def fetch(self, offset, limit):
+        self.started.set()
+        self.release.wait(5)
+        return super(_SlowStore, self).fetch(offset, limit)
+
+
+def test_garbage_collected_loader_stops_its_thread(qapp):
+    loader = tag_loader.TagLoader(tag_store.SQLiteTagStore(':memory:'))
+    thread = loader.findChild(QtCore.QThread)
+    assert thread.isRunning()
+
+    del loader, thread
+    gc.collect()  # Aborts the process if the thread is still running.
+
+
+def test_loader_deleted_with_its_parent_while_busy(qapp):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    store = _SlowStore()
+    parent = QtWidgets.QWidget()
+    tag_manager = TagManager()
+    loader = tag_loader.TagLoader(store, parent=parent)
+    loaded = []
+    loader.loaded.connect(loaded.append)
+
+    loader.refresh(tag_manager)
+    assert store.started.wait(5)
+
+    threading.Timer(0.1, store.release.set).start()
+    del parent, loader
+    gc.collect()
+    qapp.processEvents()
+
+    assert not loaded
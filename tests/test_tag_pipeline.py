@@ -0,0 +1,67 @@
+# Import built-in modules.
+import random
+
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import tag_keys
+from pyqt_tag_manager import tag_pipeline
+
+
+def _sample_tags():
+    """Names repeating across chunks, in several cases and forms. """
+    generator = random.Random(0)
+    forms = [str, str.upper, str.title, lambda name: ' {} '.format(name),
+             lambda name: ''.join(chr(ord(char) + 0xFEE0) for char in name)]
+
+    tags = []
+    for _ in range(3000):
+        name = 'tag{}'.format(generator.randint(0, 400))
+        tags.append(generator.choice(forms)(name))
+
+    return tags + ['', '  '] + tags[:50]
+
+
+def _plain_dedupe(tags, mode):
+    """Reference in-order dedupe, one name at a time. """
+    seen = set()
+    unique = []
+    for name in tags:
+        name = name.strip()
+        key = tag_keys.search_key(name) \
+            if mode == tag_pipeline.NORMALIZED_DEDUPE else name
+
+        if name and key not in seen:
+            seen.add(key)
+            unique.append(name)
+
+    return unique
+
+
+@pytest.mark.parametrize('mode', tag_pipeline.DEDUPE_MODES)
+@pytest.mark.parametrize('processes', [0, 2])
+def test_matches_a_plain_dedupe(mode, processes):
+    tags = _sample_tags()
+    progress = []
+
+    unique = tag_pipeline.unique_tags(
+        iter(tags), mode, processes=processes, chunk_size=128,
+        progress=lambda *counts: progress.append(counts))
+
+    assert unique == _plain_dedupe(tags, mode)
+    assert progress[-1] == (len(tags), len(unique))
+
+
+def test_chunks_only_hold_new_tags():
+    tags = ['ace', 'Bob', 'ACE', 'ace', 'bob', 'cat']
+    chunks = list(tag_pipeline.iter_unique_chunks(
+        tags, processes=0, chunk_size=2))
+
+    # The second chunk only holds duplicates, it's skipped.
+    assert chunks == [['ace', 'Bob'], ['cat']]
+
+
+def test_unsupported_modes():
+    with pytest.raises(ValueError, match='Unsupported dedupe mode'):
+        tag_pipeline.unique_tags(['ace'], 'fuzzy')
@@ -0,0 +1,108 @@
+# Import built-in modules.
+import time
+
+# Import third-party modules.
+import pytest
+
+
+def _displayed(tag_manager):
+    model = tag_manager.tag_viewer.model()
+    return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+
+def _wait_for(qapp, condition, timeout=5.0):
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        qapp.processEvents()
+
+    return condition()
+
+
+@pytest.fixture(params=[False, True], ids=['proxy', 'ordered'])
+def tag_manager(qapp, request):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    tag_manager.enable_ordered_view_mode(request.param)
+    tag_manager.add_tags(['emu', 'Bob'])
+
+    yield tag_manager
+    tag_manager.deleteLater()
+
+
+def _populate(qapp, tag_manager, tags, **kwargs):
+    """Populate tags and wait until done. Returns the finished counts. """
+    finished = []
+    tag_manager.population_finished.connect(finished.append)
+    tag_manager.populate_tags(tags, **kwargs)
+    assert _wait_for(qapp, lambda: finished)
+
+    return finished
+
+
+def test_population_skips_duplicates(qapp, tag_manager):
+    progress = []
+    tag_manager.population_progress.connect(progress.append)
+    tags = (tag_name for tag_name in ['dog', 'Bob', 'ace', 'dog', 'cat',
+                                      'ace', 'emu'])
+
+    finished = _populate(qapp, tag_manager, tags, chunk_size=2)
+
+    assert finished == [3]
+    assert progress[-1] == 7
+    assert _displayed(tag_manager) == ['ace', 'Bob', 'cat', 'dog', 'emu']
+    assert not tag_manager.is_populating()
+
+
+def test_population_is_incremental(qapp, tag_manager):
+    tags = ['tag_{:04}'.format(i) for i in reversed(range(2000))]
+    progress = []
+    tag_manager.population_progress.connect(progress.append)
+
+    # A pass inserts at least one chunk, whatever the budget.
+    tag_manager.populate_tags(iter(tags), budget_ms=0, chunk_size=100)
+    assert len(tag_manager.get_tags()) == 2
+
+    assert _wait_for(qapp, lambda: len(tag_manager.get_tags()) > 2)
+    assert tag_manager.is_populating()
+    assert len(tag_manager.get_tags()) - 2 < len(tags)
+
+    # The widget can be searched while loading.
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('tag_19')
+    assert _displayed(tag_manager)[0].startswith('tag_19')
+
+    assert _wait_for(qapp, lambda: not tag_manager.is_populating())
+    assert progress == sorted(progress)
+    assert progress[-1] == len(tags)
+
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('')
+    assert _displayed(tag_manager) == ['Bob', 'emu'] + sorted(tags)
+
+
+def test_population_can_be_cancelled(qapp, tag_manager):
+    cancelled = []
+    tag_manager.population_cancelled.connect(cancelled.append)
+    tags = ['tag_{:04}'.format(i) for i in range(2000)]
+
+    tag_manager.populate_tags(iter(tags), budget_ms=0, chunk_size=100)
+    assert _wait_for(qapp, lambda: len(tag_manager.get_tags()) > 2)
+    tag_manager.cancel_population()
+
+    assert cancelled == [len(tag_manager.get_tags()) - 2]
+    assert not tag_manager.is_populating()
+
+    # The tags added so far are sorted.
+    displayed = _displayed(tag_manager)
+    assert displayed == sorted(displayed, key=str.casefold)
+
+
+def test_sorting_resumes_when_nothing_is_added(qapp, tag_manager):
+    viewer = tag_manager.tag_viewer
+
+    assert _populate(qapp, tag_manager, ['Bob', 'emu', 'Bob']) == [0]
+    assert viewer.add_tags(['emu'], sort=False) == []
+
+    # Rows inserted without sorting, e.g. pages of a tag store, are still
+    # kept sorted.
+    viewer._model.add_tags(['ace'], viewer.is_match_for_search_query)
+    assert _displayed(tag_manager) == ['ace', 'Bob', 'emu']
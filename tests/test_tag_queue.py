@@ -0,0 +1,111 @@
+# Import built-in modules.
+import threading
+import time
+
+# Import local modules.
+from pyqt_tag_manager.tag_queue import TagQueue
+
+
+def test_set_listener_waits_for_calls_in_progress():
+    queue = TagQueue()
+    entered = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def listener():
+        calls.append(threading.current_thread())
+        entered.set()
+        release.wait(5.0)
+
+    queue.set_listener(listener)
+    producer = threading.Thread(target=queue.put, args=(['ace'],))
+    producer.start()
+    assert entered.wait(5.0)
+
+    detached = threading.Event()
+    detacher = threading.Thread(
+        target=lambda: (queue.set_listener(None), detached.set()))
+    detacher.start()
+    assert not detached.wait(0.2)
+
+    release.set()
+    assert detached.wait(5.0)
+    producer.join()
+    detacher.join()
+
+    # Detached listeners aren't called anymore.
+    queue.take(10)
+    queue.put(['cat'])
+    assert len(calls) == 1
+
+
+def test_swapping_queues_while_producers_run(qapp, monkeypatch):
+    from Qt import QtCore
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    errors = []
+    monkeypatch.setattr(threading, 'excepthook', errors.append)
+
+    queues = [TagQueue(max_size=1000), TagQueue(max_size=1000)]
+    tag_manager = TagManager()
+    stop = threading.Event()
+
+    def produce(queue, index):
+        count = 0
+        while not stop.is_set():
+            queue.put(['tag_{}_{}'.format(index, count)], timeout=0.01)
+            count += 1
+            # Let the queue be drained empty, so the listener is called.
+            time.sleep(0.0005)
+
+    producers = [threading.Thread(target=produce, args=(queue, index))
+                 for index, queue in enumerate(queues * 2)]
+    for producer in producers:
+        producer.start()
+
+    try:
+        end = time.time() + 1.0
+        while time.time() < end:
+            for queue in queues + [None]:
+                tag_manager.set_ingestion_queue(queue, latency_ms=0)
+                qapp.processEvents()
+                QtCore.QCoreApplication.sendPostedEvents(
+                    None, QtCore.QEvent.DeferredDelete)
+    finally:
+        stop.set()
+        for producer in producers:
+            producer.join()
+
+    assert not errors
+
+    # Tags put while a queue was detached are drained once it's attached.
+    for queue in queues:
+        tag_manager.set_ingestion_queue(queue, latency_ms=0)
+        end = time.time() + 5.0
+        while len(queue) and time.time() < end:
+            qapp.processEvents()
+        assert not len(queue)
+
+    tag_manager.set_ingestion_queue(None)
+    assert len(tag_manager.get_tags()) == sum(
+        queue.stats().put_count for queue in queues)
+    tag_manager.deleteLater()
+
+
+def test_queues_are_drained_with_any_budget(qapp):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    queue = TagQueue()
+    queue.put(['tag_{}'.format(i) for i in range(1000)])
+    tag_manager = TagManager()
+    tag_manager.set_ingestion_queue(queue, budget_ms=0, chunk_size=100)
+
+    end = time.time() + 5.0
+    while len(queue) and time.time() < end:
+        qapp.processEvents()
+
+    assert not len(queue)
+    assert len(tag_manager.get_tags()) == 1000
+
+    tag_manager.set_ingestion_queue(None)
+    tag_manager.deleteLater()
@@ -0,0 +1,89 @@
+# Import built-in modules.
+import sqlite3
+
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import tag_keys
+from pyqt_tag_manager import tag_store
+
+
+TAGS = ['Tree', 'treehouse', 'Office', 'ﬁre', 'ＴＲＥＥ', 'cat']
+
+
+def _expected(text, prefix=False):
+    key = tag_keys.search_key(text)
+    matches = [tag_name for tag_name in TAGS
+               if (tag_keys.search_key(tag_name).startswith(key) if prefix
+                   else key in tag_keys.search_key(tag_name))]
+    return sorted(matches, key=lambda tag_name: (tag_keys.sort_key(tag_name),
+                                                 tag_name))
+
+
+@pytest.fixture
+def store():
+    store = tag_store.SQLiteTagStore(':memory:')
+    store.add(TAGS)
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize('text', ['ｔｒｅｅ', 'tree', 'ﬁ', 'fi', 'FIC', 'ｒｅ'])
+def test_substring_queries_match_search_keys(store, text):
+    assert store.query(text) == _expected(text)
+
+
+@pytest.mark.parametrize('text', ['ｔｒ', 'TREE', 'ﬁ', 'fir'])
+def test_prefix_queries_match_search_keys(store, text):
+    assert store.query(text, tag_store.PREFIX_QUERY) == \
+        _expected(text, prefix=True)
+
+
+def test_removed_tags_are_not_matched(store):
+    store.remove(['ＴＲＥＥ', 'ﬁre'])
+    assert store.query('tree') == ['Tree', 'treehouse']
+    assert store.query('fir') == []
+
+
+def test_stores_without_search_keys_are_migrated(tmp_path):
+    path = str(tmp_path / 'tags.db')
+    connection = sqlite3.connect(path)
+    connection.executescript('''
+        CREATE TABLE tags (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            sort_key TEXT NOT NULL
+        );
+        CREATE INDEX tags_sort_key ON tags (sort_key, name);
+        CREATE VIRTUAL TABLE tags_fts USING fts5 (
+            sort_key, content='tags', content_rowid='id', tokenize='trigram'
+        );
+    ''')
+    connection.executemany(
+        'INSERT INTO tags (name, sort_key) VALUES (?, ?)',
+        [(tag_name, tag_keys.sort_key(tag_name)) for tag_name in TAGS])
+    connection.execute("INSERT INTO tags_fts (tags_fts) VALUES ('rebuild')")
+    connection.commit()
+    connection.close()
+
+    store = tag_store.SQLiteTagStore(path)
+    try:
+        assert store.query('ｔｒｅｅ') == _expected('ｔｒｅｅ')
+        assert store.query('ﬁ', tag_store.PREFIX_QUERY) == \
+            _expected('ﬁ', prefix=True)
+
+        store.add(['ｆｉｒ'])
+        assert 'ｆｉｒ' in store.query('fir')
+    finally:
+        store.close()
+
+
+def test_tags_can_be_added_from_a_generator(store):
+    store.replace_all([])
+    names = ['Zoo', 'ace', 'cat', 'Bob']
+    assert store.add(tag_name for tag_name in names) == 4
+
+    assert store.fetch() == ['ace', 'Bob', 'cat', 'Zoo']
+    assert store.query('zoo') == ['Zoo']
+    assert store.query('ace') == ['ace']
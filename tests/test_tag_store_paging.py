@@ -0,0 +1,106 @@
+# Import built-in modules.
+import threading
+import time
+
+# Import local modules.
+from pyqt_tag_manager import tag_store
+
+
+class _RecordingStore(tag_store.SQLiteTagStore):
+    """Store recording the threads it's called from. """
+    def __init__(self, tags):
+        super(_RecordingStore, self).__init__(':memory:')
+        self.threads = set()
+        self.replace_all(tags)
+        self.threads.clear()
+
+    def fetch(self, offset=0, limit=None):
+        self.threads.add(threading.current_thread())
+        return super(_RecordingStore, self).fetch(offset, limit)
+
+    def query(self, text, mode=tag_store.SUBSTRING_QUERY, limit=None):
+        self.threads.add(threading.current_thread())
+        return super(_RecordingStore, self).query(text, mode, limit)
+
+
+def _wait_for(qapp, condition, timeout=5.0):
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        qapp.processEvents()
+
+    return condition()
+
+
+def _tag_manager(qapp, store, page_size):
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    tag_manager = TagManager()
+    fetched = []
+    tag_manager.tags_fetched.connect(fetched.append)
+    tag_manager.set_tag_store(store, page_size=page_size)
+
+    return tag_manager, fetched
+
+
+def test_pages_are_fetched_off_the_gui_thread(qapp):
+    tags = ['tag_{:03}'.format(i) for i in range(25)]
+    store = _RecordingStore(tags)
+    tag_manager, fetched = _tag_manager(qapp, store, 10)
+
+    # Nothing is fetched synchronously.
+    assert tag_manager.get_tags() == []
+    assert _wait_for(qapp, lambda: fetched)
+    assert len(tag_manager.get_tags()) == 10
+
+    model = tag_manager.tag_viewer._model
+    while model.canFetchMore():
+        count = len(fetched)
+        model.fetchMore()
+        model.fetchMore()  # Ignored while the page is requested.
+        assert _wait_for(qapp, lambda: len(fetched) > count)
+
+    assert sorted(tag_manager.get_tags()) == tags
+    assert threading.current_thread() not in store.threads
+
+
+def test_search_queries_are_fetched_off_the_gui_thread(qapp):
+    store = _RecordingStore(['tag_{:03}'.format(i) for i in range(100)])
+    tag_manager, fetched = _tag_manager(qapp, store, 10)
+    assert _wait_for(qapp, lambda: fetched)
+
+    tag_manager.tag_viewer.sort_tags_by_search_criteria('tag_09')
+    assert _wait_for(qapp, lambda: tag_manager.has_tag('tag_095'))
+    assert threading.current_thread() not in store.threads
+
+
+def test_results_of_a_replaced_store_are_discarded(qapp):
+    old_store = _RecordingStore(['old'])
+    new_store = _RecordingStore(['new'])
+    tag_manager, fetched = _tag_manager(qapp, old_store, 10)
+
+    tag_manager.set_tag_store(new_store, page_size=10)
+    assert _wait_for(qapp, lambda: fetched)
+    qapp.processEvents()
+
+    assert tag_manager.get_tags() == ['new']
+
+
+def test_clearing_the_tags_stops_the_loader(qapp):
+    from Qt import QtCore
+    from pyqt_tag_manager.tag_loader import TagLoader
+
+    store = _RecordingStore(['tag_{:03}'.format(i) for i in range(25)])
+    tag_manager, fetched = _tag_manager(qapp, store, 10)
+    assert _wait_for(qapp, lambda: fetched)
+
+    loader = tag_manager.findChild(TagLoader)
+    thread = loader.findChild(QtCore.QThread)
+    assert thread.isRunning()
+
+    tag_manager.clear_tags()
+    assert not thread.isRunning()
+    assert tag_manager.get_tag_store() is None
+
+    QtCore.QCoreApplication.sendPostedEvents(None,
+                                             QtCore.QEvent.DeferredDelete)
+    assert tag_manager.findChild(TagLoader) is None
@@ -0,0 +1,159 @@
+# Import built-in modules.
+import gc
+import weakref
+
+# Import third-party modules.
+import pytest
+
+# Import local modules.
+from pyqt_tag_manager import tag_engine
+from pyqt_tag_manager import tag_vocabulary
+
+
+def _every_tag(_):
+    return True
+
+
+@pytest.fixture
+def vocabulary():
+    return tag_vocabulary.TagVocabulary()
+
+
+def test_shared_vocabularies_are_reused_while_referenced():
+    vocabulary = tag_vocabulary.get_shared_vocabulary('test_reused')
+
+    assert tag_vocabulary.get_shared_vocabulary('test_reused') is vocabulary
+    assert tag_vocabulary.get_shared_vocabulary('test_other') is not \
+        vocabulary
+
+
+def test_shared_vocabularies_are_released_when_unreferenced():
+    vocabulary = tag_vocabulary.get_shared_vocabulary('test_released')
+    vocabulary.add('ace')
+    released = weakref.ref(vocabulary)
+
+    del vocabulary
+    gc.collect()
+
+    assert released() is None
+    vocabulary = tag_vocabulary.get_shared_vocabulary('test_released')
+    assert vocabulary.find('ace') is None
+
+
+def test_engines_share_the_names_of_their_tags(vocabulary):
+    first = tag_engine.TagEngine(vocabulary)
+    second = tag_engine.TagEngine(vocabulary)
+
+    first.add_rows(first.register(['ace', 'bob'], _every_tag)[1])
+    second.add_rows(second.register(['bob', 'cat'], _every_tag)[1])
+
+    assert len(vocabulary) == 3
+    assert list(first.iter_tags()) == ['ace', 'bob']
+    assert list(second.iter_tags()) == ['bob', 'cat']
+    assert first.tag_id(1) == second.tag_id(0) == vocabulary.find('bob')
+    assert not second.has_tag('ace')
+    assert second.row_of(vocabulary.find('ace')) == -1
+    assert second.row_of(vocabulary.find('cat')) == 1
+
+
+def test_engine_state_is_sized_by_its_own_tags(vocabulary):
+    other = tag_engine.TagEngine(vocabulary)
+    other.add_rows(other.register(
+        ['tag_{}'.format(i) for i in range(1000)], _every_tag)[1])
+
+    engine = tag_engine.TagEngine(vocabulary)
+    engine.add_rows(engine.register(['ace', 'tag_999'], _every_tag)[1])
+
+    # Match sets only hold a bit per tag of the list.
+    assert engine.matches().bit_length() <= 2
+    assert engine.find_matches(_every_tag).bit_length() <= 2
+    assert engine.count_match_changes(0) == 2
+    assert engine.rows().tolist() == [vocabulary.find('ace'), 999]
+
+
+def test_matches_of_shared_engines(vocabulary):
+    other = tag_engine.TagEngine(vocabulary)
+    other.add_rows(other.register(['ace', 'bob', 'cat'], _every_tag)[1])
+
+    engine = tag_engine.TagEngine(vocabulary)
+    engine.set_ordered(True)
+    engine.resume_sorting()
+    engine.add_rows(engine.register(['cat', 'dog', 'ace'], _every_tag)[1])
+    engine.sort()
+
+    match_set = engine.find_matches(tag_engine.substring_matcher('a'))
+    rows, matches = engine.changed_match_rows(match_set)
+    assert [engine.name(row) for row in rows] == ['dog']
+
+    engine.set_match_flags(matches)
+    engine.sort()
+    assert list(engine.iter_tags()) == ['ace', 'cat', 'dog']
+    assert [engine.is_match(row) for row in range(3)] == [1, 1, 0]
+
+
+def test_changes_of_shared_engines(vocabulary):
+    other = tag_engine.TagEngine(vocabulary)
+    other.add_rows(other.register(['ace', 'bob'], _every_tag)[1])
+
+    engine = tag_engine.TagEngine(vocabulary)
+    engine.add_rows(engine.register(['bob', 'cat'], _every_tag,
+                                    commit=True)[1])
+    assert not engine.has_changes()
+
+    keep = engine.keep_flags(removed_tags=['bob', 'ace'])
+    for start, end in reversed(engine.removal_ranges(keep)):
+        assert engine.remove_rows(start, end).tolist() == \
+            [vocabulary.find('bob')]
+    engine.add_rows(engine.register(['ace'], _every_tag)[1])
+
+    assert engine.get_changes() == ({'ace'}, {'bob'})
+    assert list(other.iter_tags()) == ['ace', 'bob']
+    assert other.get_changes() == ({'ace', 'bob'}, set())
+
+    # Adding the tag again reuses its member.
+    engine.add_rows(engine.register(['bob'], _every_tag)[1])
+    assert engine.get_changes() == ({'ace'}, set())
+
+
+def test_moving_tags_to_a_shared_vocabulary(vocabulary):
+    vocabulary.add('zed')
+    engine = tag_engine.TagEngine()
+    engine.add_rows(engine.register(['ace', 'bob'], _every_tag,
+                                    commit=True)[1])
+    engine.remove_rows(0, 1)
+    engine.add_rows(engine.register(['cat'], _every_tag)[1])
+
+    engine.set_vocabulary(vocabulary, _every_tag)
+
+    assert engine.vocabulary() is vocabulary
+    assert list(engine.iter_tags()) == ['bob', 'cat']
+    assert engine.get_changes() == ({'cat'}, {'ace'})
+
+
+def test_tag_managers_share_a_vocabulary(qapp):
+    from Qt import QtCore
+    from pyqt_tag_manager.tag_manager import TagManager
+
+    vocabulary = tag_vocabulary.get_shared_vocabulary('test_tag_managers')
+    first = TagManager(vocabulary=vocabulary)
+    second = TagManager(vocabulary=vocabulary)
+
+    first.add_tags(['ace', 'bob'])
+    second.add_tags(['bob', 'cat'])
+    second.delete_tags(['bob'])
+
+    assert first.get_vocabulary() is second.get_vocabulary() is vocabulary
+    assert len(vocabulary) == 3
+    assert sorted(first.get_tags()) == ['ace', 'bob']
+    assert second.get_tags() == ['cat']
+
+    released = weakref.ref(vocabulary)
+    del vocabulary
+    for tag_manager in (first, second):
+        tag_manager.deleteLater()
+    del first, second, tag_manager
+    QtCore.QCoreApplication.sendPostedEvents(None,
+                                             QtCore.QEvent.DeferredDelete)
+    gc.collect()
+
+    assert released() is None